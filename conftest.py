@@ -0,0 +1,43 @@
+# Keeps the repository root on sys.path so tests can import the optigrade package
+import numpy as np
+import pytest
+
+
+class CountingModel:
+    """Toy model whose prediction is `response(X)` for a feature DataFrame X, counting predict calls"""
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return np.asarray(self.response(X), dtype=float)
+
+
+@pytest.fixture
+def counting_model():
+    """Build a CountingModel from a response function, e.g. counting_model(lambda X: X['study_hours'] / 10)"""
+    return CountingModel
+
+
+class CountingList(list):
+    """List that counts item reads (bisect, slicing and scans included), to bound how much of an index is read"""
+    reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __iter__(self):
+        for item in super().__iter__():
+            self.reads += 1
+            yield item
+
+    def __contains__(self, item):
+        self.reads += len(self)
+        return super().__contains__(item)
+
+
+@pytest.fixture
+def counting_list():
+    return CountingList
@@ -22,6 +22,9 @@ IF EXIST models\train_model.py (
     python models\train_model.py
 )
 
+REM Step 6: Build optimized image variants
+python -m optigrade.assets
+
 echo 🎉 Setup complete! Run the app using:
 echo streamlit run optigrade_app.py
 pause
@@ -2,6 +2,11 @@ import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 import joblib
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from optigrade.drift import build_baseline, save_baseline
+from optigrade.validation import TRAINING_DATA, validate
 
 # Define full set of feature names (MATCHING PREDICTION)
 feature_names = [
@@ -17,13 +22,16 @@ feature_names = [
 # Load training dataset
 df = pd.read_csv("data/training_data.csv")
 
-# Columns feature names
-column_mapping = {
-    'Attendance': 'attendance',
-    'Lecture_Engagement': 'engagement',
-    'Midterm_Score': 'midterm_score'
-}
-df = df.rename(columns=column_mapping)
+# Validate (the schema maps Attendance/Lecture_Engagement/Midterm_Score onto feature names)
+report = validate(df, TRAINING_DATA)
+for warning in report.warnings:
+    print(f"⚠️ {warning}")
+if not report.ok:
+    print(f"⚠️ Skipping {len(report.invalid_rows)} invalid rows:")
+    print(report.summary().to_string(index=False))
+df = report.valid_rows()
+if df.empty:
+    raise SystemExit("❌ No valid training rows - fix data/training_data.csv")
 
 # Required features
 for feature in feature_names:
@@ -47,5 +55,9 @@ joblib.dump({
     'feature_names': feature_names
 }, "models/model.pkl")
 
+# Training-time distributions the app's drift monitor compares live traffic with
+save_baseline(build_baseline(X, feature_names, model.predict(X)), "models/drift_baseline.json")
+
 print(f"✅ Model trained with features: {feature_names}")
 print("✅ Model saved as models/model.pkl")
+print("✅ Drift baseline saved as models/drift_baseline.json")
@@ -0,0 +1 @@
+"""OptiGrade engine: model helpers and planning tools used by optigrade_app.py"""
@@ -0,0 +1,174 @@
+"""Build-time image pipeline: resized, compressed variants of the images in assets/"""
+import hashlib
+import html
+import io
+import json
+import os
+
+SOURCE_DIR = "assets"
+OUTPUT_DIR = os.path.join("static", "img")  # served by Streamlit at app/static/img
+MANIFEST_NAME = "manifest.json"
+STATIC_URL = "app/static/img"
+
+# Widths generated per image (sources are never upscaled)
+VARIANT_WIDTHS = {
+    "Optigrade.png": [32, 64, 192, 512],
+    "cgpa_predictor.jpeg": [360, 754],
+    "feedback_loop.png": [400, 800]
+}
+DEFAULT_WIDTHS = [320, 640, 1280]
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+_manifest_cache = {}
+
+
+def _source_stamp(path):
+    """Cheap change detector for a source image (size + mtime)"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _encode(image, fmt):
+    """Encode a PIL image as optimized WebP, PNG or JPEG bytes"""
+    buffer = io.BytesIO()
+    if fmt == "webp":
+        image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+    elif fmt == "png":
+        image.save(buffer, "PNG", optimize=True)
+    else:
+        image.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def build_assets(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR, widths=None):
+    """
+    Generate WebP plus PNG/JPEG fallbacks at several widths for every raster image.
+
+    File names carry a content hash so they can be cached forever, and a manifest
+    maps each source image to its variants. Returns the manifest.
+    """
+    from PIL import Image
+
+    widths = widths or VARIANT_WIDTHS
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {}
+
+    for name in sorted(os.listdir(source_dir)):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in (".png", ".jpg", ".jpeg"):
+            continue
+
+        path = os.path.join(source_dir, name)
+        with Image.open(path) as source:
+            source.load()
+            fallback = "png" if source.mode in ("RGBA", "LA", "P") else "jpg"
+            entry = {"width": source.width, "height": source.height,
+                     "stamp": _source_stamp(path), "variants": []}
+
+            targets = sorted({min(w, source.width) for w in widths.get(name, DEFAULT_WIDTHS)})
+            for width in targets:
+                height = max(1, round(source.height * width / source.width))
+                resized = source.resize((width, height), Image.LANCZOS) if width != source.width else source
+                for fmt in ("webp", fallback):
+                    data = _encode(resized, fmt)
+                    digest = hashlib.sha1(data).hexdigest()[:10]
+                    file_name = f"{stem}-{width}w-{digest}.{fmt}"
+                    with open(os.path.join(output_dir, file_name), "wb") as f:
+                        f.write(data)
+                    entry["variants"].append({"width": width, "format": fmt, "file": file_name,
+                                              "digest": digest, "bytes": len(data)})
+            manifest[name] = entry
+
+    # Drop variants left over from older builds
+    keep = {v["file"] for entry in manifest.values() for v in entry["variants"]} | {MANIFEST_NAME}
+    for file_name in os.listdir(output_dir):
+        if file_name not in keep:
+            os.remove(os.path.join(output_dir, file_name))
+
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    _manifest_cache.pop(output_dir, None)
+    return manifest
+
+
+def load_manifest(output_dir=OUTPUT_DIR):
+    """Read the asset manifest once per process ({} when assets have not been built)"""
+    if output_dir not in _manifest_cache:
+        try:
+            with open(os.path.join(output_dir, MANIFEST_NAME)) as f:
+                _manifest_cache[output_dir] = json.load(f)
+        except (OSError, ValueError):
+            _manifest_cache[output_dir] = {}
+    return _manifest_cache[output_dir]
+
+
+def ensure_assets(source_dir=SOURCE_DIR, output_dir=OUTPUT_DIR):
+    """Load the manifest, rebuilding it first if it is missing or a source image changed"""
+    manifest = load_manifest(output_dir)
+    try:
+        stale = not manifest or any(
+            _source_stamp(os.path.join(source_dir, name)) != entry["stamp"]
+            for name, entry in manifest.items())
+        if stale:
+            manifest = build_assets(source_dir, output_dir)
+            _manifest_cache[output_dir] = manifest
+    except Exception:
+        # Missing Pillow or unreadable images: callers fall back to the originals
+        _manifest_cache[output_dir] = manifest
+    return manifest
+
+
+# ------------------ PICKING VARIANTS ------------------
+def pick_variant(manifest, name, width, fmt=None):
+    """Smallest variant at least `width` pixels wide (or the largest available)"""
+    variants = [v for v in manifest.get(name, {}).get("variants", []) if fmt is None or v["format"] == fmt]
+    if not variants:
+        return None
+    wide_enough = [v for v in variants if v["width"] >= width]
+    if wide_enough:
+        return min(wide_enough, key=lambda v: (v["width"], v["bytes"]))
+    return max(variants, key=lambda v: v["width"])
+
+
+def asset_file(manifest, name, width, output_dir=OUTPUT_DIR, source_dir=SOURCE_DIR):
+    """Local path of the best PNG/JPEG variant, or of the original when none was built"""
+    variants = [v for v in manifest.get(name, {}).get("variants", []) if v["format"] != "webp"]
+    variant = pick_variant({name: {"variants": variants}}, name, width)
+    if variant is None:
+        return os.path.join(source_dir, name)
+    return os.path.join(output_dir, variant["file"])
+
+
+def asset_url(variant):
+    """Static URL for a variant; the ?v= argument makes the static handler send long-lived cache headers"""
+    return f"{STATIC_URL}/{variant['file']}?v={variant['digest']}"
+
+
+def picture_html(manifest, name, alt="", sizes="100vw", max_width=None):
+    """Responsive <picture> tag letting the browser pick WebP and the right width ('' if not built)"""
+    variants = manifest.get(name, {}).get("variants", [])
+    if not variants:
+        return ""
+
+    sources = {}
+    for variant in variants:
+        sources.setdefault(variant["format"], []).append(f"{asset_url(variant)} {variant['width']}w")
+
+    fallback = max((v for v in variants if v["format"] != "webp"), key=lambda v: v["width"])
+    style = "width: 100%; height: auto;" + (f" max-width: {max_width}px;" if max_width else "")
+    tags = [f'<source type="image/webp" srcset="{", ".join(sources["webp"])}" sizes="{sizes}">'] if "webp" in sources else []
+    fallback_srcset = ", ".join(sources[fallback["format"]])
+    tags.append(f'<img src="{asset_url(fallback)}" srcset="{fallback_srcset}" sizes="{sizes}" '
+                f'alt="{html.escape(alt)}" loading="lazy" decoding="async" style="{style}">')
+    return f"<picture>{''.join(tags)}</picture>"
+
+
+if __name__ == "__main__":
+    built = build_assets()
+    for source_name, info in built.items():
+        original = os.path.getsize(os.path.join(SOURCE_DIR, source_name))
+        smallest = min(v["bytes"] for v in info["variants"])
+        print(f"✅ {source_name}: {len(info['variants'])} variants "
+              f"({original / 1024:.0f} KB original, smallest {smallest / 1024:.1f} KB)")
+    print(f"✅ Manifest written to {os.path.join(OUTPUT_DIR, MANIFEST_NAME)}")
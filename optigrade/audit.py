@@ -0,0 +1,214 @@
+"""Append-only prediction audit log written off the request path into rotated gzip JSONL segments"""
+import argparse
+import atexit
+import glob
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+import zlib
+
+import pandas as pd
+
+SEGMENT_PREFIX = "predictions"
+OPEN_SUFFIX = ".jsonl.gz.open"  # segment still being written
+CLOSED_SUFFIX = ".jsonl.gz"     # rotated, complete and safe to read in bulk
+
+
+class AuditLog:
+    """
+    Background writer for prediction records.
+
+    log() only puts the record on a bounded queue and never waits: if the writer
+    falls behind and the queue is full the record is counted in `dropped` instead of
+    slowing the request. The writer thread drains the queue in batches, appends each
+    batch to the open segment as its own gzip member, and rotates the segment (renaming
+    it to *.jsonl.gz) once it passes `max_segment_bytes` or `max_segment_age` seconds.
+    """
+
+    def __init__(self, directory, max_segment_bytes=8 << 20, max_segment_age=3600.0, queue_size=10000,
+                 batch_size=500, flush_interval=1.0):
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._segment = None
+        self._segment_opened = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_env(cls, env=None):
+        """Log under OPTIGRADE_AUDIT_DIR (default logs/audit); None when it is set to an empty string"""
+        env = os.environ if env is None else env
+        directory = env.get("OPTIGRADE_AUDIT_DIR", os.path.join("logs", "audit"))
+        if not directory:
+            return None
+        return cls(directory, max_segment_bytes=int(env.get("OPTIGRADE_AUDIT_SEGMENT_BYTES", 8 << 20)))
+
+    # ------------------ REQUEST SIDE ------------------
+    def log(self, record):
+        """Queue one record (a JSON-serialisable dict); returns False if it had to be dropped"""
+        record.setdefault("ts", time.time())
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def log_prediction(self, model_version, features, prediction, latency_ms, source="results", **extra):
+        return self.log({"ts": time.time(), "source": source, "model_version": model_version,
+                         "features": features, "prediction": prediction,
+                         "latency_ms": round(latency_ms, 3), **extra})
+
+    # ------------------ WRITER SIDE ------------------
+    def _recover(self):
+        """
+        Close every open segment this instance did not open, so earlier runs' records
+        become readable. PIDs are not trusted (in a container the app is PID 1 on every
+        restart). Closing a live worker's segment is safe: it reopens its segment path
+        for each batch, so its next batch simply starts a new segment.
+        """
+        for path in glob.glob(os.path.join(self.directory, f"{SEGMENT_PREFIX}-*{OPEN_SUFFIX}")):
+            if path == self._segment:
+                continue
+            try:
+                os.replace(path, path[:-len(".open")])
+            except OSError:
+                continue  # already closed by another worker
+
+    def _open_segment(self):
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        self._segment = os.path.join(
+            self.directory, f"{SEGMENT_PREFIX}-{stamp}-{os.getpid()}-{uuid.uuid4().hex[:6]}{OPEN_SUFFIX}")
+        self._segment_opened = time.monotonic()
+
+    def _rotate(self):
+        if self._segment and os.path.exists(self._segment):
+            os.replace(self._segment, self._segment[:-len(".open")])
+        self._segment = None
+
+    def _write(self, batch):
+        if self._segment is None:
+            self._open_segment()
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in batch).encode()
+        with open(self._segment, "ab") as f:
+            f.write(gzip.compress(payload))
+        self.written += len(batch)
+        if (os.path.getsize(self._segment) >= self.max_segment_bytes
+                or time.monotonic() - self._segment_opened >= self.max_segment_age):
+            self._rotate()
+
+    def _drain(self, wait):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=wait) if wait else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+        return len(batch)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._drain(self.flush_interval)
+            except OSError:
+                time.sleep(self.flush_interval)  # disk trouble must not kill the writer
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been written; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self._queue.unfinished_tasks
+
+    def close(self):
+        """Stop the writer, write what is still queued and close the open segment"""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        while self._drain(0):
+            pass
+        self._rotate()
+
+
+# ------------------ ANALYTICS ------------------
+def segments(directory, include_open=False):
+    """Segment paths in write order"""
+    paths = glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}-*{CLOSED_SUFFIX}"))
+    if include_open:
+        paths += glob.glob(os.path.join(directory, f"{SEGMENT_PREFIX}-*{OPEN_SUFFIX}"))
+    return sorted(paths)
+
+
+def read_segment(path):
+    """
+    Records of one segment, gzip member by member: a member torn by a crash (or still
+    being written) ends the segment, and every complete batch before it is kept.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    records = []
+    while data:
+        member = zlib.decompressobj(wbits=31)  # one gzip member
+        try:
+            payload = member.decompress(data)
+        except zlib.error:
+            break
+        if not member.eof:
+            break
+        for line in payload.decode(errors="replace").splitlines():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        data = member.unused_data
+    return records
+
+
+def read_log(directory, include_open=False):
+    """Every record as a DataFrame, with one column per model feature"""
+    rows = [record for path in segments(directory, include_open) for record in read_segment(path)]
+    if not rows:
+        return pd.DataFrame()
+    records = pd.DataFrame(rows)
+    if "features" in records:
+        features = pd.json_normalize(records.pop("features").tolist()).add_prefix("feature.")
+        records = pd.concat([records, features], axis=1)
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the prediction audit log for analytics")
+    parser.add_argument("directory", nargs="?", default=os.path.join("logs", "audit"))
+    parser.add_argument("--out", default="predictions.parquet", help=".parquet or .csv")
+    args = parser.parse_args()
+
+    log = read_log(args.directory)
+    if log.empty:
+        raise SystemExit(f"⚠️ No closed audit segments in {args.directory}")
+    if args.out.endswith(".csv"):
+        log.to_csv(args.out, index=False)
+    else:
+        log.to_parquet(args.out, index=False)
+    print(f"✅ {len(log)} audited predictions written to {args.out}")
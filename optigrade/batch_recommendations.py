@@ -0,0 +1,211 @@
+"""Overnight job: precompute Gemini recommendations for a whole cohort"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from optigrade.cache import create_cache, make_key
+from optigrade.llm_client import LLMUnavailable, ResilientClient
+from optigrade.prompts import FOCUS_AREAS, compact_profile, load_tiers, plan_request
+
+GEMINI_URL = "https://generativelanguage.googleapis.com"
+RESULT_TTL = 36 * 3600  # long enough to cover the next day's sessions
+_SECTION = re.compile(r"^#+\s*Student\s+(\S+?)\s*$", re.MULTILINE)
+
+
+class GeminiHTTP:
+    """Minimal blocking client for the Gemini REST generateContent endpoint"""
+
+    def __init__(self, model, api_key=None, base_url=GEMINI_URL, timeout=60):
+        self.model = model
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY", "")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def generate(self, prompt, generation_config):
+        config = {
+            re.sub(r"_(\w)", lambda m: m.group(1).upper(), key): value
+            for key, value in generation_config.items()
+        }
+        body = json.dumps({"contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                           "generationConfig": config}).encode()
+        request = urllib.request.Request(
+            f"{self.base_url}/v1beta/models/{self.model}:generateContent", data=body,
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            if 400 <= e.code < 500 and e.code != 429:
+                raise ValueError(f"Gemini rejected the request ({e.code})") from e  # not retried
+            raise RuntimeError(f"Gemini returned {e.code}") from e
+        parts = payload["candidates"][0]["content"]["parts"]
+        return "".join(part.get("text", "") for part in parts)
+
+
+def student_key(model, student_id):
+    """Cache key of a student's precomputed recommendation, found by id however their inputs are typed in"""
+    return make_key("student_recommendations", model, str(student_id))
+
+
+# ------------------ COHORT ------------------
+def load_cohort(path):
+    """
+    Students from a CSV with student_id, current_cgpa and optionally predicted_cgpa,
+    courses ('MTH101:3;PHY102:2'), avg_grade, study_hours, attendance, learning_style.
+    """
+    frame = pd.read_csv(path, dtype={"student_id": str})
+    students = []
+    for row in frame.to_dict("records"):
+        row = {k: v for k, v in row.items() if not (isinstance(v, float) and pd.isna(v))}
+        courses = []
+        for item in str(row.get("courses", "")).split(";"):
+            if item.strip():
+                code, _, units = item.strip().partition(":")
+                courses.append({"course_id": code, "course_units": int(units or 3)})
+        previous = [{"grade": row["avg_grade"], "study_hours": row.get("study_hours"),
+                     "attendance": row.get("attendance"), "learning_style": row.get("learning_style")}] \
+            if "avg_grade" in row else []
+        students.append({
+            "student_id": str(row["student_id"]),
+            "profile": compact_profile(float(row["current_cgpa"]), courses, previous, row.get("predicted_cgpa"))
+        })
+    return students
+
+
+def pack_prompt(students, tier):
+    """One prompt covering several students, answered in '### Student <id>' sections"""
+    profiles = "\n\n".join(f"### Student {s['student_id']}\n{s['profile']}" for s in students)
+    return (
+        "You are an academic advisor. For each student below give specific, actionable recommendations "
+        f"to raise their CGPA, covering: {'; '.join(FOCUS_AREAS)}.\n"
+        "Start each student's answer with the exact line '### Student <id>' and use short headings and "
+        f"bullet points, at most {tier['words']} words per student. Be practical and encouraging.\n\n"
+        f"{profiles}"
+    )
+
+
+def split_packed(text, student_ids):
+    """{student_id: section text} for the sections of a packed answer that parse"""
+    pieces = _SECTION.split(text)
+    sections = {pieces[i]: pieces[i + 1].strip() for i in range(1, len(pieces) - 1, 2)}
+    return {sid: sections[sid] for sid in student_ids if sections.get(sid)}
+
+
+def load_checkpoint(path):
+    """Student ids already finished by an earlier run"""
+    done = set()
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["student_id"])
+                except (ValueError, KeyError):
+                    continue  # torn last line from a crash
+    return done
+
+
+# ------------------ JOB ------------------
+async def run_job(students, llm, store, checkpoint_path, tier_name="fast", tiers=None,
+                  concurrency=8, pack_size=1, client=None, ttl=RESULT_TTL):
+    """
+    Generate recommendations for every student not yet in the checkpoint.
+
+    Requests run concurrently (at most `concurrency` in flight) through a ResilientClient,
+    optionally `pack_size` students per request; sections that do not come back are
+    retried one student at a time. Each result is stored under the key the app uses for
+    that student's prompt and under their student id (see student_key), and appended
+    to the checkpoint as soon as it arrives, so an interrupted run resumes where it
+    stopped. Returns {'done', 'skipped', 'failed'}.
+    """
+    tiers = tiers or load_tiers()
+    tier = tiers[tier_name]
+    client = client or ResilientClient(rate=concurrency * 2, burst=concurrency, max_concurrency=concurrency)
+    finished = load_checkpoint(checkpoint_path)
+    pending = [s for s in students if s["student_id"] not in finished]
+    semaphore = asyncio.Semaphore(concurrency)
+    summary = {"done": 0, "skipped": len(students) - len(pending), "failed": []}
+
+    with open(checkpoint_path, "a") as checkpoint:
+        def record(student, request, text):
+            # By prompt for identical profiles, and by student id for the Results page of that student
+            store.set_many({make_key("recommendations", request["model"], request["prompt"]): text,
+                            student_key(request["model"], student["student_id"]): text}, ttl=ttl)
+            checkpoint.write(json.dumps({"student_id": student["student_id"], "model": request["model"],
+                                         "recommendation": text}) + "\n")
+            checkpoint.flush()
+            summary["done"] += 1
+
+        async def generate(prompt, config):
+            async with semaphore:
+                return await asyncio.to_thread(client.call, llm.generate, prompt, config)
+
+        async def single(student):
+            try:
+                request = plan_request(student["profile"], tiers, tier_name)
+                text = await generate(request["prompt"], request["generation_config"])
+            except (LLMUnavailable, ValueError) as e:
+                summary["failed"].append((student["student_id"], str(e)))
+                return
+            record(student, request, text)
+
+        async def packed(batch):
+            # Students whose own prompt is over budget fail here, like in single(), and leave the pack
+            requests = {}
+            for student in batch:
+                try:
+                    requests[student["student_id"]] = plan_request(student["profile"], tiers, tier_name)
+                except ValueError as e:
+                    summary["failed"].append((student["student_id"], str(e)))
+            batch = [s for s in batch if s["student_id"] in requests]
+            if not batch:
+                return
+            config = dict(requests[batch[0]["student_id"]]["generation_config"])
+            config["max_output_tokens"] = tier["max_output_tokens"] * len(batch)
+            try:
+                sections = split_packed(await generate(pack_prompt(batch, tier), config),
+                                        [s["student_id"] for s in batch])
+            except LLMUnavailable:
+                sections = {}
+            for student in batch:
+                if student["student_id"] in sections:
+                    record(student, requests[student["student_id"]], sections[student["student_id"]])
+            await asyncio.gather(*(single(s) for s in batch if s["student_id"] not in sections))
+
+        if pack_size > 1:
+            batches = [pending[i:i + pack_size] for i in range(0, len(pending), pack_size)]
+            await asyncio.gather(*(packed(batch) for batch in batches))
+        else:
+            await asyncio.gather(*(single(student) for student in pending))
+    return summary
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Precompute recommendations for a cohort CSV")
+    parser.add_argument("cohort")
+    parser.add_argument("--checkpoint", help="defaults to <cohort>.checkpoint.jsonl")
+    parser.add_argument("--tier", default=os.getenv("OPTIGRADE_DEFAULT_TIER", "fast"))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pack", type=int, default=1, help="students per request")
+    parser.add_argument("--base-url", default=GEMINI_URL)
+    parser.add_argument("--cache", default=os.getenv("OPTIGRADE_CACHE_BACKEND", "disk"),
+                        help="result store the app reads (disk or redis)")
+    args = parser.parse_args()
+
+    tiers = load_tiers()
+    cohort = load_cohort(args.cohort)
+    result = asyncio.run(run_job(
+        cohort, GeminiHTTP(tiers[args.tier]["model"], base_url=args.base_url), create_cache(args.cache),
+        args.checkpoint or os.path.splitext(args.cohort)[0] + ".checkpoint.jsonl",
+        tier_name=args.tier, tiers=tiers, concurrency=args.concurrency, pack_size=args.pack))
+    print(f"✅ {result['done']} recommendations generated, {result['skipped']} already done")
+    if result["failed"]:
+        print(f"⚠️ {len(result['failed'])} failed - rerun the same command to retry them")
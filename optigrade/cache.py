@@ -0,0 +1,268 @@
+"""Pluggable result cache shared by sessions (memory) or by app workers (SQLite file, Redis)"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def _canonical(value):
+    """JSON fallback for key parts: numpy arrays/scalars as Python values, sets sorted"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return value.hex()
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def make_key(namespace, *parts):
+    """
+    Stable key for JSON-like parts: 'namespace:<sha1>' (same in every process).
+    Parts are serialized canonically (sorted dict keys, tuples as lists, numpy values
+    as Python values), so equal inputs give the same key whatever objects hold them.
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=_canonical)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+class BaseCache:
+    """get/set interface shared by the backends; batch methods default to per-key calls"""
+
+    def get(self, key, default=None):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def get_many(self, keys):
+        """{key: value} for the keys that are cached"""
+        found = {}
+        for key in keys:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+    def set_many(self, mapping, ttl=None):
+        for key, value in mapping.items():
+            self.set(key, value, ttl)
+
+    def get_or_set(self, key, compute, ttl=None):
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.set(key, value, ttl)
+        return value
+
+
+# ------------------ BACKENDS ------------------
+class MemoryCache(BaseCache):
+    """In-process LRU; values are stored as-is (no copying)"""
+
+    def __init__(self, max_items=4096):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires is not None and expires < time.time():
+                del self._items[key]
+                return default
+            self._items.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._items[key] = (time.time() + ttl if ttl else None, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DiskCache(BaseCache):
+    """
+    SQLite file shared by every worker on the machine.
+
+    WAL mode lets readers proceed while another process writes; each thread keeps its
+    own connection. When the table grows past max_items the oldest writes are dropped.
+    """
+
+    def __init__(self, path=os.path.join(".cache", "optigrade.sqlite"), max_items=100_000):
+        self.path = path
+        self.max_items = max_items
+        self._local = threading.local()
+        self._writes = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                         "key TEXT PRIMARY KEY, value BLOB, expires REAL, stored REAL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_stored ON cache (stored)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        conn = self._connection()
+        for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT key, value, expires FROM cache WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+            for key, value, expires in rows:
+                if expires is None or expires >= now:
+                    found[key] = pickle.loads(value)
+        return found
+
+    def set(self, key, value, ttl=None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, mapping, ttl=None):
+        now = time.time()
+        expires = now + ttl if ttl else None
+        rows = [(key, pickle.dumps(value, protocol=4), expires, now) for key, value in mapping.items()]
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)", rows)
+        self._writes += len(rows)
+        if self._writes >= 256:
+            self._writes = 0
+            self._cull()
+
+    def _cull(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+            conn.execute("DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY stored DESC "
+                         "LIMIT -1 OFFSET ?)", (self.max_items,))
+
+    def delete(self, key):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+class RedisCache(BaseCache):
+    """Redis (or any Redis-compatible server) shared by workers across machines"""
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="optigrade:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisCache needs the 'redis' package: pip install redis") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + key)
+        return default if value is None else pickle.loads(value)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {key: pickle.loads(value) for key, value in zip(keys, values) if value is not None}
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value, protocol=4), ex=int(ttl) if ttl else None)
+
+    def set_many(self, mapping, ttl=None):
+        pipe = self.client.pipeline()
+        for key, value in mapping.items():
+            pipe.set(self.prefix + key, pickle.dumps(value, protocol=4), ex=int(ttl) if ttl else None)
+        pipe.execute()
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+# ------------------ PROCESS-WIDE CACHE ------------------
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def create_cache(backend=None):
+    """
+    Build the backend named by OPTIGRADE_CACHE_BACKEND (memory | disk | redis).
+
+    OPTIGRADE_CACHE_PATH sets the SQLite file and OPTIGRADE_CACHE_URL the Redis URL.
+    A Redis backend that cannot be reached falls back to the disk cache.
+    """
+    backend = (backend or os.getenv("OPTIGRADE_CACHE_BACKEND", "memory")).lower()
+    if backend == "redis":
+        try:
+            cache = RedisCache(os.getenv("OPTIGRADE_CACHE_URL", "redis://localhost:6379/0"))
+            cache.client.ping()
+            return cache
+        except Exception as e:
+            print(f"⚠️ Redis cache unavailable ({e}); using the disk cache")
+            backend = "disk"
+    if backend == "disk":
+        return DiskCache(os.getenv("OPTIGRADE_CACHE_PATH", os.path.join(".cache", "optigrade.sqlite")))
+    return MemoryCache()
+
+
+def get_cache():
+    """The process-wide cache, created on first use"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = create_cache()
+    return _cache
+
+
+def set_cache(cache):
+    """Replace the process-wide cache (e.g. in tests); returns the previous one"""
+    global _cache
+    previous, _cache = _cache, cache
+    return previous
@@ -0,0 +1,257 @@
+"""Course catalog: indexed lookup, typeahead search and the prerequisite graph"""
+import argparse
+import bisect
+import heapq
+import os
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+from optigrade.rendering import CardTemplate
+from optigrade.validation import COURSE_CATALOG, STUDENT_RECORDS, validate
+
+DEFAULT_CATALOG_PATH = os.path.join("data", "course_catalog.csv")
+HISTORY_PATH = os.path.join("data", "student_data.csv")
+
+STATUS_COLORS = {"Completed": "#b07aa1", "Registered": "#59a14f", "Eligible": "#4e79a7", "Planned": "#4e79a7",
+                 "Blocked": "#e15759"}
+
+COURSE_CARD = CardTemplate("""
+    <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;">
+        <div style="display: flex; justify-content: space-between;">
+            <span style="font-weight: bold; font-size: 18px;">{code}: {title}</span>
+            <span style="background: {status_color}; color: white; padding: 2px 10px; border-radius: 12px; font-size: 12px;">
+                {status}
+            </span>
+        </div>
+        <div style="color: #a0a0a0; margin-top: 8px;">
+            Units: {units} • Difficulty: {stars} {note}
+        </div>
+    </div>
+""")
+
+_NOT_CODE = re.compile(r"[^A-Z0-9]")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_code(text):
+    """Canonical course code: 'mat 101' and 'MAT-101' both become 'MAT101'"""
+    return _NOT_CODE.sub("", str(text or "").upper())
+
+
+class CourseCatalog:
+    """
+    Every course keyed by code, plus the prerequisite DAG.
+
+    A sorted code list and a sorted (title word, code) list answer typeahead prefixes
+    with bisect. Unknown prerequisites and cycles are rejected when the catalog is
+    built, and one Kahn pass gives every course a topological rank and a level (its
+    longest prerequisite chain), so ordering any set of courses is a sort on ranks.
+    """
+
+    def __init__(self, courses):
+        self.courses = {}
+        for course in courses:
+            record = self._normalize(course)
+            if record["code"] in self.courses:
+                raise ValueError(f"Duplicate course code {record['code']}")
+            self.courses[record["code"]] = record
+
+        self.codes = sorted(self.courses)
+        self._words = {code: tuple(sorted(set(_WORD.findall(c["title"].lower())))) for code, c in self.courses.items()}
+        self.title_index = sorted((word, code) for code, words in self._words.items() for word in words)
+
+        self.unlocks = defaultdict(list)
+        for code, course in self.courses.items():
+            for prerequisite in course["prerequisites"]:
+                if prerequisite not in self.courses:
+                    raise ValueError(f"{code} requires {prerequisite}, which is not in the catalog")
+                self.unlocks[prerequisite].append(code)
+        self.rank, self.level = self._order()
+        self.entry = [code for code in self.codes if not self.courses[code]["prerequisites"]]
+
+    def __len__(self):
+        return len(self.courses)
+
+    def __contains__(self, code):
+        return normalize_code(code) in self.courses
+
+    @staticmethod
+    def _normalize(course):
+        code = normalize_code(course.get("code"))
+        if not code:
+            raise ValueError("Course code cannot be empty")
+        prerequisites = course.get("prerequisites")
+        if isinstance(prerequisites, str):
+            prerequisites = prerequisites.split(";")
+        elif not isinstance(prerequisites, (list, tuple)):
+            prerequisites = []  # missing (None or NaN)
+        difficulty, avg_grade = course.get("difficulty"), course.get("avg_grade")
+        return {"code": code, "title": str(course.get("title") or code).strip(), "units": int(course.get("units") or 0),
+                "difficulty": None if pd.isna(difficulty) else float(difficulty),
+                "prerequisites": tuple(dict.fromkeys(p for p in map(normalize_code, prerequisites) if p)),
+                "avg_grade": None if pd.isna(avg_grade) else float(avg_grade),
+                "students": 0 if pd.isna(course.get("students")) else int(course["students"])}
+
+    def _order(self):
+        """Kahn's algorithm, lowest level then code first; a leftover course means a cycle"""
+        waiting = {code: len(c["prerequisites"]) for code, c in self.courses.items()}
+        level = dict.fromkeys(self.courses, 0)
+        ready = [(0, code) for code, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        rank = {}
+        while ready:
+            _, code = heapq.heappop(ready)
+            rank[code] = len(rank)
+            for course in self.unlocks.get(code, ()):
+                level[course] = max(level[course], level[code] + 1)
+                waiting[course] -= 1
+                if waiting[course] == 0:
+                    heapq.heappush(ready, (level[course], course))
+        if len(rank) < len(self.courses):
+            cycle = sorted(code for code in self.courses if code not in rank)
+            raise ValueError(f"Prerequisite cycle among {', '.join(cycle[:10])}{' ...' if len(cycle) > 10 else ''}")
+        return rank, level
+
+    # ------------------ LOOKUP & SEARCH ------------------
+    def get(self, code):
+        """The course record for a code (any spacing or case), or None"""
+        return self.courses.get(normalize_code(code))
+
+    def search(self, query, limit=10):
+        """
+        Typeahead: courses whose code starts with the query, then courses with a title
+        word starting with every query word ("gen chem" finds General Chemistry).
+        """
+        text = str(query or "").strip()
+        if not text:
+            return []
+        found = []
+        code = normalize_code(text)
+        if code:
+            start = bisect.bisect_left(self.codes, code)
+            for candidate in self.codes[start:start + limit]:
+                if not candidate.startswith(code):
+                    break
+                found.append(candidate)
+
+        words = _WORD.findall(text.lower())
+        if words and len(found) < limit:
+            seen = set(found)
+            driver = max(words, key=len)  # the longest word has the narrowest range to scan
+            others = [w for w in words if w != driver]
+            i = bisect.bisect_left(self.title_index, (driver,))
+            while i < len(self.title_index) and len(found) < limit:
+                word, candidate = self.title_index[i]
+                i += 1
+                if not word.startswith(driver):
+                    break
+                if candidate in seen:
+                    continue
+                title_words = self._words[candidate]
+                if all(any(t.startswith(w) for t in title_words) for w in others):
+                    found.append(candidate)
+                    seen.add(candidate)
+        return [self.courses[c] for c in found]
+
+    # ------------------ PREREQUISITES ------------------
+    def missing_prerequisites(self, code, completed):
+        """Prerequisites of a course not in the completed codes"""
+        done = {normalize_code(c) for c in completed}
+        course = self.get(code)
+        return [p for p in course["prerequisites"] if p not in done] if course else []
+
+    def eligible(self, completed, limit=None):
+        """Courses not yet taken whose prerequisites are all completed, in topological order"""
+        done = {normalize_code(c) for c in completed}
+        candidates = set(self.entry).union(*(self.unlocks.get(c, ()) for c in done))
+        open_courses = [c for c in candidates
+                        if c not in done and all(p in done for p in self.courses[c]["prerequisites"])]
+        return [self.courses[c] for c in sorted(open_courses, key=self.rank.__getitem__)[:limit]]
+
+    def study_order(self, targets, completed=()):
+        """
+        Everything still needed to take the target courses (their outstanding
+        prerequisites, transitively, and the targets), in a valid order. Each record
+        gains `term`: the earliest semester it can be taken, counting from 1.
+        """
+        done = {normalize_code(c) for c in completed}
+        needed, stack = set(), [normalize_code(t) for t in targets]
+        while stack:
+            code = stack.pop()
+            if code in done or code in needed:
+                continue
+            if code not in self.courses:
+                raise KeyError(code)
+            needed.add(code)
+            stack.extend(self.courses[code]["prerequisites"])
+
+        term, plan = {}, []
+        for code in sorted(needed, key=self.rank.__getitem__):
+            term[code] = 1 + max((term[p] for p in self.courses[code]["prerequisites"] if p in needed), default=0)
+            plan.append({**self.courses[code], "term": term[code]})
+        return plan
+
+    # ------------------ LOADING ------------------
+    @classmethod
+    def from_frame(cls, frame):
+        return cls(frame.to_dict("records"))
+
+
+def course_history(path=HISTORY_PATH):
+    """Per-course mean difficulty rating, mean grade and number of students from past records"""
+    records = validate(pd.read_csv(path), STUDENT_RECORDS).valid_rows()
+    return records.groupby("course_id").agg(hist_difficulty=("course_difficulty", "mean"),
+                                            avg_grade=("grade", "mean"), students=("user_id", "nunique"))
+
+
+def load_course_catalog(path=None, history_path=HISTORY_PATH):
+    """
+    The catalog CSV (code, title, units, difficulty, prerequisites separated by ';'),
+    with difficulty replaced by the students' mean rating wherever history exists.
+    """
+    path = path or DEFAULT_CATALOG_PATH
+    report = validate(pd.read_csv(path), COURSE_CATALOG)
+    if not report.ok:
+        errors = [f"row {'-' if pd.isna(e.row) else int(e.row) + 2}: {e.message}"
+                  for e in report.errors.head(5).itertuples()]
+        raise ValueError(f"{path}: {len(report.errors)} errors ({'; '.join(errors)})")
+    frame = report.data
+    if history_path and os.path.exists(history_path):
+        frame = frame.join(course_history(history_path), on="code")
+        frame["difficulty"] = frame["hist_difficulty"].fillna(frame["difficulty"])
+    return CourseCatalog.from_frame(frame)
+
+
+def render_course_cards(courses, status, notes=None):
+    """HTML cards for course records with one status (and an optional note per course)"""
+    if not courses:
+        return ""
+    frame = pd.DataFrame(courses, columns=["code", "title", "units", "difficulty"])
+    frame["stars"] = [("⭐️" * int(round(d))) if d is not None and not pd.isna(d) else "not rated"
+                      for d in frame["difficulty"]]
+    frame["status"] = status
+    frame["status_color"] = STATUS_COLORS.get(status, "#000000")
+    frame["note"] = [f"• {n}" if n else "" for n in (notes or [""] * len(frame))]
+    return COURSE_CARD.render(frame)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the course catalog and its prerequisite graph")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH)
+    parser.add_argument("--search", help="typeahead query (code or title prefix)")
+    parser.add_argument("--completed", nargs="*", default=[], help="course codes already passed")
+    parser.add_argument("--plan", nargs="*", help="target courses to order with their missing prerequisites")
+    args = parser.parse_args()
+
+    catalog = load_course_catalog(args.catalog)
+    print(f"✅ {len(catalog)} courses, {max(catalog.level.values(), default=-1) + 1} prerequisite levels")
+    if args.search:
+        for course in catalog.search(args.search):
+            print(f"  {course['code']}: {course['title']} ({course['units']} units)")
+    if args.plan:
+        for course in catalog.study_order(args.plan, args.completed):
+            print(f"  term {course['term']}: {course['code']} {course['title']}")
+    elif args.completed:
+        print(f"📚 Eligible: {', '.join(c['code'] for c in catalog.eligible(args.completed))}")
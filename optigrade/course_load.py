@@ -0,0 +1,140 @@
+"""Course-load optimizer: the registration that maximizes predicted CGPA (or its downside) under unit caps"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from optigrade.prediction import DEFAULT_FEATURES, feature_vector, predict_batch
+from optigrade.trajectory import ensemble_members
+
+UNIT_CAPS = (15, 24)          # a typical semester's minimum and maximum registration
+NEUTRAL_DIFFICULTY = 3.0      # difficulty with no effect on the score
+DIFFICULTY_PENALTY = 0.1      # CGPA points per point of unit-weighted difficulty above neutral
+RISK_PERCENTILE = 10          # "risk" scores a load by this percentile of the ensemble's predictions
+OBJECTIVES = {"cgpa": "predicted", "risk": "lower"}
+
+
+def score_loads(model, profile, unit_totals, feature_names=None, percentile=RISK_PERCENTILE):
+    """
+    Predicted CGPA and its pessimistic percentile for the profile at every total unit
+    load, scored in one batched predict (plus one per ensemble member for the percentile).
+    """
+    feature_names = list(feature_names or DEFAULT_FEATURES)
+    unit_totals = np.asarray(unit_totals, dtype=float)
+    X = np.tile(feature_vector(profile, feature_names), (len(unit_totals), 1))
+    X[:, feature_names.index("credit_load")] = unit_totals
+    predicted = predict_batch(model, pd.DataFrame(X, columns=feature_names))
+
+    members = ensemble_members(model)
+    if len(members) > 1:
+        member_preds = np.stack([np.asarray(member.predict(X), dtype=float) for member in members])
+        lower = np.fmin(np.percentile(member_preds, percentile, axis=0), predicted)
+    else:
+        lower = predicted
+    return pd.DataFrame({"predicted": predicted, "lower": lower}, index=pd.Index(unit_totals.astype(int), name="units"))
+
+
+def optimize_load(model, profile, courses, min_units=UNIT_CAPS[0], max_units=UNIT_CAPS[1], required=(),
+                  objective="cgpa", feature_names=None, difficulty_penalty=DIFFICULTY_PENALTY):
+    """
+    Choose which candidate courses to register.
+
+    A load's score is the model's prediction at its total units (`objective` "cgpa") or
+    the ensemble's pessimistic percentile ("risk"), less `difficulty_penalty` per point
+    of unit-weighted difficulty above neutral. Every total in [min_units, max_units] is
+    scored up front in one batch, so the search itself never calls the model.
+
+    Branch-and-bound over the optional courses, easiest first: a branch is cut when the
+    best score among the totals it can still reach, paired with the lowest difficulty it
+    can still reach, cannot beat the incumbent, or when an earlier branch reached the
+    same course and unit total with less difficulty. `courses` are dicts with code,
+    units and difficulty (None counts as neutral); `required` codes are always taken.
+    Returns None when no load fits the caps.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+    difficulty = {c["code"]: NEUTRAL_DIFFICULTY if c.get("difficulty") is None or pd.isna(c["difficulty"])
+                  else float(c["difficulty"]) for c in courses}
+    units = {c["code"]: int(c["units"]) for c in courses}
+    required = [code for code in dict.fromkeys(required) if code in units]
+    optional = sorted((code for code in units if code not in required), key=lambda c: (difficulty[c], units[c], c))
+
+    table = score_loads(model, profile, range(min_units, max_units + 1), feature_names)
+    base = dict(zip(table.index, table[OBJECTIVES[objective]]))
+    remaining = np.cumsum([units[c] for c in optional][::-1])[::-1].tolist() + [0]  # units left from course i on
+
+    def score(total, weighted):
+        return base[total] - difficulty_penalty * (weighted / total - NEUTRAL_DIFFICULTY)
+
+    best = {"score": -np.inf, "chosen": None, "nodes": 0}
+    least_difficulty = {}
+
+    def search(i, chosen, total, weighted):
+        best["nodes"] += 1
+        if min_units <= total <= max_units and total and score(total, weighted) > best["score"]:
+            best.update(score=score(total, weighted), chosen=list(chosen))
+        if i == len(optional):
+            return
+        reachable = [base[t] for t in range(max(total, min_units), min(total + remaining[i], max_units) + 1)]
+        if not reachable:
+            return
+        # Courses are sorted by difficulty, so no completion has a lower mean than this
+        easiest = min(weighted / total, difficulty[optional[i]]) if total else difficulty[optional[i]]
+        if max(reachable) - difficulty_penalty * (easiest - NEUTRAL_DIFFICULTY) <= best["score"]:
+            return
+        if least_difficulty.get((i, total), np.inf) <= weighted:
+            return
+        least_difficulty[(i, total)] = weighted
+
+        code = optional[i]
+        if total + units[code] <= max_units:
+            chosen.append(code)
+            search(i + 1, chosen, total + units[code], weighted + units[code] * difficulty[code])
+            chosen.pop()
+        search(i + 1, chosen, total, weighted)
+
+    start_total = sum(units[c] for c in required)
+    if start_total <= max_units:
+        search(0, list(required), start_total, sum(units[c] * difficulty[c] for c in required))
+    if best["chosen"] is None:
+        return None
+
+    chosen = best["chosen"]
+    total = sum(units[c] for c in chosen)
+    return {"courses": chosen, "units": total, "score": float(best["score"]),
+            "difficulty": sum(units[c] * difficulty[c] for c in chosen) / total,
+            "predicted": float(table.at[total, "predicted"]), "lower": float(table.at[total, "lower"]),
+            "nodes": best["nodes"], "table": table}
+
+
+if __name__ == "__main__":
+    import joblib
+
+    from optigrade.catalog import DEFAULT_CATALOG_PATH, load_course_catalog
+
+    parser = argparse.ArgumentParser(description="Pick next semester's courses for a student profile")
+    parser.add_argument("--model", default="models/model.pkl")
+    parser.add_argument("--catalog", default=DEFAULT_CATALOG_PATH)
+    parser.add_argument("--completed", nargs="*", default=[], help="passed course codes (candidates are the eligible courses)")
+    parser.add_argument("--required", nargs="*", default=[])
+    parser.add_argument("--cgpa", type=float, required=True)
+    parser.add_argument("--study-hours", type=float, default=15)
+    parser.add_argument("--units", type=int, nargs=2, default=UNIT_CAPS, metavar=("MIN", "MAX"))
+    parser.add_argument("--objective", choices=sorted(OBJECTIVES), default="cgpa")
+    args = parser.parse_args()
+
+    data = joblib.load(args.model)
+    catalog = load_course_catalog(args.catalog)
+    candidates = catalog.eligible(args.completed)
+    profile = {"current_CGPA": args.cgpa, "GPA_last_semester": args.cgpa, "study_hours": args.study_hours,
+               "attendance": 80.0, "engagement": 80.0, "midterm_score": 75.0}
+    result = optimize_load(data["model"], profile, candidates, *args.units, required=args.required,
+                           objective=args.objective, feature_names=data.get("feature_names"))
+    if result is None:
+        print(f"❌ No combination of the {len(candidates)} eligible courses fits {args.units[0]}-{args.units[1]} units")
+        raise SystemExit(1)
+    print(f"✅ {len(result['courses'])} courses, {result['units']} units "
+          f"(searched {result['nodes']} nodes over {len(candidates)} candidates)")
+    print(f"   Predicted CGPA {result['predicted']:.2f} (pessimistic {result['lower']:.2f}), "
+          f"mean difficulty {result['difficulty']:.1f}")
+    print(f"   {', '.join(result['courses'])}")
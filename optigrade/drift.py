@@ -0,0 +1,228 @@
+"""Constant-memory drift monitoring of model inputs and predictions against a training baseline"""
+import argparse
+import bisect
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+PREDICTION = "prediction"  # baseline/monitor entry for the model output
+PSI_WARN, PSI_ALERT = 0.1, 0.25  # usual PSI rule of thumb: <0.1 stable, >0.25 major shift
+MIN_OBSERVATIONS = 30  # below this the live histogram is too noisy to judge
+_EPSILON = 1e-4  # stands in for empty bins so PSI stays finite
+
+
+# ------------------ BASELINE ------------------
+def _summarise(values, bins):
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    cuts = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])) if len(values) else np.empty(0)
+    counts = np.bincount(np.searchsorted(cuts, values, side="right"), minlength=len(cuts) + 1)
+    return {"cuts": cuts.tolist(), "proportions": (counts / max(len(values), 1)).tolist(),
+            "min": float(values.min()) if len(values) else None,
+            "max": float(values.max()) if len(values) else None,
+            "mean": float(values.mean()) if len(values) else None, "n": int(len(values))}
+
+
+def build_baseline(frame, features, predictions=None, bins=10):
+    """
+    Training-time reference: quantile cut points and bin proportions per feature.
+
+    The cut points are fixed here, so live histograms never need more than
+    len(cuts) + 1 counters per feature however much traffic they see.
+    """
+    baseline = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "features": {name: _summarise(frame[name], bins) for name in features}}
+    if predictions is not None:
+        baseline["features"][PREDICTION] = _summarise(predictions, bins)
+    return baseline
+
+
+def save_baseline(baseline, path):
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(path):
+    """The stored baseline, or None when the file does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# ------------------ STATISTICS ------------------
+def psi(expected, actual):
+    """Population stability index between two bin-proportion vectors"""
+    expected = np.clip(np.asarray(expected, dtype=float), _EPSILON, None)
+    actual = np.clip(np.asarray(actual, dtype=float), _EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks(expected, actual):
+    """Kolmogorov-Smirnov distance evaluated at the bin edges (a lower bound on the exact statistic)"""
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+def degenerate(ref):
+    """True when the baseline is a single bin (e.g. a constant column), where PSI is always 0"""
+    return not ref["cuts"] or ref["min"] == ref["max"]
+
+
+def status(psi_value, n, outside_range=False, single_bin=False):
+    """
+    PSI-based status; for a single-bin baseline PSI cannot move, so any live value
+    outside the training range is the alert instead.
+    """
+    if n < MIN_OBSERVATIONS:
+        return "collecting"
+    if single_bin:
+        return "alert" if outside_range else "ok"
+    return "alert" if psi_value >= PSI_ALERT else "warn" if psi_value >= PSI_WARN else "ok"
+
+
+# ------------------ MONITOR ------------------
+class _Histogram:
+    """Counts over fixed cut points plus running count/mean/min/max"""
+
+    __slots__ = ("cuts", "counts", "missing", "n", "mean", "low", "high")
+
+    def __init__(self, cuts):
+        self.cuts = list(cuts)
+        self.counts = [0] * (len(self.cuts) + 1)
+        self.missing = 0
+        self.n = 0
+        self.mean = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, value):
+        if value != value:  # NaN
+            self.missing += 1
+            return
+        self.counts[bisect.bisect_right(self.cuts, value)] += 1
+        self.n += 1
+        self.mean += (value - self.mean) / self.n
+        self.low = min(self.low, value)
+        self.high = max(self.high, value)
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=float)
+        nan = np.isnan(values)
+        self.missing += int(nan.sum())
+        values = values[~nan]
+        if not len(values):
+            return
+        binned = np.bincount(np.searchsorted(self.cuts, values, side="right"), minlength=len(self.counts))
+        self.counts = [a + int(b) for a, b in zip(self.counts, binned)]
+        total = self.n + len(values)
+        self.mean += (float(values.sum()) - len(values) * self.mean) / total
+        self.n = total
+        self.low = min(self.low, float(values.min()))
+        self.high = max(self.high, float(values.max()))
+
+
+class DriftMonitor:
+    """
+    Streams every scored row into fixed-size histograms and compares them with the
+    baseline on demand.
+
+    observe() is a handful of bisects and additions under a lock, cheap enough to run
+    on every prediction; report() does the PSI/KS maths only when someone looks.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._histograms = {name: _Histogram(ref["cuts"]) for name, ref in baseline["features"].items()}
+        self._lock = threading.Lock()
+
+    def observe(self, features, prediction=None):
+        """Record one scored row (a mapping of feature name to value)"""
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                if name == PREDICTION:
+                    if prediction is not None:
+                        histogram.add(float(prediction))
+                elif name in features:
+                    try:
+                        histogram.add(float(features[name]))
+                    except (TypeError, ValueError):
+                        histogram.missing += 1
+
+    def observe_many(self, frame, predictions=None):
+        """Record a batch of scored rows (DataFrame, plus an array of predictions)"""
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                if name == PREDICTION:
+                    if predictions is not None:
+                        histogram.add_many(predictions)
+                elif name in frame:
+                    histogram.add_many(pd.to_numeric(frame[name], errors="coerce"))
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {name: _Histogram(h.cuts) for name, h in self._histograms.items()}
+            self.started = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def report(self):
+        """Per-feature drift: observations, PSI, KS, live vs training range and a status"""
+        with self._lock:
+            snapshot = {name: (list(h.counts), h.n, h.missing, h.mean, h.low, h.high)
+                        for name, h in self._histograms.items()}
+        features = {}
+        for name, (counts, n, missing, mean, low, high) in snapshot.items():
+            ref = self.baseline["features"][name]
+            actual = np.asarray(counts, dtype=float) / n if n else np.zeros(len(counts))
+            psi_value = psi(ref["proportions"], actual) if n else 0.0
+            outside = bool(n) and ref["min"] is not None and (low < ref["min"] or high > ref["max"])
+            features[name] = {
+                "n": n, "missing": missing,
+                "psi": round(psi_value, 4),
+                "ks": round(ks(ref["proportions"], actual), 4) if n else 0.0,
+                "mean": round(mean, 4) if n else None, "baseline_mean": ref["mean"],
+                "min": low if n else None, "max": high if n else None,
+                "outside_training_range": outside,
+                "single_bin_baseline": degenerate(ref),
+                "status": status(psi_value, n, outside, degenerate(ref))
+            }
+        return {"baseline_created": self.baseline.get("created"), "monitoring_since": self.started,
+                "features": features}
+
+    def to_json(self):
+        return json.dumps(self.report(), indent=2)
+
+    def report_frame(self):
+        """The report as a DataFrame, one row per feature, worst first"""
+        features = self.report()["features"]
+        if not features:
+            return pd.DataFrame()
+        frame = pd.DataFrame.from_dict(features, orient="index")
+        frame.index.name = "feature"
+        return frame.sort_values("psi", ascending=False)
+
+
+if __name__ == "__main__":
+    import joblib
+
+    from optigrade.validation import TRAINING_DATA, validate
+
+    parser = argparse.ArgumentParser(description="Rebuild the drift baseline for an already trained model")
+    parser.add_argument("training_data", nargs="?", default="data/training_data.csv")
+    parser.add_argument("--model", default="models/model.pkl")
+    parser.add_argument("--out", default="models/drift_baseline.json")
+    parser.add_argument("--bins", type=int, default=10)
+    args = parser.parse_args()
+
+    bundle = joblib.load(args.model)
+    data = validate(pd.read_csv(args.training_data), TRAINING_DATA).valid_rows()
+    for feature in bundle["feature_names"]:
+        if feature not in data:
+            data[feature] = 0.0  # as in train_model.py
+    inputs = data[bundle["feature_names"]]
+    save_baseline(build_baseline(inputs, bundle["feature_names"], bundle["model"].predict(inputs), args.bins), args.out)
+    print(f"✅ Drift baseline for {len(inputs)} training rows written to {args.out}")
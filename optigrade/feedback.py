@@ -0,0 +1,120 @@
+"""Rule table for feedback, tips and resource links, evaluated for whole cohorts at once"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Outlook message by predicted CGPA, highest band first
+OUTLOOK_BANDS = [
+    (3.7, "🌟 Excellent progress! You're on track for top honours."),
+    (3.0, "👍 Solid performance—keep up the consistency!"),
+    (2.5, "🛠️ Moderate zone—consider boosting study hours and engagement.")
+]
+DEFAULT_OUTLOOK = "🚧 At-risk range. Let's build a stronger study plan."
+
+# A rule fires when the input column is below the threshold (missing inputs count as 0)
+RULES = [
+    {"id": "attendance", "column": "Attendance %", "below": 70,
+     "tip": "📅 **Attendance Boost**: Try to attend at least 85% of classes. Regular attendance correlates with better grades."},
+    {"id": "study_hours", "column": "Study Hours per Week", "below": 15,
+     "tip": "⏱️ **Study Time**: Aim for 15-20 hours/week of focused study. Quality matters more than quantity!"},
+    {"id": "assignments", "column": "Assignments Completed", "below": 80,
+     "tip": "📝 **Assignments**: Complete all assignments on time. They're crucial for reinforcing concepts."},
+    {"id": "midterm", "column": "Midterm Score", "below": 60,
+     "tip": "📚 **Midterm Prep**: Review midterm mistakes. Focus on weak areas before finals."},
+    {"id": "engagement", "column": "Lecture Engagement", "below": 70,
+     "tip": "💬 **Engagement**: Actively participate in lectures. Ask questions and join discussions."}
+]
+DEFAULT_TIP = "🎯 **Maintain Momentum**: Your current habits are working well. Keep refining your approach!"
+
+# Resource links shown (in this order) when their rule fires; rule None means always
+RESOURCE_GROUPS = [
+    {"rule": "study_hours", "title": "Study Habits & Techniques", "links": [
+        ("Study Smarter, Not Harder", "https://learningcenter.unc.edu/tips-and-tools/studying-101-study-smarter-not-harder/", ""),
+        ("Active Learning Strategies", "https://www.cultofpedagogy.com/active-learning-strategies/", ""),
+        ("Pomodoro Technique Guide", "https://todoist.com/productivity-methods/pomodoro-technique", "")]},
+    {"rule": "attendance", "title": "Attendance Improvement", "links": [
+        ("Why Attendance Matters", "https://www.edutopia.org/article/why-attendance-matters", ""),
+        ("Building Attendance Habits", "https://www.understood.org/articles/en/how-to-help-your-child-with-attendance-issues", "")]},
+    {"rule": "engagement", "title": "Lecture Engagement", "links": [
+        ("Active Learning Strategies", "https://www.celt.iastate.edu/teaching/effective-teaching-practices/active-learning", ""),
+        ("Note-taking Systems", "https://www.student.unsw.edu.au/note-taking-skills", "")]},
+    {"rule": None, "title": "General Academic Improvement", "links": [
+        ("Khan Academy", "https://www.khanacademy.org/", "Free courses on all subjects"),
+        ("Coursera", "https://www.coursera.org/", "Online courses from top universities"),
+        ("Quizlet", "https://quizlet.com/", "Study tools and flashcards")]}
+]
+
+
+def evaluate_rules(frame, rules=None):
+    """Boolean DataFrame with one column per rule: which students each rule fires for"""
+    rules = rules or RULES
+    masks = {}
+    for rule in rules:
+        values = (pd.to_numeric(frame[rule["column"]], errors="coerce").fillna(0).to_numpy()
+                  if rule["column"] in frame else np.zeros(len(frame)))
+        masks[rule["id"]] = values < rule["below"]
+    return pd.DataFrame(masks, index=frame.index)
+
+
+def outlook(predicted_cgpa):
+    """Vectorized outlook message for an array of predicted CGPAs"""
+    predicted_cgpa = np.asarray(predicted_cgpa, dtype=float)
+    return np.select([predicted_cgpa >= cutoff for cutoff, _ in OUTLOOK_BANDS],
+                     [message for _, message in OUTLOOK_BANDS], default=DEFAULT_OUTLOOK)
+
+
+def cohort_feedback(frame, predicted_column="predicted_cgpa", rules=None):
+    """
+    Feedback for every student in one pass.
+
+    Returns a DataFrame (same index) with 'feedback', 'tips' (list of messages, in rule
+    order, or the maintain-momentum tip when nothing fires) and 'resource_groups'
+    (titles from RESOURCE_GROUPS to show).
+    """
+    rules = rules or RULES
+    masks = evaluate_rules(frame, rules)
+    tips = np.array([rule["tip"] for rule in rules], dtype=object)
+    fired = masks.to_numpy()
+
+    groups = [g for g in RESOURCE_GROUPS if g["rule"] is None or g["rule"] in masks]
+    group_titles = np.array([g["title"] for g in groups], dtype=object)
+    group_masks = np.column_stack([np.ones(len(frame), dtype=bool) if g["rule"] is None else masks[g["rule"]].to_numpy()
+                                   for g in groups])
+
+    return pd.DataFrame({
+        "feedback": outlook(frame[predicted_column]),
+        "tips": [list(tips[row]) or [DEFAULT_TIP] for row in fired],
+        "resource_groups": [list(group_titles[row]) for row in group_masks]
+    }, index=frame.index)
+
+
+def generate_feedback(predicted_cgpa, input_features):
+    """Generate brief, specific, actionable personalized feedback and study tips based on prediction"""
+    frame = pd.DataFrame([{**input_features, "predicted_cgpa": predicted_cgpa}])
+    row = cohort_feedback(frame).iloc[0]
+    return row["feedback"], row["tips"]
+
+
+def resource_markdown(group_titles):
+    """Markdown blocks for the given resource groups, in RESOURCE_GROUPS order"""
+    blocks = []
+    for group in RESOURCE_GROUPS:
+        if group["title"] in group_titles:
+            lines = [f"- [{name}]({url})" + (f" - {note}" if note else "") for name, url, note in group["links"]]
+            blocks.append(f"**{group['title']}:**\n" + "\n".join(lines))
+    return blocks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Feedback for a cohort CSV (one student per row)")
+    parser.add_argument("cohort", help="CSV with predicted_cgpa and the input columns used by the rules")
+    parser.add_argument("--out", default="cohort_feedback.csv")
+    args = parser.parse_args()
+
+    cohort = pd.read_csv(args.cohort)
+    result = cohort_feedback(cohort)
+    result["tips"] = result["tips"].str.join(" | ")
+    result["resource_groups"] = result["resource_groups"].str.join(" | ")
+    pd.concat([cohort, result], axis=1).to_csv(args.out, index=False)
+    print(f"✅ Feedback for {len(cohort)} students written to {args.out}")
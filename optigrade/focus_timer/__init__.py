@@ -0,0 +1,71 @@
+"""Browser-side Pomodoro countdown (a Streamlit custom component)"""
+import os
+import time
+
+import streamlit.components.v1 as components
+
+_focus_timer = components.declare_component(
+    "focus_timer",
+    path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+)
+
+
+def focus_timer(session_id=None, remaining=0, duration=0, idle_seconds=1500, presets=(25, 50), key=None):
+    """
+    Render the countdown, which ticks in the browser without rerunning the app.
+
+    Pass the active session's id (its start time), remaining and total seconds so a
+    reloaded page resumes the countdown. Returns the latest event sent by the
+    browser - {"event": "start" | "stop" | "complete", "duration", "nonce"} - or None.
+    """
+    return _focus_timer(
+        session_id=session_id,
+        remaining=float(remaining),
+        duration=int(duration),
+        idle_seconds=int(idle_seconds),
+        presets=list(presets),
+        key=key,
+        default=None
+    )
+
+
+# ------------------ SESSION STATE ------------------
+def timer_remaining(state, now=None):
+    """Seconds left in the active session (computed on demand, never polled)"""
+    if not state.study_timer_active:
+        return state.study_timer_remaining
+    now = time.time() if now is None else now
+    return max(0, state.study_timer_duration - (now - state.study_timer_start))
+
+
+def apply_timer_event(state, event, now=None):
+    """
+    Apply a start/stop/complete event from the browser timer to the session state once.
+
+    The component keeps returning its last event on every rerun, so an event whose nonce
+    was already applied is ignored. Stopping or completing an active session records it
+    in `focus_sessions` and counts a Pomodoro. Returns the event name, or None.
+    """
+    if not event or event.get('nonce') == state.focus_timer_nonce:
+        return None
+    state.focus_timer_nonce = event['nonce']
+    now = time.time() if now is None else now
+
+    if event['event'] == 'start':
+        duration = int(event['duration'])
+        state.study_timer_active = True
+        state.study_timer_start = now
+        state.study_timer_duration = duration
+        state.study_timer_remaining = duration
+    elif event['event'] in ('stop', 'complete') and state.study_timer_active:
+        remaining = 0 if event['event'] == 'complete' else timer_remaining(state, now)
+        state.study_timer_remaining = remaining
+        state.focus_sessions.append({
+            'Date': time.strftime("%Y-%m-%d %H:%M", time.localtime(now)),
+            'Planned (min)': state.study_timer_duration // 60,
+            'Focused (min)': round((state.study_timer_duration - remaining) / 60, 1),
+            'Completed': event['event'] == 'complete'
+        })
+        state.study_timer_active = False
+        state.pomodoro_count += 1
+    return event['event']
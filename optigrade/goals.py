@@ -0,0 +1,202 @@
+"""Goal store for Goals & Tasks: due-date heap plus per-priority/status indexes"""
+import heapq
+import json
+from collections import Counter
+from datetime import date
+
+PRIORITIES = ["High", "Medium", "Low"]
+NO_DUE_DATE = float('inf')  # goals without a due date sort last
+
+
+def _due_ordinal(due):
+    """'YYYY-MM-DD' (or a date) -> day number, so days left is a plain subtraction"""
+    if not due:
+        return NO_DUE_DATE
+    if isinstance(due, date):
+        return due.toordinal()
+    return date.fromisoformat(str(due)[:10]).toordinal()
+
+
+def _parse_completed(value):
+    """Completed flag from JSON or CSV ('False' and '0' are not completed)"""
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "yes", "y", "1", "done"):
+            return True
+        if text in ("false", "no", "n", "0", ""):
+            return False
+        raise ValueError(f"Unknown completed value: {value!r}")
+    return bool(value) if value is not None else False
+
+
+def _normalize_record(record):
+    """Validated keyword arguments for GoalStore._insert; raises before anything is stored"""
+    if not isinstance(record, dict):
+        raise TypeError(f"Goal records must be objects, got {type(record).__name__}")
+    priority = record.get("priority") or "Medium"
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+    return {"title": record["title"], "description": record.get("description") or "",
+            "due": record.get("due") or None, "priority": priority,
+            "completed": _parse_completed(record.get("completed", False))}
+
+
+class GoalStore:
+    """
+    Study goals indexed for the Goals & Tasks tab.
+
+    Active goals sit in a heap ordered by due date (then priority and insertion order);
+    completing or deleting a goal only updates the indexes and leaves a stale heap entry
+    that is skipped lazily. Counters keep the totals the progress chart needs, so no
+    rerun has to scan every goal.
+    """
+
+    def __init__(self, records=None):
+        self.goals = {}
+        self._next_id = 0
+        self._heap = []
+        self._stale = 0
+        self.status_counts = Counter()
+        self.priority_counts = Counter()  # active goals only
+        self.by_priority = {p: set() for p in PRIORITIES}
+        self.completed_ids = []
+        if records:
+            self.import_records(records)
+
+    def __len__(self):
+        return len(self.goals)
+
+    # ------------------ UPDATES ------------------
+    def _insert(self, title, description="", due=None, priority="Medium", completed=False):
+        if priority not in self.by_priority:
+            raise ValueError(f"Unknown priority: {priority}")
+        goal_id = self._next_id
+        self._next_id += 1
+        due_ordinal = _due_ordinal(due)
+        self.goals[goal_id] = {
+            "id": goal_id,
+            "title": title,
+            "description": description,
+            "due": None if due_ordinal == NO_DUE_DATE else date.fromordinal(due_ordinal).isoformat(),
+            "due_ordinal": due_ordinal,
+            "priority": priority,
+            "completed": bool(completed)
+        }
+        if completed:
+            self.status_counts["completed"] += 1
+            self.completed_ids.append(goal_id)
+        else:
+            self.status_counts["active"] += 1
+            self.priority_counts[priority] += 1
+            self.by_priority[priority].add(goal_id)
+        return goal_id
+
+    def add(self, title, description="", due=None, priority="Medium", completed=False):
+        """Add one goal in O(log n); returns its id"""
+        goal_id = self._insert(title, description, due, priority, completed)
+        if not completed:
+            heapq.heappush(self._heap, self._heap_entry(goal_id))
+        return goal_id
+
+    def complete(self, goal_id):
+        """Mark an active goal completed in O(1) (its heap entry is dropped lazily)"""
+        goal = self.goals[goal_id]
+        if goal["completed"]:
+            return
+        goal["completed"] = True
+        self._deactivate(goal)
+        self.status_counts["completed"] += 1
+        self.completed_ids.append(goal_id)
+
+    def remove(self, goal_id):
+        """Delete a goal"""
+        goal = self.goals.pop(goal_id)
+        if goal["completed"]:
+            self.status_counts["completed"] -= 1
+            self.completed_ids.remove(goal_id)
+        else:
+            self._deactivate(goal)
+
+    def _deactivate(self, goal):
+        self.status_counts["active"] -= 1
+        self.priority_counts[goal["priority"]] -= 1
+        self.by_priority[goal["priority"]].discard(goal["id"])
+        self._stale += 1
+        # Rebuild once stale entries outnumber live ones, keeping the heap O(active)
+        if self._stale > len(self._heap) // 2:
+            self._rebuild_heap()
+
+    def _heap_entry(self, goal_id):
+        goal = self.goals[goal_id]
+        return (goal["due_ordinal"], PRIORITIES.index(goal["priority"]), goal_id)
+
+    def _rebuild_heap(self):
+        self._heap = [self._heap_entry(i) for i, g in self.goals.items() if not g["completed"]]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _is_live(self, entry):
+        goal = self.goals.get(entry[2])
+        return goal is not None and not goal["completed"]
+
+    # ------------------ QUERIES ------------------
+    @property
+    def total(self):
+        return len(self.goals)
+
+    @property
+    def completed_count(self):
+        return self.status_counts["completed"]
+
+    def next_due(self):
+        """Most urgent active goal, or None"""
+        while self._heap and not self._is_live(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._stale -= 1
+        return self.goals[self._heap[0][2]] if self._heap else None
+
+    def active(self, limit=None):
+        """Active goals, most urgent first"""
+        entries = (heapq.nsmallest(limit + self._stale, self._heap) if limit is not None
+                   else sorted(self._heap))
+        goals = [self.goals[entry[2]] for entry in entries if self._is_live(entry)]
+        return goals[:limit] if limit is not None else goals
+
+    def completed(self):
+        """Completed goals in the order they were completed"""
+        return [self.goals[i] for i in self.completed_ids]
+
+    @staticmethod
+    def days_left(goal, today=None):
+        """Whole days until the goal is due (negative when overdue, None without a due date)"""
+        if goal["due_ordinal"] == NO_DUE_DATE:
+            return None
+        return goal["due_ordinal"] - (today or date.today()).toordinal()
+
+    # ------------------ BULK IMPORT / EXPORT ------------------
+    def import_records(self, records):
+        """
+        Add many goal dicts (title, description, due, priority, completed) with one heapify.
+        Every record is validated first, so a bad one leaves the store unchanged.
+        """
+        normalized = []
+        for r in records:
+            r = _normalize_record(r)
+            _due_ordinal(r["due"])  # bad dates raise here, before anything is stored
+            normalized.append(r)
+        ids = [self._insert(**r) for r in normalized]
+        self._heap.extend(self._heap_entry(i) for i in ids if not self.goals[i]["completed"])
+        heapq.heapify(self._heap)
+        return ids
+
+    def export_records(self):
+        """All goals as plain dicts, in insertion order"""
+        return [{k: goal[k] for k in ("title", "description", "due", "priority", "completed")}
+                for goal in self.goals.values()]
+
+    def to_json(self):
+        return json.dumps(self.export_records(), indent=2)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls(json.loads(text))
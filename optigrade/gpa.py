@@ -0,0 +1,120 @@
+"""Unit-weighted GPA/CGPA engine with configurable grading scales"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Bands are (minimum score, letter, grade points), highest first; below the last band
+# a course earns the scale's fail letter and 0 points.
+SCALES = {
+    "5-point": {"max": 5.0, "fail": "F",
+                "bands": [(70, "A", 5.0), (60, "B", 4.0), (50, "C", 3.0), (45, "D", 2.0), (40, "E", 1.0)]},
+    "4-point": {"max": 4.0, "fail": "F",
+                "bands": [(70, "A", 4.0), (60, "B", 3.0), (50, "C", 2.0), (45, "D", 1.0)]},
+    "4-point-us": {"max": 4.0, "fail": "F",
+                   "bands": [(93, "A", 4.0), (90, "A-", 3.7), (87, "B+", 3.3), (83, "B", 3.0), (80, "B-", 2.7),
+                             (77, "C+", 2.3), (73, "C", 2.0), (70, "C-", 1.7), (67, "D+", 1.3), (60, "D", 1.0)]}
+}
+DEFAULT_SCALE = "5-point"
+
+
+def get_scale(name=None, env=None):
+    """A grading scale by name, defaulting to OPTIGRADE_GRADING_SCALE or the 5-point scale"""
+    env = os.environ if env is None else env
+    name = name or env.get("OPTIGRADE_GRADING_SCALE", DEFAULT_SCALE)
+    if name not in SCALES:
+        raise ValueError(f"Unknown grading scale '{name}' (expected one of {', '.join(SCALES)})")
+    return SCALES[name]
+
+
+def _bands(grades, scale):
+    grades = np.asarray(grades, dtype=float)
+    return grades, [grades >= cutoff for cutoff, _, _ in scale["bands"]]
+
+
+def letter_grades(grades, scale=None):
+    """Letter grade for every score in an array"""
+    scale = scale or get_scale()
+    grades, conditions = _bands(grades, scale)
+    return np.select(conditions, [letter for _, letter, _ in scale["bands"]], default=scale["fail"])
+
+
+def grade_points(grades, scale=None):
+    """Grade points for every score (NaN where the score is missing)"""
+    scale = scale or get_scale()
+    grades, conditions = _bands(grades, scale)
+    points = np.select(conditions, [p for _, _, p in scale["bands"]], default=0.0)
+    return np.where(np.isnan(grades), np.nan, points)
+
+
+def _weighted(frame, scale, grade_column, units_column):
+    """Per-course quality points and attempted units, skipping ungraded courses"""
+    points = grade_points(frame[grade_column], scale)
+    units = pd.to_numeric(frame[units_column], errors="coerce").to_numpy(dtype=float)
+    graded = ~np.isnan(points) & ~np.isnan(units)
+    return pd.DataFrame({"quality_points": np.where(graded, points * units, 0.0),
+                         "units": np.where(graded, units, 0.0)}, index=frame.index)
+
+
+def gpa(grades, units, scale=None):
+    """Unit-weighted GPA of one set of courses (NaN when nothing is graded)"""
+    totals = _weighted(pd.DataFrame({"grade": grades, "units": units}), scale or get_scale(),
+                       "grade", "units").sum()
+    return totals["quality_points"] / totals["units"] if totals["units"] else float("nan")
+
+
+def semester_gpas(frame, scale=None, by=("user_id", "semester"), grade_column="grade", units_column="course_units"):
+    """
+    GPA for every group of course records (by default every student's semester).
+
+    Returns one row per group with the units graded, the quality points earned and the
+    unit-weighted GPA, computed with grouped sums rather than a loop over students.
+    """
+    by = list(by)
+    weighted = _weighted(frame, scale or get_scale(), grade_column, units_column)
+    totals = weighted.groupby([frame[column] for column in by], sort=False).sum()
+    totals["gpa"] = totals["quality_points"] / totals["units"].where(totals["units"] > 0)
+    return totals.reset_index()
+
+
+def cumulative_cgpa(frame, scale=None, by="user_id", grade_column="grade", units_column="course_units",
+                    prior=None):
+    """
+    CGPA for every student over all graded course records.
+
+    `prior` optionally carries earlier history as a DataFrame indexed by student with
+    'cgpa' and 'units' columns; it is folded in as quality points, so a student's CGPA
+    stays unit-weighted across the whole record.
+    """
+    weighted = _weighted(frame, scale or get_scale(), grade_column, units_column)
+    totals = weighted.groupby(frame[by], sort=False).sum()
+    if prior is not None:
+        earlier = pd.DataFrame({"quality_points": prior["cgpa"] * prior["units"], "units": prior["units"]})
+        totals = totals.add(earlier, fill_value=0)
+    totals["cgpa"] = totals["quality_points"] / totals["units"].where(totals["units"] > 0)
+    totals.index.name = by
+    return totals.reset_index()
+
+
+def combine_cgpa(previous_cgpa, previous_units, term_gpa, term_units):
+    """CGPA after adding a term to an earlier record"""
+    total_units = previous_units + term_units
+    if not total_units:
+        return float("nan")
+    return (previous_cgpa * previous_units + term_gpa * term_units) / total_units
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute GPA and CGPA for every student in a records CSV")
+    parser.add_argument("records", help="CSV with user_id, semester, grade and course_units columns")
+    parser.add_argument("--scale", choices=sorted(SCALES), default=None)
+    parser.add_argument("--out", default="cgpa_report.csv")
+    args = parser.parse_args()
+
+    records = pd.read_csv(args.records)
+    scale = get_scale(args.scale)
+    semesters = semester_gpas(records, scale).pivot(index="user_id", columns="semester", values="gpa")
+    report = cumulative_cgpa(records, scale).set_index("user_id").join(semesters.add_suffix("_gpa"))
+    report.to_csv(args.out)
+    print(f"✅ GPA and CGPA for {len(report)} students written to {args.out}")
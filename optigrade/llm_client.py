@@ -0,0 +1,198 @@
+"""Resilient wrapper around LLM calls: rate limit, bounded concurrency, retries, circuit breaker"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+# Errors that will not succeed on retry (bad request, auth, unknown model)
+NON_RETRYABLE = {"InvalidArgument", "PermissionDenied", "Unauthenticated", "NotFound", "ValueError"}
+
+
+class LLMUnavailable(Exception):
+    """The call was not made or did not succeed; callers should use their fallback"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` calls per second on average, bursts up to `capacity`"""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available; returns the seconds to wait otherwise (0 = acquired)"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout=None, sleep=time.sleep):
+        """Wait for a token, giving up after `timeout` seconds"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            if deadline is not None and self.clock() + wait > deadline:
+                return False
+            sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed requests and rejects calls for
+    `reset_timeout` seconds; then lets one trial call through (half-open) and closes
+    again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if self.clock() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def release(self):
+        """Give back a trial slot for a call that never reached the API"""
+        with self._lock:
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+
+
+class ResilientClient:
+    """
+    Process-wide gate in front of an LLM call.
+
+    Every request takes a rate-limiter token and a concurrency slot (waiting at most
+    `queue_timeout` seconds for each), runs with a per-attempt timeout, and is retried
+    with full-jitter exponential backoff within an overall deadline. Failed requests
+    feed the circuit breaker, and while it is open calls fail fast with LLMUnavailable.
+    """
+
+    def __init__(self, rate=2.0, burst=5, max_concurrency=4, timeout=20.0, max_retries=2,
+                 base_delay=0.5, max_delay=8.0, deadline=45.0, queue_timeout=5.0, breaker=None,
+                 sleep=time.sleep):
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.queue_timeout = queue_timeout
+        self.sleep = sleep
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+
+    @classmethod
+    def from_env(cls, env=None):
+        """Settings from OPTIGRADE_LLM_RATE, _BURST, _CONCURRENCY, _TIMEOUT and _RETRIES"""
+        env = os.environ if env is None else env
+        return cls(rate=float(env.get("OPTIGRADE_LLM_RATE", 2.0)),
+                   burst=int(env.get("OPTIGRADE_LLM_BURST", 5)),
+                   max_concurrency=int(env.get("OPTIGRADE_LLM_CONCURRENCY", 4)),
+                   timeout=float(env.get("OPTIGRADE_LLM_TIMEOUT", 20.0)),
+                   max_retries=int(env.get("OPTIGRADE_LLM_RETRIES", 2)))
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _attempt(self, call, args, kwargs):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise LLMUnavailable("Too many requests in flight")
+        try:
+            future = self._executor.submit(call, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        # A timed-out call keeps its slot until it really finishes, so the bound holds
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result(timeout=self.timeout)
+
+    def call(self, call, *args, **kwargs):
+        """Run call(*args, **kwargs) under the limits; raises LLMUnavailable when it cannot succeed"""
+        if not self.breaker.allow():
+            raise LLMUnavailable("LLM circuit is open after repeated failures")
+
+        started = time.monotonic()
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                if not self.bucket.acquire(timeout=self.queue_timeout, sleep=self.sleep):
+                    raise LLMUnavailable("Rate limit reached")
+                result = self._attempt(call, args, kwargs)
+            except LLMUnavailable:
+                # Local limits, not an API failure: only a real API error counts against the breaker
+                if last_error is None:
+                    self.breaker.release()
+                    raise
+                break
+            except FutureTimeout:
+                last_error = LLMUnavailable(f"LLM call timed out after {self.timeout:.0f}s")
+            except Exception as e:
+                last_error = e
+                if type(e).__name__ in NON_RETRYABLE:
+                    break
+            else:
+                self.breaker.record_success()
+                return result
+
+            delay = self._backoff(attempt)
+            if attempt == self.max_retries or time.monotonic() - started + delay + self.timeout > self.deadline:
+                break
+            self.sleep(delay)
+
+        self.breaker.record_failure()
+        if isinstance(last_error, LLMUnavailable):
+            raise last_error
+        raise LLMUnavailable(str(last_error)) from last_error
+
+    def call_with_fallback(self, fallback, call, *args, **kwargs):
+        """(result, False) from the LLM, or (fallback(), True) when it is unavailable"""
+        try:
+            return self.call(call, *args, **kwargs), False
+        except LLMUnavailable:
+            return fallback(), True
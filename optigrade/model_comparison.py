@@ -0,0 +1,209 @@
+"""Compare candidate CGPA models on one feature spec: cross-validated accuracy and what each costs to run"""
+import argparse
+import io
+import multiprocessing
+import sys
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.dummy import DummyRegressor
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.model_selection import GroupKFold, KFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from optigrade.prediction import DEFAULT_FEATURES
+from optigrade.validation import STUDENT_RECORDS, TRAINING_DATA, validate
+
+try:
+    import resource
+except ImportError:  # Windows: process peak memory is not reported
+    resource = None
+
+# Feature specs every candidate is trained on: where the data comes from and what it predicts.
+# Rows sharing a `groups` value (one student's courses) always fall in the same fold.
+FEATURE_SPECS = {
+    "app": {"path": "data/training_data.csv", "schema": TRAINING_DATA,
+            "features": DEFAULT_FEATURES, "target": "target_CGPA"},
+    "course_records": {"path": "data/student_data.csv", "schema": STUDENT_RECORDS, "rows": {"semester": "previous"},
+                       "features": ["grade", "study_hours", "course_units", "course_difficulty", "attendance",
+                                    "current_cgpa"],
+                       "target": "semester_gpa", "groups": "user_id"}
+}
+
+
+def _random_forest():
+    return RandomForestRegressor(random_state=42)  # as in models/train_model.py
+
+
+def _xgboost():
+    import xgboost as xgb
+    return xgb.XGBRegressor(objective="reg:squarederror", n_estimators=50, random_state=42)  # as in source_code.txt
+
+
+def _ridge():
+    return make_pipeline(StandardScaler(), Ridge(alpha=1.0))
+
+
+def _linear():
+    return LinearRegression()
+
+
+def _mean():
+    return DummyRegressor(strategy="mean")
+
+
+CANDIDATES = {"random_forest": _random_forest, "xgboost": _xgboost, "ridge": _ridge,
+              "linear": _linear, "mean_baseline": _mean}
+
+
+def available_candidates():
+    """Candidate names whose libraries are installed"""
+    names = []
+    for name, factory in CANDIDATES.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def load_spec(name):
+    """
+    (X, y, groups) for a feature spec: validated rows only, missing feature columns
+    filled with 0; groups is None when the spec has no group column.
+    """
+    spec = FEATURE_SPECS[name]
+    data = validate(pd.read_csv(spec["path"]), spec["schema"]).valid_rows()
+    for column, value in spec.get("rows", {}).items():
+        data = data[data[column] == value]
+    data = data.dropna(subset=[spec["target"]])
+    X = pd.DataFrame({f: data[f].astype(float) if f in data else 0.0 for f in spec["features"]}, index=data.index)
+    groups = data[spec["groups"]].reset_index(drop=True) if "groups" in spec else None
+    return X.fillna(0.0).reset_index(drop=True), data[spec["target"]].astype(float).reset_index(drop=True), groups
+
+
+# ------------------ ACCURACY ------------------
+def _fit_fold(name, X, y, train, test):
+    model = CANDIDATES[name]()
+    model.fit(X.iloc[train], y.iloc[train])
+    return name, test, np.asarray(model.predict(X.iloc[test]), dtype=float)
+
+
+def cross_validate(names, X, y, folds=5, n_jobs=-1, seed=42, groups=None):
+    """
+    Out-of-fold RMSE, MAE and R² per candidate. Every (candidate, fold) fit is an
+    independent job, so the whole grid runs in parallel. With `groups`, folds split
+    by group (GroupKFold), so no student is scored by a model trained on their own rows.
+    """
+    if groups is not None:
+        folds = max(2, min(folds, pd.Series(groups).nunique()))
+        splits = list(GroupKFold(folds).split(X, y, groups))
+    else:
+        folds = max(2, min(folds, len(X)))
+        splits = list(KFold(folds, shuffle=True, random_state=seed).split(X))
+    jobs = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(_fit_fold)(name, X, y, train, test) for name in names for train, test in splits)
+    predictions = {name: np.empty(len(y)) for name in names}
+    for name, test, predicted in jobs:
+        predictions[name][test] = predicted
+
+    rows = {}
+    actual = y.to_numpy()
+    for name, predicted in predictions.items():
+        error = predicted - actual
+        total = np.sum((actual - actual.mean()) ** 2)
+        rows[name] = {"rmse": float(np.sqrt(np.mean(error ** 2))), "mae": float(np.mean(np.abs(error))),
+                      "r2": float(1 - np.sum(error ** 2) / total) if total else float("nan")}
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+# ------------------ COST ------------------
+def _peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024  # bytes on macOS, KiB on Linux
+
+
+def _measure(name, X, y, batch_rows, repeats):
+    """Runs in a fresh process so the process peak belongs to this candidate (and its library) alone"""
+    started = time.perf_counter()
+    model = CANDIDATES[name]()
+    model.fit(X, y)
+    train_seconds = time.perf_counter() - started
+
+    # Second fit under tracemalloc (which slows fitting, so it is not the timed one)
+    tracemalloc.start()
+    CANDIDATES[name]().fit(X, y)
+    fit_peak_mb = tracemalloc.get_traced_memory()[1] / (1 << 20)  # Python and NumPy allocations
+    tracemalloc.stop()
+
+    buffer = io.BytesIO()
+    joblib.dump({"model": model, "feature_names": list(X.columns)}, buffer)
+
+    row = X.iloc[[0]]
+    model.predict(row)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - started)
+    batch = X.sample(batch_rows, replace=True, random_state=0)
+    started = time.perf_counter()
+    model.predict(batch)
+    batch_seconds = time.perf_counter() - started
+
+    return {"train_s": train_seconds, "artifact_kb": len(buffer.getvalue()) / 1024, "fit_peak_mb": fit_peak_mb,
+            "process_peak_mb": _peak_rss_mb(), "single_row_ms": float(np.median(timings)) * 1000,
+            "batch_ms_per_1k": batch_seconds * 1000 / (batch_rows / 1000)}
+
+
+def measure_costs(names, X, y, batch_rows=10000, repeats=200, isolate=True):
+    """
+    Training time, pickled artifact size, memory and single-row/batch inference latency
+    for a fit on all rows. With `isolate` each candidate runs in its own spawned process,
+    so process_peak_mb covers the interpreter, the model's library, fitting and scoring.
+    """
+    rows = {}
+    for name in names:
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                rows[name] = pool.apply(_measure, (name, X, y, batch_rows, repeats))
+        else:
+            rows[name] = _measure(name, X, y, batch_rows, repeats)
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def compare(spec="app", names=None, folds=5, n_jobs=-1, batch_rows=10000, repeats=200, isolate=True):
+    """The comparison table: accuracy and cost per candidate, most accurate first"""
+    names = names or available_candidates()
+    X, y, groups = load_spec(spec)
+    table = cross_validate(names, X, y, folds, n_jobs, groups=groups).join(measure_costs(names, X, y, batch_rows, repeats, isolate))
+    table["rmse_vs_best"] = table["rmse"] / table["rmse"].min()
+    table.index.name = "model"
+    return table.sort_values("rmse")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare candidate models for the app on a common feature spec")
+    parser.add_argument("--spec", choices=sorted(FEATURE_SPECS), default="app")
+    parser.add_argument("--models", nargs="+", choices=sorted(CANDIDATES), help="default: every installed candidate")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel cross-validation jobs")
+    parser.add_argument("--out", help="also write the table to this CSV")
+    args = parser.parse_args()
+
+    X, y, groups = load_spec(args.spec)
+    print(f"📊 {args.spec}: {len(X)} rows, features {list(X.columns)}"
+          + (f", {groups.nunique()} groups by {FEATURE_SPECS[args.spec]['groups']}" if groups is not None else ""))
+    result = compare(args.spec, args.models, args.folds, args.jobs)
+    print(result.round(4).to_string())
+    if args.out:
+        result.to_csv(args.out)
+        print(f"✅ Table written to {args.out}")
@@ -0,0 +1,219 @@
+"""Per-institution models loaded lazily and kept under a memory budget with LRU eviction"""
+import json
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import joblib
+
+from optigrade.prediction import DEFAULT_FEATURES, model_fingerprint
+from optigrade.surrogate import Surrogate, surrogate_path
+
+DEFAULT_TENANT = "default"
+_TENANT_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class UnknownTenant(KeyError):
+    """No model is registered for this institution"""
+
+
+class ModelPool:
+    """
+    Thread-safe pool of tenant models.
+
+    The default tenant's model is models/model.pkl; any other tenant's lives in
+    <root>/<tenant>/model.pkl, optionally with a tenant.json of settings (for example
+    its grading_scale) and a lookup-table surrogate.npz. A model is loaded on first
+    request and counted against `budget_bytes` by its file size (plus its surrogate's
+    table); when a load would exceed the budget the least recently used models are
+    dropped first. Callers should not hold on to entries between requests, or an
+    evicted model stays in memory next to its reloaded copy. Requests (not every
+    lookup) are counted and saved to `usage_path` so the next process can pre-warm
+    the busiest tenants.
+    """
+
+    def __init__(self, root=os.path.join("models", "tenants"), default_path=os.path.join("models", "model.pkl"),
+                 budget_bytes=512 << 20, usage_path=None, loader=joblib.load, save_every=50):
+        self.root = root
+        self.default_path = default_path
+        self.budget_bytes = budget_bytes
+        self.usage_path = usage_path
+        self.loader = loader
+        self.save_every = save_every
+        self.usage = Counter(self._read_usage())
+        self.stats = Counter()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._loading = {}
+
+    @classmethod
+    def from_env(cls, env=None):
+        """Settings from OPTIGRADE_MODEL_ROOT, OPTIGRADE_MODEL_BUDGET_MB and OPTIGRADE_MODEL_USAGE"""
+        env = os.environ if env is None else env
+        root = env.get("OPTIGRADE_MODEL_ROOT", os.path.join("models", "tenants"))
+        return cls(root=root, budget_bytes=int(float(env.get("OPTIGRADE_MODEL_BUDGET_MB", 512)) * (1 << 20)),
+                   usage_path=env.get("OPTIGRADE_MODEL_USAGE", os.path.join(root, "usage.json")))
+
+    # ------------------ REGISTRY ------------------
+    def path_for(self, tenant):
+        if tenant == DEFAULT_TENANT:
+            return self.default_path
+        if not _TENANT_NAME.match(tenant or ""):
+            raise UnknownTenant(tenant)
+        return os.path.join(self.root, tenant, "model.pkl")
+
+    def tenants(self):
+        """Every tenant with a model on disk"""
+        found = [DEFAULT_TENANT] if os.path.exists(self.default_path) else []
+        if os.path.isdir(self.root):
+            found += sorted(name for name in os.listdir(self.root)
+                            if _TENANT_NAME.match(name) and os.path.exists(os.path.join(self.root, name, "model.pkl")))
+        return found
+
+    def _load(self, tenant):
+        path = self.path_for(tenant)
+        if not os.path.exists(path):
+            raise UnknownTenant(tenant)
+        data = self.loader(path)
+        if isinstance(data, dict) and "model" in data:
+            model, features = data["model"], data.get("feature_names") or DEFAULT_FEATURES
+        else:
+            model, features = data, DEFAULT_FEATURES  # bare estimator pickles
+        config_path = os.path.join(os.path.dirname(path), "tenant.json") if tenant != DEFAULT_TENANT else None
+        config = {}
+        if config_path and os.path.exists(config_path):
+            with open(config_path) as f:
+                config = json.load(f)
+        version = model_fingerprint(path)
+        # A surrogate built with python -m optigrade.surrogate is used only if it matches this model
+        surrogate = Surrogate.load(surrogate_path(path)) if os.path.exists(surrogate_path(path)) else None
+        if surrogate is not None and surrogate.model_version != version:
+            surrogate = None
+        return {"tenant": tenant, "model": model, "feature_names": list(features), "config": config,
+                "version": version, "surrogate": surrogate,
+                "bytes": os.path.getsize(path) + (surrogate.nbytes if surrogate else 0)}
+
+    # ------------------ POOL ------------------
+    def get(self, tenant=DEFAULT_TENANT, request=False):
+        """
+        The tenant's entry (model, feature_names, version, config), loading it if needed.
+        Pass request=True once per user request (not per lookup) to count it in `usage`.
+        """
+        entry = self._get(tenant)
+        if request:
+            with self._lock:
+                self.usage[tenant] += 1
+                self.stats["requests"] += 1
+                snapshot = dict(self.usage) if self.usage_path and self.stats["requests"] % self.save_every == 0 else None
+            if snapshot is not None:
+                self._write_usage(snapshot)
+        return entry
+
+    def _get(self, tenant):
+        with self._lock:
+            entry = self._entries.get(tenant)
+            if entry is not None:
+                self._entries.move_to_end(tenant)
+                self.stats["hits"] += 1
+                return entry
+            # One thread loads; others asking for the same tenant wait for it
+            loading = self._loading.get(tenant)
+            if loading is None:
+                loading = self._loading[tenant] = threading.Event()
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            loading.wait()
+            with self._lock:
+                entry = self._entries.get(tenant)
+            if entry is None:
+                raise UnknownTenant(tenant)
+            return entry
+
+        try:
+            entry = self._load(tenant)
+            with self._lock:
+                self.stats["misses"] += 1
+                self._make_room(entry["bytes"])
+                self._entries[tenant] = entry
+                self._bytes += entry["bytes"]
+            return entry
+        finally:
+            with self._lock:
+                del self._loading[tenant]
+            loading.set()
+
+    def _make_room(self, needed):
+        """Evict least recently used models until `needed` more bytes fit (caller holds the lock)"""
+        while self._entries and self._bytes + needed > self.budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted["bytes"]
+            self.stats["evictions"] += 1
+
+    def evict(self, tenant):
+        with self._lock:
+            entry = self._entries.pop(tenant, None)
+            if entry:
+                self._bytes -= entry["bytes"]
+
+    def loaded(self):
+        """Loaded tenants, least recently used first"""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def bytes_used(self):
+        return self._bytes
+
+    # ------------------ USAGE & PRE-WARMING ------------------
+    def _read_usage(self):
+        if not self.usage_path or not os.path.exists(self.usage_path):
+            return {}
+        try:
+            with open(self.usage_path) as f:
+                return {k: int(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def save_usage(self):
+        """Write request counts atomically (several workers may share the file)"""
+        with self._lock:
+            snapshot = dict(self.usage)
+        self._write_usage(snapshot)
+
+    def _write_usage(self, usage):
+        if not self.usage_path:
+            return
+        os.makedirs(os.path.dirname(self.usage_path) or ".", exist_ok=True)
+        tmp = f"{self.usage_path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(usage, f)
+        os.replace(tmp, self.usage_path)
+
+    def prewarm(self, limit=3):
+        """Load the most-used tenants (by saved usage) that fit in the budget; returns their names"""
+        available, planned, total = set(self.tenants()), [], 0
+        for tenant, _ in self.usage.most_common():
+            if len(planned) >= limit:
+                break
+            if tenant in available:
+                size = os.path.getsize(self.path_for(tenant))
+                if total + size <= self.budget_bytes:
+                    planned.append(tenant)
+                    total += size
+        # Least used first, so the busiest tenant ends up most recently used
+        for tenant in reversed(planned):
+            try:
+                entry = self._load(tenant)
+            except Exception:
+                continue  # a broken model is reported when it is actually requested
+            with self._lock:
+                if tenant not in self._entries:
+                    self._make_room(entry["bytes"])
+                    self._entries[tenant] = entry
+                    self._bytes += entry["bytes"]
+        return [tenant for tenant in planned if tenant in self._entries]
@@ -0,0 +1,51 @@
+"""Helpers for scoring many feature rows with the CGPA model in a single call"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Feature order used by models/train_model.py
+DEFAULT_FEATURES = [
+    'GPA_last_semester',
+    'credit_load',
+    'current_CGPA',
+    'study_hours',
+    'attendance',
+    'engagement',
+    'midterm_score'
+]
+
+
+def feature_vector(features, feature_names=None):
+    """Turn a mapped feature dict into a float array in model order (missing/bad values become 0.0)"""
+    feature_names = feature_names or DEFAULT_FEATURES
+    values = []
+    for feature in feature_names:
+        try:
+            values.append(float(features.get(feature, 0.0)))
+        except (TypeError, ValueError):
+            values.append(0.0)
+    return np.array(values, dtype=float)
+
+
+def repeat_features(features, n_rows, feature_names=None):
+    """Build an (n_rows x n_features) DataFrame where every row is the given profile"""
+    feature_names = feature_names or DEFAULT_FEATURES
+    base = feature_vector(features, feature_names)
+    return pd.DataFrame(np.tile(base, (n_rows, 1)), columns=feature_names)
+
+
+def predict_batch(model, frame):
+    """Run one model.predict over every row of the frame and return a float array"""
+    if len(frame) == 0:
+        return np.empty(0, dtype=float)
+    return np.asarray(model.predict(frame), dtype=float)
+
+
+def model_fingerprint(path):
+    """Short content hash of a model file, used as the model version in cache keys"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
@@ -0,0 +1,131 @@
+"""Recommendation prompts: compact profiles, token budgets and model tiers"""
+import math
+import os
+
+# Model tiers; the fast tier answers by default, the pro tier only when a student asks.
+# Gemini 2.5 output budgets include the model's thinking tokens, so leave headroom.
+TIER_DEFAULTS = {
+    "fast": {"model": "gemini-2.5-flash", "max_output_tokens": 1536, "temperature": 0.6, "words": 250},
+    "pro": {"model": "gemini-2.5-pro", "max_output_tokens": 4096, "temperature": 0.7, "words": 500}
+}
+DEFAULT_TIER = "fast"
+PROMPT_TOKEN_BUDGET = 400
+CHARS_PER_TOKEN = 4  # rough average for English text and Gemini's tokenizer
+
+FOCUS_AREAS = [
+    "study habits",
+    "attendance",
+    "learning style",
+    "course difficulty",
+    "time allocation",
+    "resources (books, websites)"
+]
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for budgeting (no API call)"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def load_tiers(env=None):
+    """
+    Tier settings with environment overrides, e.g. OPTIGRADE_FAST_MODEL,
+    OPTIGRADE_PRO_MAX_OUTPUT_TOKENS or OPTIGRADE_FAST_WORDS.
+    """
+    env = os.environ if env is None else env
+    tiers = {}
+    for name, defaults in TIER_DEFAULTS.items():
+        prefix = f"OPTIGRADE_{name.upper()}_"
+        tier = dict(defaults)
+        tier["model"] = env.get(prefix + "MODEL", tier["model"])
+        for setting in ("max_output_tokens", "words"):
+            tier[setting] = int(env.get(prefix + setting.upper(), tier[setting]))
+        tier["temperature"] = float(env.get(prefix + "TEMPERATURE", tier["temperature"]))
+        tiers[name] = tier
+    return tiers
+
+
+def select_tier(tiers, escalate=False, env=None):
+    """Name of the tier to use: the default tier unless escalation is requested and allowed"""
+    env = os.environ if env is None else env
+    default = env.get("OPTIGRADE_DEFAULT_TIER", DEFAULT_TIER)
+    allow = env.get("OPTIGRADE_ALLOW_ESCALATION", "1").lower() not in ("0", "false", "no")
+    if escalate and allow and "pro" in tiers:
+        return "pro"
+    return default if default in tiers else DEFAULT_TIER
+
+
+# ------------------ PROFILE ------------------
+def compact_profile(current_cgpa, current_courses, previous_courses=None, predicted_cgpa=None,
+                    token_budget=PROMPT_TOKEN_BUDGET // 2):
+    """
+    Short, identifier-free summary of the student for the prompt.
+
+    Courses are listed as CODE(units) and averaged habits replace per-course rows; when
+    the course list would exceed the token budget the remainder is summarised as '+N more'.
+    """
+    lines = [f"CGPA: {current_cgpa:.2f}" if isinstance(current_cgpa, (int, float)) else f"CGPA: {current_cgpa}"]
+    if predicted_cgpa is not None:
+        lines.append(f"Predicted next CGPA: {predicted_cgpa:.2f}")
+
+    previous_courses = [c for c in (previous_courses or []) if c.get("grade") is not None]
+    if previous_courses:
+        n = len(previous_courses)
+        lines.append(
+            f"Last semester: avg grade {sum(c['grade'] for c in previous_courses) / n:.0f}%, "
+            f"{sum(c.get('study_hours') or 0 for c in previous_courses) / n:.0f} study h/wk per course, "
+            f"attendance {sum(c.get('attendance') or 0 for c in previous_courses) / n:.0f}%")
+        styles = sorted({c["learning_style"] for c in previous_courses if c.get("learning_style")})
+        if styles:
+            lines.append(f"Learning style: {', '.join(styles)}")
+
+    courses = [f"{c['course_id']}({c['course_units']}u)" for c in (current_courses or []) if c.get("course_id")]
+    used = estimate_tokens("\n".join(lines))
+    shown = []
+    for i, course in enumerate(courses):
+        if used + estimate_tokens(course) + 2 > token_budget:
+            shown.append(f"+{len(courses) - i} more")
+            break
+        shown.append(course)
+        used += estimate_tokens(course) + 1
+    lines.append(f"Current courses: {', '.join(shown) if shown else 'none'}")
+    return "\n".join(lines)
+
+
+# ------------------ PROMPT ------------------
+def build_prompt(profile, tier):
+    """Recommendation prompt sized for the tier's word limit"""
+    return (
+        "You are an academic advisor. Student profile:\n"
+        f"{profile}\n\n"
+        "Give specific, actionable recommendations to raise this student's CGPA, covering: "
+        f"{'; '.join(FOCUS_AREAS)}.\n"
+        f"Use short headings and bullet points, at most {tier['words']} words. Be practical and encouraging."
+    )
+
+
+def plan_request(profile, tiers, tier_name, token_budget=PROMPT_TOKEN_BUDGET):
+    """
+    Prompt plus model and generation settings for one recommendation request.
+
+    Raises ValueError when the prompt does not fit the budget (the profile should have
+    been compacted first).
+    """
+    tier = tiers[tier_name]
+    prompt = build_prompt(profile, tier)
+    prompt_tokens = estimate_tokens(prompt)
+    if prompt_tokens > token_budget:
+        raise ValueError(f"Prompt uses ~{prompt_tokens} tokens, over the {token_budget} token budget")
+    return {
+        "tier": tier_name,
+        "model": tier["model"],
+        "prompt": prompt,
+        "prompt_tokens": prompt_tokens,
+        "generation_config": {
+            "temperature": tier["temperature"],
+            "top_p": 0.85,
+            "top_k": 40,
+            "candidate_count": 1,
+            "max_output_tokens": tier["max_output_tokens"]
+        }
+    }
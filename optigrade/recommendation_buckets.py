@@ -0,0 +1,134 @@
+"""Recommendation cache warm-up: advice pre-generated for bucketed student profiles"""
+import argparse
+import asyncio
+import bisect
+import itertools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from optigrade.cache import make_key
+from optigrade.prompts import plan_request
+
+# Band edges (a value equal to an edge falls in the higher band) and the wording used in prompts.
+# CGPA bands are the 5-point degree classes; other scales are rescaled onto them.
+BANDS = {
+    "cgpa": {"edges": [1.5, 2.4, 3.5, 4.5],
+             "labels": ["Pass (below 1.50)", "Third Class (1.50-2.39)", "Second Class Lower (2.40-3.49)",
+                        "Second Class Upper (3.50-4.49)", "First Class (4.50-5.00)"]},
+    "attendance": {"edges": [50, 70, 85], "labels": ["below 50%", "50-69%", "70-84%", "85% or more"]},
+    "study_hours": {"edges": [5, 10, 20], "labels": ["under 5", "5-9", "10-19", "20 or more"]}
+}
+BUCKET_TTL = 14 * 24 * 3600  # warm advice outlives a start-of-term rush; rerun the job each term
+MAX_DISTANCE = 1             # serve a neighbouring bucket at most one band away in one dimension
+
+
+def bucket_for(cgpa, attendance, study_hours, max_cgpa=5.0):
+    """(cgpa band, attendance band, study-hours band) indices for a student"""
+    values = {"cgpa": (cgpa or 0.0) * 5.0 / max_cgpa, "attendance": attendance or 0.0, "study_hours": study_hours or 0.0}
+    return tuple(bisect.bisect_right(BANDS[name]["edges"], values[name]) for name in BANDS)
+
+
+def all_buckets():
+    return list(itertools.product(*(range(len(band["labels"])) for band in BANDS.values())))
+
+
+def bucket_id(bucket):
+    return "-".join(f"{name}{index}" for name, index in zip(BANDS, bucket))
+
+
+def bucket_profile(bucket):
+    """Prompt profile shared by every student in the bucket"""
+    cgpa, attendance, hours = (BANDS[name]["labels"][index] for name, index in zip(BANDS, bucket))
+    return (f"CGPA band: {cgpa}\n"
+            f"Last semester: {hours} study h/wk per course, attendance {attendance}\n"
+            "Current courses: a typical full load")
+
+
+def bucket_key(bucket, tiers, tier_name):
+    """Cache key of a bucket's recommendation: the key the app uses for the same prompt"""
+    request = plan_request(bucket_profile(bucket), tiers, tier_name)
+    return make_key("recommendations", request["model"], request["prompt"])
+
+
+def nearest_recommendation(store, tiers, tier_name, bucket, max_distance=MAX_DISTANCE):
+    """
+    (text, bucket) for the closest warm bucket (by total band steps, the student's own
+    bucket first), looked up with one get_many; (None, None) when none is cached.
+    """
+    def distance(other):
+        return sum(abs(a - b) for a, b in zip(other, bucket))
+
+    candidates = sorted((b for b in all_buckets() if distance(b) <= max_distance), key=lambda b: (distance(b), b))
+    keys = {b: bucket_key(b, tiers, tier_name) for b in candidates}
+    found = store.get_many(list(keys.values()))
+    for candidate in candidates:
+        if keys[candidate] in found:
+            return found[keys[candidate]], candidate
+    return None, None
+
+
+def warm_students():
+    """Every bucket as a 'student' for batch_recommendations.run_job"""
+    return [{"student_id": bucket_id(b), "profile": bucket_profile(b)} for b in all_buckets()]
+
+
+class BackgroundPersonalizer:
+    """Generates exact recommendations off the request path, at most once per key at a time"""
+
+    def __init__(self, store, workers=2):
+        self.store = store
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="personalize")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key, generate, ttl=None):
+        """Store generate() under key in the background; returns the future, or None if already running"""
+        with self._lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+
+        def run():
+            try:
+                self.store.set(key, generate(), ttl)
+            except Exception:
+                pass  # the student keeps the bucket's advice; the next visit tries again
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+
+        return self._executor.submit(run)
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    from optigrade.batch_recommendations import GEMINI_URL, GeminiHTTP, run_job
+    from optigrade.cache import create_cache
+    from optigrade.prompts import load_tiers
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Pre-generate recommendations for every profile bucket")
+    parser.add_argument("--tier", default=os.getenv("OPTIGRADE_DEFAULT_TIER", "fast"))
+    parser.add_argument("--checkpoint", default=os.path.join(".cache", "bucket_warmup.checkpoint.jsonl"))
+    parser.add_argument("--fresh", action="store_true", help="regenerate every bucket (e.g. at the start of a term)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pack", type=int, default=4, help="buckets per request")
+    parser.add_argument("--base-url", default=GEMINI_URL)
+    parser.add_argument("--cache", default=os.getenv("OPTIGRADE_CACHE_BACKEND", "disk"),
+                        help="result store the app reads (disk or redis)")
+    args = parser.parse_args()
+
+    if args.fresh and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    os.makedirs(os.path.dirname(args.checkpoint) or ".", exist_ok=True)
+    tiers = load_tiers()
+    buckets = warm_students()
+    result = asyncio.run(run_job(
+        buckets, GeminiHTTP(tiers[args.tier]["model"], base_url=args.base_url), create_cache(args.cache),
+        args.checkpoint, tier_name=args.tier, tiers=tiers, concurrency=args.concurrency, pack_size=args.pack,
+        ttl=BUCKET_TTL))
+    print(f"✅ {result['done']} of {len(buckets)} buckets warmed, {result['skipped']} already done")
+    if result["failed"]:
+        print(f"⚠️ {len(result['failed'])} failed - rerun the same command to retry them")
@@ -0,0 +1,152 @@
+"""Precompiled HTML templates for the profile's course cards"""
+import html
+import string
+
+import numpy as np
+import pandas as pd
+
+from optigrade.cache import get_cache, make_key
+from optigrade.gpa import get_scale, letter_grades
+
+GRADE_COLORS = {
+    "A": "#4CAF50",  # Green
+    "B": "#8BC34A",  # Light Green
+    "C": "#FFEB3B",  # Yellow
+    "D": "#FF9800",  # Orange
+    "E": "#F44336",  # Red
+    "F": "#B71C1C"   # Dark Red
+}
+
+# Fade-in animation for the profile's card rows
+PROFILE_CSS = """
+<style>
+    @keyframes fadeIn {
+        from { opacity: 0; transform: translateY(20px); }
+        to { opacity: 1; transform: translateY(0); }
+    }
+
+    div[data-testid="stHorizontalBlock"] {
+        animation: fadeIn 0.5s ease-out;
+    }
+
+    div[data-testid="stHorizontalBlock"]:nth-child(1) { animation-delay: 0.1s; }
+    div[data-testid="stHorizontalBlock"]:nth-child(2) { animation-delay: 0.2s; }
+    div[data-testid="stHorizontalBlock"]:nth-child(3) { animation-delay: 0.3s; }
+    div[data-testid="stHorizontalBlock"]:nth-child(4) { animation-delay: 0.4s; }
+</style>
+"""
+
+
+class CardTemplate:
+    """HTML template compiled once into literal chunks and field names"""
+
+    def __init__(self, source):
+        self.parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(source)]
+
+    def render(self, frame):
+        """Render every row of the frame by concatenating whole columns, returning one string"""
+        if frame.empty:
+            return ""
+        cards = pd.Series("", index=frame.index)
+        for literal, field in self.parts:
+            if literal:
+                cards = cards + literal
+            if field is not None:
+                cards = cards + frame[field].astype(str).map(html.escape)
+        return "".join(cards)
+
+
+PREVIOUS_CARD = CardTemplate("""
+    <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;
+            border-left: 4px solid {color};">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <strong>{course_id}</strong>
+                <div style="font-size: 13px; color: #AAAAAA; margin-top: 5px;">
+                    Previous Course • {course_units} units
+                </div>
+            </div>
+            <div style="font-size: 24px; font-weight: bold; color: {color}">
+                {grade}
+            </div>
+        </div>
+        <div style="margin-top: 10px;">
+            <div style="display: flex; justify-content: space-between; font-size: 12px; color: #AAAAAA;">
+                <span>Grade</span>
+                <span>{letter}</span>
+            </div>
+            <div style="height: 6px; background: #2D3746; border-radius: 3px; margin-top: 5px;">
+                <div style="height: 100%; width: 100%; background: {color}; border-radius: 3px;"></div>
+            </div>
+        </div>
+    </div>
+""")
+
+CURRENT_CARD = CardTemplate("""
+    <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;
+            border-left: 4px solid #00FFD1;">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <strong>{course_id}</strong>
+                <div style="font-size: 13px; color: #AAAAAA; margin-top: 5px;">
+                    Current Course • {course_units} units
+                </div>
+            </div>
+        </div>
+        <div style="margin-top: 10px;">
+            <div style="display: flex; justify-content: space-between; font-size: 12px; color: #AAAAAA;">
+                <span>Progress</span>
+                <span>{progress}%</span>
+            </div>
+            <div style="height: 6px; background: #2D3746; border-radius: 3px; margin-top: 5px;">
+                <div style="height: 100%; width: {progress}%; background: #00FFD1; border-radius: 3px;"></div>
+            </div>
+        </div>
+    </div>
+""")
+
+
+# ------------------ VECTORIZED GRADE HELPERS ------------------
+def grades_to_letters(grades, scale=None):
+    """Vectorized grade_to_letter for a whole column of numeric grades"""
+    return letter_grades(grades, scale)
+
+
+def letters_to_colors(letters):
+    """Card colors for a column of letter grades (B+ and B- share B's color)"""
+    return pd.Series(letters).astype(str).str[0].map(GRADE_COLORS).fillna(GRADE_COLORS["F"]).to_numpy()
+
+
+# ------------------ CARD GRIDS ------------------
+def _records_key(records, fields):
+    """Hashable snapshot of the fields a card grid depends on"""
+    return tuple(tuple(record.get(field) for field in fields) for record in records)
+
+
+def _previous_cards(key, scale):
+    frame = pd.DataFrame(list(key), columns=['course_id', 'course_units', 'grade'])
+    frame['letter'] = grades_to_letters(frame['grade'], scale)
+    frame['color'] = letters_to_colors(frame['letter'])
+    return PREVIOUS_CARD.render(frame)
+
+
+def _current_cards(key):
+    frame = pd.DataFrame(list(key), columns=['course_id', 'course_units'])
+    # Simulated progress, stable until the course list changes (and the same on every worker)
+    rng = np.random.default_rng(int(make_key('progress', key).split(':')[1][:8], 16))
+    frame['progress'] = rng.integers(30, 81, len(frame))
+    return CURRENT_CARD.render(frame)
+
+
+def render_previous_courses(records, scale=None):
+    """One HTML string with a graded card for every previous course (cached per course list and scale)"""
+    scale = scale or get_scale()
+    key = _records_key(records, ['course_id', 'course_units', 'grade'])
+    return get_cache().get_or_set(make_key('previous_cards', key, scale['bands']),
+                                  lambda: _previous_cards(key, scale))
+
+
+def render_current_courses(records):
+    """One HTML string with a progress card for every current course (cached per course list)"""
+    key = _records_key(records, ['course_id', 'course_units'])
+    return get_cache().get_or_set(make_key('current_cards', key), lambda: _current_cards(key))
@@ -0,0 +1,241 @@
+"""Academic resource catalog with a full-text inverted index"""
+import bisect
+import csv
+import difflib
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from optigrade.rendering import CardTemplate
+
+DEFAULT_RESOURCES = [
+    {"title": "Khan Academy", "url": "https://www.khanacademy.org/", "category": "General",
+     "tags": ["math", "science", "videos", "practice"], "description": "Free lessons and exercises from arithmetic to university level."},
+    {"title": "Coursera", "url": "https://www.coursera.org/", "category": "General",
+     "tags": ["courses", "certificates", "university"], "description": "Online courses from universities and companies."},
+    {"title": "MIT OpenCourseWare", "url": "https://ocw.mit.edu/", "category": "STEM",
+     "tags": ["lectures", "engineering", "physics", "notes"], "description": "Lecture notes, exams and videos from MIT courses."},
+    {"title": "Crash Course", "url": "https://www.youtube.com/user/crashcourse", "category": "General",
+     "tags": ["videos", "history", "biology", "chemistry"], "description": "Short video introductions to many subjects."},
+    {"title": "Wolfram Alpha", "url": "https://www.wolframalpha.com/", "category": "Math",
+     "tags": ["calculus", "algebra", "solver", "statistics"], "description": "Computational engine for checking math step by step."},
+    {"title": "Duolingo", "url": "https://www.duolingo.com/", "category": "Languages",
+     "tags": ["french", "spanish", "vocabulary"], "description": "Bite-sized daily language practice."},
+    {"title": "Codecademy", "url": "https://www.codecademy.com/", "category": "Programming",
+     "tags": ["python", "javascript", "coding"], "description": "Interactive programming courses in the browser."},
+]
+
+# Relevance weight of a term found in each field
+FIELD_WEIGHTS = {"title": 3.0, "category": 2.0, "tags": 2.0, "description": 1.0}
+PREFIX_WEIGHT = 0.7
+FUZZY_WEIGHT = 0.5
+MAX_EXPANSIONS = 50  # prefix/fuzzy terms considered per query word
+
+RESOURCE_CARD = CardTemplate("""
+    <div style="border: 1px solid #2D3746; border-radius: 10px; padding: 15px; margin-bottom: 20px;">
+        <h4>{title}</h4>
+        <p style="color: #888; font-size: 14px;">Category: {category}</p>
+        <a href="{url}" target="_blank" style="color: #00FFD1; text-decoration: none;">
+            Visit Resource →
+        </a>
+    </div>
+""")
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase alphanumeric words"""
+    if isinstance(text, (list, tuple)):
+        text = " ".join(map(str, text))
+    return _TOKEN.findall(str(text or "").lower())
+
+
+class ResourceCatalog:
+    """
+    Resources shared by every session, searchable by title, category, tags and description.
+
+    Postings map each term to {resource id: field-weighted frequency}; a sorted vocabulary
+    answers prefix queries with bisect and bounds the fuzzy-match candidates. Adding a
+    resource only touches its own terms, so approved suggestions update the index
+    incrementally. Every read and write holds the lock, since sessions share one catalog.
+    User suggestions wait in `pending` until a moderator approves them.
+    """
+
+    def __init__(self, resources=None):
+        self.resources = []
+        self.postings = defaultdict(dict)
+        self.vocabulary = []
+        self.category_index = defaultdict(list)
+        self.pending = {}  # suggestion id -> normalized resource awaiting review
+        self._next_suggestion = 0
+        self._lock = threading.Lock()
+        if resources:
+            self.add_many(resources)
+
+    def __len__(self):
+        return len(self.resources)
+
+    # ------------------ INDEXING ------------------
+    @staticmethod
+    def _normalize(resource):
+        url = str(resource.get("url", "")).strip()
+        if not url.startswith(("http://", "https://")):
+            raise ValueError("Resource URL must start with http:// or https://")
+        title = str(resource.get("title", "")).strip()
+        if not title:
+            raise ValueError("Resource title cannot be empty")
+        tags = resource.get("tags") or []
+        if isinstance(tags, str):
+            tags = [t.strip() for t in tags.split(",") if t.strip()]
+        return {"title": title, "url": url,
+                "category": str(resource.get("category") or "General").strip() or "General",
+                "tags": list(tags), "description": str(resource.get("description") or "")}
+
+    def _index(self, resource):
+        resource_id = len(self.resources)
+        self.resources.append(resource)
+        self.category_index[resource["category"]].append(resource_id)
+
+        weights = Counter()
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(resource[field]):
+                weights[term] += weight
+        new_terms = []
+        for term, weight in weights.items():
+            if term not in self.postings:
+                new_terms.append(term)
+            self.postings[term][resource_id] = weight
+        return resource_id, new_terms
+
+    def add(self, resource):
+        """Index one resource (O(terms x log vocabulary)); returns its id"""
+        resource = self._normalize(resource)
+        with self._lock:
+            resource_id, new_terms = self._index(resource)
+            for term in new_terms:
+                bisect.insort(self.vocabulary, term)
+        return resource_id
+
+    def add_many(self, resources):
+        """Index many resources, sorting the vocabulary once at the end"""
+        normalized = [self._normalize(r) for r in resources]
+        with self._lock:
+            ids = [self._index(r)[0] for r in normalized]
+            self.vocabulary = sorted(self.postings)
+        return ids
+
+    # ------------------ SUGGESTIONS ------------------
+    def suggest(self, resource):
+        """Validate a user suggestion and queue it for review; returns its suggestion id"""
+        resource = self._normalize(resource)
+        with self._lock:
+            suggestion_id = self._next_suggestion
+            self._next_suggestion += 1
+            self.pending[suggestion_id] = resource
+        return suggestion_id
+
+    def approve(self, suggestion_id):
+        """Index a pending suggestion; returns its resource id (None if already reviewed)"""
+        with self._lock:
+            resource = self.pending.pop(suggestion_id, None)
+        return None if resource is None else self.add(resource)
+
+    def reject(self, suggestion_id):
+        with self._lock:
+            self.pending.pop(suggestion_id, None)
+
+    def pending_suggestions(self):
+        """(suggestion id, resource) pairs, oldest first"""
+        with self._lock:
+            return sorted(self.pending.items())
+
+    # ------------------ SEARCH ------------------
+    def _expand(self, word):
+        """Index terms matching a query word, with a weight per match type (caller holds the lock)"""
+        matches = {}
+        start = bisect.bisect_left(self.vocabulary, word)
+        for term in self.vocabulary[start:start + MAX_EXPANSIONS]:
+            if not term.startswith(word):
+                break
+            matches[term] = 1.0 if term == word else PREFIX_WEIGHT
+
+        if not matches and len(word) > 2:
+            # Typos: compare against terms sharing the first letter only
+            lo = bisect.bisect_left(self.vocabulary, word[0])
+            hi = bisect.bisect_left(self.vocabulary, chr(ord(word[0]) + 1))
+            candidates = [t for t in self.vocabulary[lo:hi] if abs(len(t) - len(word)) <= 2]
+            for term in difflib.get_close_matches(word, candidates, n=3, cutoff=0.75):
+                matches[term] = FUZZY_WEIGHT
+        return matches
+
+    def search(self, query="", category=None, limit=None):
+        """
+        Resources matching every word of the query (as a word, prefix or close spelling),
+        best first. An empty query lists the category in catalog order.
+        """
+        with self._lock:
+            return self._search(tokenize(query), category, limit)
+
+    def _search(self, words, category, limit):
+        if not words:
+            ids = self.category_index.get(category, []) if category else range(len(self.resources))
+            ids = list(ids)[:limit] if limit else list(ids)
+            return [self.resources[i] for i in ids]
+
+        n = len(self.resources)
+        scores = None
+        for word in words:
+            word_scores = defaultdict(float)
+            for term, match_weight in self._expand(word).items():
+                postings = self.postings[term]
+                idf = math.log(1 + n / len(postings))
+                for resource_id, weight in postings.items():
+                    word_scores[resource_id] = max(word_scores[resource_id], match_weight * idf * weight)
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {i: s + word_scores[i] for i, s in scores.items() if i in word_scores}
+            if not scores:
+                return []
+
+        if category:
+            scores = {i: s for i, s in scores.items() if self.resources[i]["category"] == category}
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))
+        return [self.resources[i] for i in ranked[:limit]]
+
+    def facets(self, results=None):
+        """Resource counts per category, for all resources or a result list"""
+        if results is None:
+            with self._lock:
+                return Counter({c: len(ids) for c, ids in self.category_index.items()})
+        return Counter(r["category"] for r in results)
+
+    # ------------------ LOADING / RENDERING ------------------
+    @classmethod
+    def from_file(cls, path):
+        """Load a CSV (title, url, category, tags, description) or JSON list of resources"""
+        if path.endswith(".json"):
+            with open(path) as f:
+                return cls(json.load(f))
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls(list(csv.DictReader(f)))
+
+
+def load_catalog(path=None):
+    """Default resources plus, when given, a library export file"""
+    catalog = ResourceCatalog(DEFAULT_RESOURCES)
+    if path:
+        catalog.add_many(ResourceCatalog.from_file(path).resources)
+    return catalog
+
+
+def render_resource_cards(resources):
+    """HTML for a list of resource cards in one string"""
+    if not resources:
+        return ""
+    return RESOURCE_CARD.render(pd.DataFrame(resources, columns=["title", "category", "url"]))
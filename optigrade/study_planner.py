@@ -0,0 +1,176 @@
+"""Weekly study-plan optimizer built on batched CGPA predictions"""
+import numpy as np
+import pandas as pd
+
+from optigrade.prediction import DEFAULT_FEATURES, predict_batch, repeat_features
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _hour_curves(model, base_features, courses, hour_grid, feature_names):
+    """Predict CGPA for every (course, hours) pair with one model call -> shape (courses, grid)"""
+    n_courses, n_grid = len(courses), len(hour_grid)
+    frame = repeat_features(base_features, n_courses * n_grid, feature_names)
+
+    # Per-course overrides (e.g. a different credit_load) are applied block by block
+    for c, course in enumerate(courses):
+        for feature, value in course.get('features', {}).items():
+            if feature in frame.columns:
+                frame.iloc[c * n_grid:(c + 1) * n_grid, frame.columns.get_loc(feature)] = float(value)
+
+    frame['study_hours'] = np.tile(hour_grid, n_courses)
+    return predict_batch(model, frame).reshape(n_courses, n_grid)
+
+
+def _proportional_steps(units, total_steps):
+    """Split total_steps across courses in proportion to their units (largest remainder)"""
+    share = units / units.sum() * total_steps
+    steps = np.floor(share).astype(int)
+    leftover = total_steps - steps.sum()
+    if leftover > 0:
+        steps[np.argsort(-(share - steps))[:leftover]] += 1
+    return steps
+
+
+def _daily_plan(course_ids, hours, step, days, max_daily_hours):
+    """Spread each course's weekly hours across the days, filling days evenly"""
+    day_steps = np.zeros(len(days), dtype=int)
+    cap = int(round(max_daily_hours / step))
+    plan = np.zeros((len(days), len(course_ids)))
+
+    for c, course_hours in enumerate(hours):
+        for _ in range(int(round(course_hours / step))):
+            # Next block goes to the least-loaded day that still has room
+            open_days = np.where(day_steps < cap)[0]
+            if len(open_days) == 0:
+                break
+            day = open_days[np.argmin(day_steps[open_days])]
+            day_steps[day] += 1
+            plan[day, c] += step
+
+    return pd.DataFrame(plan, index=days, columns=course_ids)
+
+
+def _shares_one_profile(courses):
+    """True when no course overrides features, so every course row would score the same"""
+    return len({tuple(sorted(c.get('features', {}).items())) for c in courses}) == 1
+
+
+def _capped_proportional_steps(units, total_steps, floor_steps, cap_steps):
+    """Floor for every course, the rest split by units without passing any course's cap"""
+    steps = np.full(len(units), floor_steps)
+    remaining = total_steps - steps.sum()
+    while remaining > 0:
+        open_courses = np.where(steps < cap_steps)[0]
+        if len(open_courses) == 0:
+            break
+        extra = np.minimum(_proportional_steps(units[open_courses], remaining), cap_steps - steps[open_courses])
+        steps[open_courses] += extra
+        remaining -= extra.sum()
+    return steps
+
+
+def optimize_study_plan(model, base_features, courses, weekly_budget, feature_names=None,
+                        step=0.5, min_course_hours=1.0, max_course_hours=None, max_daily_hours=8.0, days=None):
+    """
+    Allocate a weekly hour budget across courses to maximize predicted CGPA.
+
+    When courses carry their own model features (`course['features']`), each course is
+    scored as its own model row with `study_hours` set to the hours planned for it, and a
+    plan's predicted CGPA is the unit-weighted mean over courses. All (course, hours)
+    pairs are predicted in one batched call, then every allocation on the `step` grid is
+    searched exactly with a knapsack-style dynamic programme.
+
+    Otherwise every course row would be the same profile, and the model only sees
+    `study_hours` as hours per course on average: every weekly total on the `step` grid
+    up to the budget is scored on its mean hours in one batch, the smallest total with
+    the best prediction is split across courses by units, and the baseline is the
+    student's current hours. Every course gets at least `min_course_hours`.
+    """
+    feature_names = feature_names or DEFAULT_FEATURES
+    days = days or DAYS
+    if not courses:
+        raise ValueError("At least one course is required to build a study plan")
+
+    # Never plan more than the days can hold
+    weekly_budget = min(float(weekly_budget), max_daily_hours * len(days))
+    total_steps = int(np.floor(weekly_budget / step + 1e-9))
+    max_course_hours = weekly_budget if max_course_hours is None else min(max_course_hours, weekly_budget)
+    n_grid = int(np.floor(max_course_hours / step + 1e-9)) + 1
+    hour_grid = np.arange(n_grid) * step
+    floor_steps = int(np.ceil(min_course_hours / step - 1e-9))
+    if floor_steps * len(courses) > total_steps or floor_steps >= n_grid:
+        raise ValueError(f"A {weekly_budget:g}h week cannot give each of {len(courses)} courses "
+                         f"{min_course_hours:g}h; raise the weekly goal")
+
+    course_ids = [str(c.get('course_id') or f"Course {i + 1}") for i, c in enumerate(courses)]
+    units = np.array([float(c.get('course_units') or 1) for c in courses])
+    weights = units / units.sum()
+    target_steps = _capped_proportional_steps(units, total_steps, floor_steps, n_grid - 1)
+    rows = np.arange(len(courses))
+
+    if _shares_one_profile(courses):
+        # Every total the per-course floor and cap allow, plus the student's current hours last
+        totals = np.arange(floor_steps * len(courses), min(total_steps, (n_grid - 1) * len(courses)) + 1)
+        frame = repeat_features(base_features, len(totals) + 1, feature_names)
+        frame['study_hours'] = np.append(totals * step / len(courses), frame['study_hours'].iloc[-1])
+        scores = predict_batch(model, frame)
+        best = int(np.flatnonzero(scores[:-1] >= scores[:-1].max() - 1e-9)[0])
+        steps = _capped_proportional_steps(units, int(totals[best]), floor_steps, n_grid - 1)
+        predicted_cgpa, baseline_cgpa = float(scores[best]), float(scores[-1])
+        hours_curve = pd.DataFrame({'weekly_hours': totals * step, 'predicted_cgpa': scores[:-1]})
+        mode, rows_scored = 'mean', len(frame)
+    else:
+        curves = _hour_curves(model, base_features, courses, hour_grid, feature_names)
+
+        # Ties (flat stretches of the forest) are broken towards a unit-proportional split;
+        # hours below the per-course floor are never chosen
+        value = curves * weights[:, None] - 1e-9 * np.abs(np.arange(n_grid)[None, :] - target_steps[:, None])
+        value[:, :floor_steps] = -np.inf
+
+        # best[b] = best plan value using at most b steps over the courses seen so far
+        budget_idx = np.arange(total_steps + 1)
+        grid_idx = np.arange(n_grid)
+        prev_idx = budget_idx[:, None] - grid_idx[None, :]
+        best = np.zeros(total_steps + 1)
+        choices = []
+        for c in range(len(courses)):
+            totals = np.where(prev_idx >= 0, best[np.clip(prev_idx, 0, None)] + value[c][None, :], -np.inf)
+            choice = np.argmax(totals, axis=1)
+            best = totals[budget_idx, choice]
+            choices.append(choice)
+
+        # Walk the choices back to recover the allocation
+        steps = np.zeros(len(courses), dtype=int)
+        remaining = total_steps
+        for c in range(len(courses) - 1, -1, -1):
+            steps[c] = choices[c][remaining]
+            remaining -= steps[c]
+
+        predicted = curves[rows, steps]
+        next_steps = np.minimum(steps + 1, n_grid - 1)
+        marginal = np.where(steps + 1 < n_grid, (curves[rows, next_steps] - predicted) * weights, np.nan)
+        baseline_cgpa = float(np.dot(weights, curves[rows, target_steps]))
+        predicted_cgpa = float(np.dot(weights, predicted))
+        hours_curve = None
+        mode, rows_scored = 'per_course', len(courses) * n_grid
+
+    hours = steps * step
+    allocation = pd.DataFrame({'course_id': course_ids, 'course_units': units, 'hours': hours})
+    if mode == 'per_course':
+        # Per-course predictions only exist when each course is its own model row
+        allocation['predicted_cgpa'] = predicted
+        allocation['marginal_gain'] = marginal
+
+    return {
+        'allocation': allocation,
+        'daily_plan': _daily_plan(course_ids, hours, step, days, max_daily_hours),
+        'predicted_cgpa': predicted_cgpa,
+        'baseline_cgpa': baseline_cgpa,
+        'gain': predicted_cgpa - baseline_cgpa,
+        'baseline': 'even split' if mode == 'per_course' else 'current hours',
+        'planned_hours': float(hours.sum()),
+        'hours_curve': hours_curve,
+        'mode': mode,
+        'rows_scored': rows_scored
+    }
@@ -0,0 +1,186 @@
+"""Lookup-table surrogate: the model precomputed over the quantized input grid, served by indexing"""
+import argparse
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from optigrade.prediction import DEFAULT_FEATURES, predict_batch
+from optigrade.trajectory import ensemble_members
+from optigrade.whatif import DEFAULT_GRIDS
+
+MAX_CELLS = 1 << 24   # ~32 MB of float16; denser grids are coarsened to fit
+BUILD_CHUNK = 1 << 20  # grid rows scored per predict call while building
+LOOKUP_CHUNK = 1 << 20  # (rows x corners) gathered at once while serving
+
+
+def used_features(model, n_features):
+    """Indices of the inputs a tree ensemble ever splits on (all of them for other models)"""
+    members = ensemble_members(model)
+    if not all(hasattr(member, "tree_") for member in members):
+        return set(range(n_features))
+    used = set()
+    for member in members:
+        split = member.tree_.feature
+        used.update(split[split >= 0].tolist())
+    return used
+
+
+class Surrogate:
+    """
+    A model's predictions on a grid of knots per input, stored as one float16 array.
+
+    Queries are clamped to the grid and multilinearly interpolated between the
+    surrounding knots, so a point on the grid is a single lookup and any point costs
+    2^k lookups for the k inputs with more than one knot. Inputs a forest never splits
+    on collapse to one knot. `report` holds the error measured against the real model.
+    """
+
+    def __init__(self, knots, table, feature_names, model_version=None, report=None):
+        self.knots = [np.asarray(k, dtype=float) for k in knots]
+        self.table = np.asarray(table, dtype=np.float16)
+        self.feature_names = list(feature_names)
+        self.model_version = model_version
+        self.report = report or {}
+        self._flat = self.table.reshape(-1)
+        self._active = [d for d, k in enumerate(self.knots) if len(k) > 1]
+        strides = np.array(self.table.strides) // self.table.itemsize
+        corners = np.array(list(itertools.product([0, 1], repeat=len(self._active))), dtype=int)
+        self._offsets = corners @ strides[self._active] if self._active else np.zeros(1, dtype=int)
+        self._strides = strides[self._active]
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    # ------------------ BUILDING ------------------
+    @classmethod
+    def build(cls, model, feature_names=None, grids=None, model_version=None, max_cells=MAX_CELLS):
+        """
+        Score the model on every grid point (in chunks). Each grid defaults to the
+        what-if grid, the steps the UI collects inputs at; while the table would exceed
+        `max_cells`, the input with the most knots keeps every other knot.
+        """
+        feature_names = list(feature_names or DEFAULT_FEATURES)
+        grids = grids or DEFAULT_GRIDS
+        used = used_features(model, len(feature_names))
+        knots = [np.unique(np.asarray(grids[f], dtype=float)) if d in used else np.zeros(1)
+                 for d, f in enumerate(feature_names)]
+        while np.prod([len(k) for k in knots], dtype=float) > max_cells:
+            densest = max(range(len(knots)), key=lambda d: len(knots[d]))
+            if len(knots[densest]) <= 2:
+                raise ValueError(f"A grid of {max_cells} cells is too small for this model")
+            knots[densest] = np.unique(np.r_[knots[densest][::2], knots[densest][-1]])
+
+        shape = tuple(len(k) for k in knots)
+        table = np.empty(int(np.prod(shape)), dtype=np.float16)
+        for start in range(0, table.size, BUILD_CHUNK):
+            index = np.unravel_index(np.arange(start, min(start + BUILD_CHUNK, table.size)), shape)
+            X = np.column_stack([k[i] for k, i in zip(knots, index)])
+            table[start:start + len(X)] = predict_batch(model, pd.DataFrame(X, columns=feature_names))
+        return cls(knots, table.reshape(shape), feature_names, model_version)
+
+    def evaluate(self, model, samples=20000, data=None, seed=0):
+        """
+        Absolute error against the model on random points spanning the grid (plus the
+        rows of `data`, when given); stored as and returned in `report`.
+        """
+        rng = np.random.default_rng(seed)
+        # Collapsed inputs are still sampled over their UI range, showing they do not matter
+        bounds = [(DEFAULT_GRIDS.get(f, k).min(), DEFAULT_GRIDS.get(f, k).max()) if len(k) == 1 else (k[0], k[-1])
+                  for f, k in zip(self.feature_names, self.knots)]
+        X = pd.DataFrame(np.column_stack([rng.uniform(lo, hi, samples) for lo, hi in bounds]), columns=self.feature_names)
+        if data is not None:
+            X = pd.concat([X, data[self.feature_names].astype(float)], ignore_index=True)
+        error = np.abs(self.predict(X) - predict_batch(model, X))
+        self.report = {"samples": int(len(X)), "max_abs_error": float(error.max()),
+                       "mean_abs_error": float(error.mean()), "p99_abs_error": float(np.percentile(error, 99))}
+        return self.report
+
+    # ------------------ SERVING ------------------
+    def predict(self, X):
+        """Interpolated predictions for a DataFrame (columns by name) or an array in feature order"""
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=float).reshape(-1, len(self.feature_names))
+        out = np.empty(len(X))
+        rows = max(1, LOOKUP_CHUNK // len(self._offsets))
+        for start in range(0, len(X), rows):
+            out[start:start + rows] = self._lookup(X[start:start + rows])
+        return out
+
+    def _lookup(self, X):
+        if not self._active:
+            return np.full(len(X), float(self._flat[0]))
+        lower = np.empty((len(X), len(self._active)), dtype=int)
+        frac = np.empty((len(X), len(self._active)))
+        for j, d in enumerate(self._active):
+            k = self.knots[d]
+            i = np.clip(np.searchsorted(k, X[:, d], side="right") - 1, 0, len(k) - 2)
+            lower[:, j] = i
+            frac[:, j] = np.clip((X[:, d] - k[i]) / (k[i + 1] - k[i]), 0.0, 1.0)
+        # Corner weights built one input at a time (corners in itertools.product order), then one gather
+        weights = np.ones((len(X), 1))
+        for j in range(len(self._active)):
+            f = frac[:, j, None]
+            weights = np.stack([weights * (1.0 - f), weights * f], axis=2).reshape(len(X), -1)
+        values = self._flat[(lower @ self._strides)[:, None] + self._offsets[None, :]]
+        return (weights * values).sum(axis=1)
+
+    # ------------------ STORAGE ------------------
+    def save(self, path):
+        arrays = {f"knots_{d}": k for d, k in enumerate(self.knots)}
+        np.savez_compressed(path, table=self.table, feature_names=np.array(self.feature_names),
+                            model_version=np.array(self.model_version or ""), report=np.array(json.dumps(self.report)),
+                            **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            n = len(data["feature_names"])
+            return cls([data[f"knots_{d}"] for d in range(n)], data["table"], data["feature_names"].tolist(),
+                       str(data["model_version"]) or None, json.loads(str(data["report"])))
+
+
+def surrogate_path(model_path):
+    """Where a model's surrogate lives: surrogate.npz next to the model file"""
+    return os.path.join(os.path.dirname(model_path), "surrogate.npz")
+
+
+if __name__ == "__main__":
+    import joblib
+
+    from optigrade.prediction import model_fingerprint
+
+    parser = argparse.ArgumentParser(description="Build a model's lookup-table surrogate, or bulk-score with one")
+    parser.add_argument("command", choices=["build", "score"])
+    parser.add_argument("--model", default="models/model.pkl")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS)
+    parser.add_argument("--data", help="build: extra rows to measure error on; score: rows to score")
+    parser.add_argument("--out", help="score: write the predictions to this CSV")
+    args = parser.parse_args()
+
+    path = surrogate_path(args.model)
+    if args.command == "build":
+        saved = joblib.load(args.model)
+        surrogate = Surrogate.build(saved["model"], saved.get("feature_names"), model_version=model_fingerprint(args.model),
+                                    max_cells=args.max_cells)
+        report = surrogate.evaluate(saved["model"], data=pd.read_csv(args.data) if args.data else None)
+        surrogate.save(path)
+        print(f"✅ {path}: {surrogate.table.size:,} cells ({surrogate.nbytes / 2**20:.1f} MB), "
+              f"knots per input {dict(zip(surrogate.feature_names, surrogate.table.shape))}")
+        print(f"   Error vs model over {report['samples']:,} points: max {report['max_abs_error']:.3f}, "
+              f"p99 {report['p99_abs_error']:.3f}, mean {report['mean_abs_error']:.4f}")
+    else:
+        surrogate = Surrogate.load(path)
+        if surrogate.model_version != model_fingerprint(args.model):
+            print(f"⚠️ {path} was built for a different model version - rebuild it")
+        rows = pd.read_csv(args.data)
+        rows["predicted_cgpa"] = surrogate.predict(rows.reindex(columns=surrogate.feature_names, fill_value=0.0))
+        if args.out:
+            rows.to_csv(args.out, index=False)
+            print(f"✅ {len(rows):,} rows scored to {args.out}")
+        else:
+            print(rows.to_string())
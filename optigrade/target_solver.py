@@ -0,0 +1,124 @@
+"""Inverse solver: smallest change in study habits that reaches a target CGPA"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from optigrade.cache import get_cache, make_key
+from optigrade.prediction import DEFAULT_FEATURES, feature_vector, predict_batch
+
+# Inputs a student can act on, with the range the UI allows for each
+CONTROLLABLE = {
+    'study_hours': (1.0, 50.0),
+    'attendance': (0.0, 100.0),
+    'engagement': (0.0, 100.0)
+}
+
+
+def _predict_points(model, points, feature_names):
+    """Score an (..., n_features) array of points with one predict call"""
+    flat = points.reshape(-1, points.shape[-1])
+    return predict_batch(model, pd.DataFrame(flat, columns=feature_names)).reshape(points.shape[:-1])
+
+
+def solve_target(model, X, target, feature_names=None, controllable=None, weights=None,
+                 grid_size=21, refine_steps=8):
+    """
+    Find, for every student row of X, the least effort needed to reach `target` CGPA.
+
+    Each non-empty subset of the controllable inputs is a search direction that raises
+    those inputs together towards their upper bounds. All (student, direction, step)
+    points are scored in one batched predict; because forests are not monotone, the
+    first grid step that reaches the target is taken as the bracket and refined by
+    bisection, again batched across every student still being refined. Effort is the
+    weighted sum of changes, each scaled by the input's range. Paths start from the
+    student's actual values; an input already above its upper bound is left as it is.
+    """
+    feature_names = list(feature_names or DEFAULT_FEATURES)
+    controllable = controllable or CONTROLLABLE
+    levers = [f for f in controllable if f in feature_names]
+    if not levers:
+        raise ValueError("None of the controllable inputs are model features")
+
+    X = np.asarray(X, dtype=float).reshape(-1, len(feature_names))
+    n = len(X)
+    target = np.broadcast_to(np.asarray(target, dtype=float), (n,))
+    lever_idx = np.array([feature_names.index(f) for f in levers])
+    lower = np.array([controllable[f][0] for f in levers])
+    upper = np.array([controllable[f][1] for f in levers])
+    weights = np.ones(len(levers)) if weights is None else np.array([weights.get(f, 1.0) for f in levers])
+
+    # Directions: every non-empty subset of levers, as 0/1 masks
+    masks = np.array([m for m in itertools.product([0.0, 1.0], repeat=len(levers)) if any(m)])
+    current = X[:, lever_idx]
+    delta = np.maximum(upper - current, 0)[:, None, :] * masks[None, :, :]  # (n, directions, levers)
+    unit_effort = (delta * weights / (upper - lower)).sum(axis=2)    # effort of a full step
+
+    # Coarse grid over the step size t in [0, 1]
+    steps = np.linspace(0.0, 1.0, grid_size)
+    points = np.broadcast_to(X[:, None, None, :], (n, len(masks), grid_size, X.shape[1])).copy()
+    points[..., lever_idx] = current[:, None, None, :] + steps[None, None, :, None] * delta[:, :, None, :]
+    preds = _predict_points(model, points, feature_names)
+    reached = preds >= target[:, None, None]
+
+    reachable = reached.any(axis=2)
+    first = np.argmax(reached, axis=2)
+    hi = steps[first]
+    lo = steps[np.maximum(first - 1, 0)]
+    hi_pred = np.take_along_axis(preds, first[..., None], axis=2)[..., 0]
+
+    # Bisect between the last step below the target and the first step above it
+    active = reachable & (first > 0)
+    for _ in range(refine_steps):
+        if not active.any():
+            break
+        rows, dirs = np.nonzero(active)
+        mid = (lo[rows, dirs] + hi[rows, dirs]) / 2
+        mid_points = X[rows].copy()
+        mid_points[:, lever_idx] = current[rows] + mid[:, None] * delta[rows, dirs]
+        mid_pred = _predict_points(model, mid_points, feature_names)
+        ok = mid_pred >= target[rows]
+        hi[rows[ok], dirs[ok]] = mid[ok]
+        hi_pred[rows[ok], dirs[ok]] = mid_pred[ok]
+        lo[rows[~ok], dirs[~ok]] = mid[~ok]
+
+    # Cheapest reachable direction per student
+    effort = np.where(reachable, hi * unit_effort, np.inf)
+    best = np.argmin(effort, axis=1)
+    rows = np.arange(n)
+    best_step = hi[rows, best]
+    required = current + best_step[:, None] * delta[rows, best]
+    is_reachable = reachable[rows, best]
+
+    result = pd.DataFrame({
+        'target_cgpa': target,
+        'current_prediction': preds[:, 0, 0],
+        'reachable': is_reachable,
+        'predicted_cgpa': np.where(is_reachable, hi_pred[rows, best], np.nan),
+        'effort': np.where(is_reachable, effort[rows, best], np.nan)
+    })
+    for j, feature in enumerate(levers):
+        result[f'{feature}_current'] = current[:, j]
+        result[f'{feature}_required'] = np.where(is_reachable, required[:, j], np.nan)
+        result[f'{feature}_change'] = np.where(is_reachable, required[:, j] - current[:, j], np.nan)
+    return result
+
+
+def solve_target_for_profile(model, features, target, feature_names=None, **kwargs):
+    """Single-student wrapper around solve_target() taking a mapped feature dict"""
+    feature_names = feature_names or DEFAULT_FEATURES
+    X = feature_vector(features, feature_names)[None, :]
+    return solve_target(model, X, target, feature_names, **kwargs).iloc[0].to_dict()
+
+
+def cached_solve_target(model, model_version, features, target, feature_names=None):
+    """One student's path to the target through the shared cache, keyed by model version and inputs"""
+    feature_names = list(feature_names or DEFAULT_FEATURES)
+    vector = feature_vector(features, feature_names)
+    key = make_key("target_path", model_version, tuple(feature_names), np.round(vector, 6).tolist(), float(target))
+
+    def compute():
+        result = solve_target(model, vector[None, :], target, feature_names).iloc[0]
+        return {k: v.item() if hasattr(v, 'item') else v for k, v in result.items()}
+
+    return get_cache().get_or_set(key, compute)
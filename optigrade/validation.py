@@ -0,0 +1,233 @@
+"""Schema-driven, vectorized validation for student datasets, uploads and form input"""
+import argparse
+import re
+
+import numpy as np
+import pandas as pd
+
+# Column specs: type (float | int | str), required, min/max, choices, pattern.
+# Schema options: unique (key columns; optional ones only when present), consistent
+# (column -> group columns it must be constant within) and aliases (alternative column
+# names mapped onto the schema's).
+LEARNING_STYLES = ["Visual", "Auditory", "Kinesthetic"]
+
+STUDENT_RECORDS = {
+    "columns": {
+        "user_id": {"type": "str", "required": True},
+        "semester": {"type": "str", "required": True, "choices": ["previous", "current"]},
+        "course_id": {"type": "str", "required": True, "pattern": r"[A-Z]{2,4}\d{3}"},
+        "grade": {"type": "float", "min": 0, "max": 100},
+        "study_hours": {"type": "float", "min": 0, "max": 168},
+        "course_units": {"type": "int", "required": True, "min": 1, "max": 4},
+        "semester_gpa": {"type": "float", "min": 0, "max": 5},
+        "current_cgpa": {"type": "float", "min": 0, "max": 5},
+        "learning_style": {"type": "str", "choices": LEARNING_STYLES},
+        "course_difficulty": {"type": "int", "min": 1, "max": 5},
+        "attendance": {"type": "float", "min": 0, "max": 100}
+    },
+    "unique": ["user_id", "semester", "course_id"],
+    "consistent": {"semester_gpa": ["user_id", "semester"], "current_cgpa": ["user_id"]}
+}
+
+TRAINING_DATA = {
+    "columns": {
+        "credit_load": {"type": "float", "required": True, "min": 0, "max": 100},
+        "study_hours": {"type": "float", "required": True, "min": 0, "max": 168},
+        "GPA_last_semester": {"type": "float", "required": True, "min": 0, "max": 5},
+        "current_CGPA": {"type": "float", "required": True, "min": 0, "max": 5},
+        "target_CGPA": {"type": "float", "required": True, "min": 0, "max": 5},
+        "attendance": {"type": "float", "min": 0, "max": 100},
+        "engagement": {"type": "float", "min": 0, "max": 100},
+        "midterm_score": {"type": "float", "min": 0, "max": 100}
+    },
+    "aliases": {"Attendance": "attendance", "Lecture_Engagement": "engagement", "Midterm_Score": "midterm_score"}
+}
+
+TRANSCRIPT = {
+    "columns": {
+        "Course": {"type": "str", "required": True},
+        "Grade": {"type": "float", "required": True, "min": 0, "max": 100},
+        "Units": {"type": "int", "required": True, "min": 1, "max": 4},
+        "Semester": {"type": "str"}
+    },
+    "unique": ["Course", "Semester"]  # a course retaken in a later semester is a new row
+}
+
+COURSE_CATALOG = {
+    "columns": {
+        "code": {"type": "str", "required": True, "pattern": r"[A-Z]{2,4}\d{3}"},
+        "title": {"type": "str", "required": True},
+        "units": {"type": "int", "required": True, "min": 1, "max": 6},
+        "difficulty": {"type": "float", "min": 1, "max": 5},
+        "prerequisites": {"type": "str", "pattern": r"[A-Z]{2,4}\d{3}(;[A-Z]{2,4}\d{3})*"}
+    },
+    "unique": ["code"]
+}
+
+PREVIOUS_COURSES_FORM = {
+    "columns": {
+        "course_id": {"type": "str", "required": True},
+        "grade": {"type": "float", "required": True, "min": 0, "max": 100},
+        "study_hours": {"type": "float", "required": True, "min": 0, "max": 168},
+        "attendance": {"type": "float", "required": True, "min": 0, "max": 100},
+        "course_units": {"type": "int", "required": True, "min": 1, "max": 4},
+        "semester_gpa": {"type": "float", "required": True, "min": 0, "max": 5}
+    },
+    "unique": ["course_id"]
+}
+
+SCHEMAS = {"student_records": STUDENT_RECORDS, "training_data": TRAINING_DATA, "transcript": TRANSCRIPT,
+           "course_catalog": COURSE_CATALOG}
+
+# Spreadsheet filler columns ("Column 12", "Unnamed: 3") are dropped when empty
+_FILLER = re.compile(r"^(Column \d+|Unnamed: \d+)$")
+
+
+class ValidationReport:
+    """Typed data plus a row-level error table (row, column, value, rule, message)"""
+
+    def __init__(self, data, errors, warnings):
+        self.data = data
+        self.errors = errors
+        self.warnings = warnings
+
+    @property
+    def ok(self):
+        return self.errors.empty
+
+    @property
+    def invalid_rows(self):
+        return np.unique(self.errors["row"].dropna().to_numpy())
+
+    def valid_rows(self):
+        """The typed data without any row that has an error"""
+        if self.errors["row"].isna().any():  # a file-level error (e.g. missing column)
+            return self.data.iloc[0:0]
+        return self.data.drop(index=self.invalid_rows)
+
+    def summary(self):
+        """Error counts per column and rule"""
+        if self.ok:
+            return pd.DataFrame(columns=["column", "rule", "count"])
+        return (self.errors.groupby(["column", "rule"], dropna=False).size()
+                .rename("count").reset_index().sort_values("count", ascending=False))
+
+
+def _stripped(column):
+    """Column as stripped text (nulls kept), converting each distinct value only once"""
+    codes, uniques = pd.factorize(column)
+    text = np.array([str(u).strip() for u in uniques] + [None], dtype=object)[codes]
+    return pd.Series(text, index=column.index)
+
+
+def _add(errors, frame, mask, column, rule, message, values=None):
+    """Record an error for every row where mask is True (no per-row Python work)"""
+    rows = frame.index[mask]
+    if len(rows):
+        shown = (values if values is not None else frame[column])[mask]
+        errors.append(pd.DataFrame({"row": rows, "column": column, "value": shown.astype(str).to_numpy(),
+                                    "rule": rule, "message": message}))
+
+
+def validate(frame, schema):
+    """
+    Check a DataFrame against a schema with whole-column operations.
+
+    Text columns are stripped, numeric columns coerced (values that do not parse are
+    type errors), and every range, choice, pattern, duplicate-key and consistency
+    violation becomes one row in the report's error table.
+    """
+    specs = schema["columns"]
+    frame = frame.rename(columns=schema.get("aliases", {}))
+    errors, warnings = [], []
+
+    filler = [c for c in frame.columns if _FILLER.match(str(c)) and frame[c].isna().all()]
+    frame = frame.drop(columns=filler)
+    unknown = [c for c in frame.columns if c not in specs]
+    if unknown:
+        warnings.append(f"Ignored unknown columns: {', '.join(map(str, unknown))}")
+
+    data = pd.DataFrame(index=frame.index)
+    for column, spec in specs.items():
+        if column not in frame:
+            if spec.get("required"):
+                errors.append(pd.DataFrame({"row": [np.nan], "column": [column], "value": [""],
+                                            "rule": ["missing_column"],
+                                            "message": [f"Required column '{column}' is missing"]}))
+            continue
+
+        raw = frame[column]
+        numeric = spec["type"] in ("float", "int")
+        if numeric and raw.dtype.kind in "iuf":
+            text = None
+            missing = raw.isna().to_numpy()
+        else:
+            text = _stripped(raw)
+            missing = text.isna().to_numpy() | (text == "").fillna(True).to_numpy(dtype=bool)
+        if spec.get("required"):
+            _add(errors, frame, missing, column, "required", f"{column} is required")
+
+        if numeric:
+            values = raw.astype(float) if text is None else pd.to_numeric(text, errors="coerce")
+            bad_type = ~missing & values.isna().to_numpy()
+            if spec["type"] == "int":
+                bad_type |= ~missing & ~values.isna().to_numpy() & (values.to_numpy() % 1 != 0)
+            _add(errors, frame, bad_type, column, "type", f"{column} must be {'a whole number' if spec['type'] == 'int' else 'a number'}", raw)
+            checkable = ~missing & ~bad_type
+            if "min" in spec or "max" in spec:
+                low, high = spec.get("min", -np.inf), spec.get("max", np.inf)
+                out = checkable & ((values.to_numpy() < low) | (values.to_numpy() > high))
+                _add(errors, frame, out, column, "range", f"{column} must be between {low:g} and {high:g}", raw)
+            data[column] = values.astype("Int64") if spec["type"] == "int" and not (bad_type | missing).any() else values
+        else:
+            # Choices and patterns are checked once per distinct value, then broadcast
+            codes, uniques = pd.factorize(text)
+            values = text
+            if "choices" in spec:
+                canonical = {c.lower(): c for c in spec["choices"]}
+                mapped = np.array([canonical.get(str(u).lower()) for u in uniques] + [None], dtype=object)[codes]
+                bad = ~missing & pd.isna(mapped)
+                _add(errors, frame, bad, column, "choice", f"{column} must be one of {', '.join(spec['choices'])}", raw)
+                values = pd.Series(np.where(pd.isna(mapped), text.to_numpy(dtype=object), mapped), index=text.index)
+            if "pattern" in spec:
+                pattern = re.compile(spec["pattern"])
+                matches = np.array([bool(pattern.fullmatch(str(u))) for u in uniques] + [False])[codes]
+                bad = ~missing & ~matches
+                _add(errors, frame, bad, column, "pattern", f"{column} has an unexpected format", raw)
+            data[column] = values
+
+    # Optional key columns (e.g. a transcript's Semester) only narrow the key when present
+    keys = [c for c in schema.get("unique", []) if c in data]
+    absent = [c for c in schema.get("unique", []) if c not in data]
+    if keys and not any(schema["columns"].get(c, {}).get("required") for c in absent):
+        duplicated = data.duplicated(subset=keys, keep="first").to_numpy()
+        _add(errors, data, duplicated, keys[-1], "duplicate", f"Duplicate {'/'.join(keys)}")
+
+    for column, group in schema.get("consistent", {}).items():
+        if column in data and all(g in data for g in group):
+            varies = data.groupby(group, dropna=False)[column].transform("nunique").to_numpy() > 1
+            _add(errors, data, varies, column, "consistency", f"{column} differs within the same {'/'.join(group)}")
+
+    errors = (pd.concat(errors, ignore_index=True) if errors else
+              pd.DataFrame(columns=["row", "column", "value", "rule", "message"]))
+    return ValidationReport(data, errors, warnings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate a dataset against an OptiGrade schema")
+    parser.add_argument("path")
+    parser.add_argument("--schema", choices=sorted(SCHEMAS), default="student_records")
+    parser.add_argument("--report", help="write the row-level error table to this CSV")
+    args = parser.parse_args()
+
+    result = validate(pd.read_csv(args.path), SCHEMAS[args.schema])
+    for warning in result.warnings:
+        print(f"⚠️ {warning}")
+    if result.ok:
+        print(f"✅ {len(result.data)} rows valid")
+    else:
+        print(f"❌ {len(result.errors)} errors in {len(result.invalid_rows)} of {len(result.data)} rows")
+        print(result.summary().to_string(index=False))
+        if args.report:
+            result.errors.to_csv(args.report, index=False)
+    raise SystemExit(0 if result.ok else 1)
@@ -0,0 +1,81 @@
+"""What-if sensitivity curves: how the predicted CGPA moves as each input changes"""
+import numpy as np
+import pandas as pd
+
+from optigrade.cache import get_cache, make_key
+from optigrade.prediction import DEFAULT_FEATURES, feature_vector, predict_batch
+
+# Grid for each model input, matching the steps the UI collects them at
+DEFAULT_GRIDS = {
+    'GPA_last_semester': np.arange(0.0, 5.01, 0.25),
+    'credit_load': np.arange(0.0, 100.1, 5.0),
+    'current_CGPA': np.arange(0.0, 5.01, 0.25),
+    'study_hours': np.arange(1.0, 51.0, 1.0),
+    'attendance': np.arange(0.0, 100.1, 10.0),
+    'engagement': np.arange(0.0, 100.1, 10.0),
+    'midterm_score': np.arange(0.0, 100.1, 10.0)
+}
+
+
+def partial_dependence(model, base_features, feature_names=None, grids=None):
+    """
+    Sweep every input over its grid while holding the rest of the profile fixed.
+
+    All grid points for all features (plus the unchanged profile) are stacked into
+    one matrix and scored with a single predict call. Returns the profile's own
+    prediction and a long-form DataFrame(feature, value, predicted_cgpa) of curves.
+    """
+    feature_names = feature_names or DEFAULT_FEATURES
+    grids = grids or DEFAULT_GRIDS
+    base = feature_vector(base_features, feature_names)
+
+    swept = [f for f in feature_names if f in grids]
+    sizes = [len(grids[f]) for f in swept]
+    X = np.tile(base, (sum(sizes) + 1, 1))
+
+    start = 0
+    for feature, size in zip(swept, sizes):
+        X[start:start + size, feature_names.index(feature)] = grids[feature]
+        start += size
+
+    preds = predict_batch(model, pd.DataFrame(X, columns=feature_names))
+
+    curves = pd.DataFrame({
+        'feature': np.repeat(swept, sizes),
+        'value': np.concatenate([grids[f] for f in swept]),
+        'predicted_cgpa': preds[:-1]
+    })
+    return float(preds[-1]), curves
+
+
+def curves_chart_spec(columns=2):
+    """Vega-Lite spec drawing every curve as one faceted chart (one element instead of one per feature)"""
+    return {
+        'facet': {'field': 'feature', 'type': 'nominal', 'title': None},
+        'columns': columns,
+        'spec': {
+            'mark': {'type': 'line', 'point': True, 'color': '#00FFD1'},
+            'width': 260,
+            'height': 140,
+            'encoding': {
+                'x': {'field': 'value', 'type': 'quantitative', 'title': None},
+                'y': {'field': 'predicted_cgpa', 'type': 'quantitative', 'title': 'CGPA',
+                      'scale': {'zero': False}}
+            }
+        },
+        'resolve': {'scale': {'x': 'independent'}}
+    }
+
+
+def cached_partial_dependence(model, model_version, base_features, feature_names=None, grids=None):
+    """partial_dependence() through the shared cache, keyed by model version and profile"""
+    feature_names = feature_names or DEFAULT_FEATURES
+    key = make_key(
+        'whatif',
+        model_version,
+        tuple(feature_names),
+        np.round(feature_vector(base_features, feature_names), 6).tolist(),
+        None if grids is None else [(f, np.asarray(g, dtype=float).tolist()) for f, g in sorted(grids.items())]
+    )
+    return get_cache().get_or_set(
+        key, lambda: partial_dependence(model, base_features, feature_names, grids))
@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
-import joblib
 import numpy as np
 import os
 import time
+import json
+import io
+import uuid
 from dotenv import load_dotenv
 import streamlit.components.v1 as components
 from streamlit_extras.colored_header import colored_header
@@ -11,13 +13,41 @@ import matplotlib.pyplot as plt
 import google.generativeai as genai
 from sklearn.ensemble import RandomForestRegressor
 import traceback
-import random
+from optigrade.assets import asset_file, ensure_assets, picture_html
+from optigrade.audit import AuditLog
+from optigrade.batch_recommendations import student_key
+from optigrade.cache import get_cache, make_key
+from optigrade.catalog import load_course_catalog, normalize_code, render_course_cards
+from optigrade.course_load import UNIT_CAPS, optimize_load
+from optigrade.drift import DriftMonitor, load_baseline
+from optigrade.explain import cached_explain
+from optigrade.feedback import cohort_feedback, generate_feedback, resource_markdown
+from optigrade.focus_timer import apply_timer_event, focus_timer, timer_remaining
+from optigrade.goals import GoalStore
+from optigrade.gpa import DEFAULT_SCALE, SCALES, get_scale, gpa, grade_points, letter_grades
+from optigrade.llm_client import LLMUnavailable, ResilientClient
+from optigrade.model_pool import DEFAULT_TENANT, ModelPool, UnknownTenant
+from optigrade.prediction import feature_vector
+from optigrade.prompts import compact_profile, load_tiers, plan_request, select_tier
+from optigrade.recommendation_buckets import BackgroundPersonalizer, bucket_for, nearest_recommendation
+from optigrade.rendering import (PROFILE_CSS, grades_to_letters, letters_to_colors,
+                                  render_current_courses, render_previous_courses)
+from optigrade.resources import load_catalog, render_resource_cards
+from optigrade.study_planner import optimize_study_plan
+from optigrade.surrogate import Surrogate
+from optigrade.target_solver import cached_solve_target
+from optigrade.trajectory import cached_trajectory
+from optigrade.validation import PREVIOUS_COURSES_FORM, TRANSCRIPT, validate
+from optigrade.whatif import cached_partial_dependence, curves_chart_spec
 
 
 # -----Logo -------------
+# Resized image variants (built by `python -m optigrade.assets`, or on first start)
+asset_manifest = ensure_assets()
+
 st.set_page_config(
     page_title="OptiGrade",
-    page_icon="https://raw.githubusercontent.com/CryptoLab-service/OptiGrade-ML-model/main/assets/Optigrade.png",
+    page_icon=asset_file(asset_manifest, "Optigrade.png", 64),
     layout="wide",
     initial_sidebar_state="expanded"
 )
@@ -28,53 +58,88 @@ load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
 # ------------------ SETTING UP GOOGLE AI (GEMINI CONFIGURATION) ------------------
-# Configure Gemini API
+# Configure Gemini API (one model per latency tier, see optigrade/prompts.py)
+GEMINI_TIERS = load_tiers()
+RECOMMENDATION_TTL = 24 * 3600  # seconds a cached recommendation is reused
+# Serve warm bucket advice at once and generate the exact answer in the background
+BACKGROUND_PERSONALIZE = os.getenv("OPTIGRADE_BACKGROUND_PERSONALIZE", "1") != "0"
+
 if api_key:
     try:
         genai.configure(api_key=api_key)
-        gemini_model = genai.GenerativeModel("gemini-2.5-pro")
+        gemini_models = {name: genai.GenerativeModel(tier["model"]) for name, tier in GEMINI_TIERS.items()}
     except Exception as e:
         st.error(f"Error configuring Gemini API: {str(e)}")
-        gemini_model = None
+        gemini_models = {}
 else:
     st.error("GEMINI_API_KEY not found in environment variables")
-    gemini_model = None
+    gemini_models = {}
+
+@st.cache_resource
+def get_llm_client():
+    """Rate limiter, concurrency bound and circuit breaker shared by every session"""
+    return ResilientClient.from_env()
+
+@st.cache_resource
+def get_personalizer():
+    """Background generator of exact recommendations, shared by every session"""
+    return BackgroundPersonalizer(get_cache())
 
 # -------- AI Academic Recommendation ------------- 
-def get_academic_recommendations(student_data):
-    """Generate AI-powered personalized academic recommendations using Gemini"""
-    if not gemini_model:
-        return "❌ Gemini API not configured properly"
-    
-    prompt = f"""
-    Here's the student's academic profile:
-
-    {student_data}
-
-    Generate specific, actionable academic recommendations to help this student improve their CGPA and academic performance. 
-    Focus on:
-    - Study habits optimization
-    - Attendance improvement strategies
-    - Learning style adaptation
-    - Course difficulty management
-    - Time allocation suggestions
-    - Resource recommendations (books, online resources)
-    
-    Structure your response with clear headings and bullet points. Be practical and encouraging.
+def get_academic_recommendations(student_data, escalate=False, fallback=None, bucket=None, student_id=None):
+    """
+    Generate AI-powered personalized academic recommendations using Gemini (fast tier unless escalated).
+    A recommendation precomputed overnight for this student id (optigrade/batch_recommendations.py)
+    is served next. When neither is cached yet, the nearest pre-warmed profile bucket (see
+    optigrade/recommendation_buckets.py) is served at once while the personalized answer
+    is generated in the background. When the API is unhealthy or overloaded, returns
+    fallback() instead of waiting.
     """
     try:
-        response = gemini_model.generate_content(
-            prompt,
-            generation_config=genai.types.GenerationConfig(
-                temperature=0.7,
-                top_p=0.85,
-                top_k=40,
-                candidate_count=1
-            )
+        request = plan_request(student_data, GEMINI_TIERS, select_tier(GEMINI_TIERS, escalate))
+    except ValueError as e:
+        return f"❌ Could not generate recommendations: {str(e)}"
+
+    # Identical profiles get the same advice from whichever worker generated it first
+    cache_key = make_key('recommendations', request['model'], request['prompt'])
+    cached = get_cache().get(cache_key)
+    if cached is None and student_id is not None:
+        cached = get_cache().get(student_key(request['model'], student_id))
+    if cached is not None:
+        return cached
+
+    warm = None
+    if bucket is not None:
+        warm, _ = nearest_recommendation(get_cache(), GEMINI_TIERS, request['tier'], bucket)
+    similar_note = "💡 *Advice for students with a profile like yours"
+
+    if not gemini_models:
+        if warm is not None:
+            return f"{similar_note}.*\n\n{warm}"
+        return fallback() if fallback else "❌ Gemini API not configured properly"
+
+    client = get_llm_client()
+
+    def generate():
+        response = gemini_models[request['tier']].generate_content(
+            request['prompt'],
+            generation_config=genai.types.GenerationConfig(**request['generation_config']),
+            request_options={"timeout": client.timeout}
         )
         return response.text
-    except Exception as e:
-        return f"❌ Could not generate recommendations: {str(e)}"
+
+    if warm is not None:
+        if not BACKGROUND_PERSONALIZE:
+            return f"{similar_note}.*\n\n{warm}"
+        get_personalizer().submit(cache_key, lambda: client.call(generate), ttl=RECOMMENDATION_TTL)
+        return f"{similar_note} - your personalized version will be ready next time you open your results.*\n\n{warm}"
+
+    try:
+        text = client.call(generate)
+    except LLMUnavailable as e:
+        return fallback() if fallback else f"❌ Could not generate recommendations: {str(e)}"
+    get_cache().set(cache_key, text, ttl=RECOMMENDATION_TTL)
+    return text
 
 # ------------------ SESSION STATE INITIALIZATION ------------------
 if "onboarded" not in st.session_state:
@@ -93,6 +158,14 @@ if 'user_pic' not in st.session_state:
     st.session_state.user_pic = "👨‍🎓"
 if 'current_cgpa' not in st.session_state:
     st.session_state.current_cgpa = 3.4
+if 'audit_session' not in st.session_state:
+    st.session_state.audit_session = uuid.uuid4().hex[:12]  # groups a session's audited predictions
+if 'grading_scale' not in st.session_state:
+    st.session_state.grading_scale = os.getenv("OPTIGRADE_GRADING_SCALE", DEFAULT_SCALE)
+    if st.session_state.grading_scale not in SCALES:
+        st.warning(f"Unknown OPTIGRADE_GRADING_SCALE '{st.session_state.grading_scale}' "
+                   f"(expected one of {', '.join(SCALES)}) - using the {DEFAULT_SCALE} scale")
+        st.session_state.grading_scale = DEFAULT_SCALE
 if 'study_timer_active' not in st.session_state:
     st.session_state.study_timer_active = False
 if 'study_timer_start' not in st.session_state:
@@ -103,52 +176,43 @@ if 'study_timer_remaining' not in st.session_state:
     st.session_state.study_timer_remaining = 1500
 if 'pomodoro_count' not in st.session_state:
     st.session_state.pomodoro_count = 0
+if 'focus_sessions' not in st.session_state:
+    st.session_state.focus_sessions = []
+if 'focus_timer_nonce' not in st.session_state:
+    st.session_state.focus_timer_nonce = None
 if 'study_goals' not in st.session_state:
-    st.session_state.study_goals = []
-if 'resources' not in st.session_state:
-    st.session_state.resources = [
-        {"title": "Khan Academy", "url": "https://www.khanacademy.org/", "category": "General"},
-        {"title": "Coursera", "url": "https://www.coursera.org/", "category": "General"},
-        {"title": "MIT OpenCourseWare", "url": "https://ocw.mit.edu/", "category": "STEM"},
-        {"title": "Crash Course", "url": "https://www.youtube.com/user/crashcourse", "category": "General"},
-        {"title": "Wolfram Alpha", "url": "https://www.wolframalpha.com/", "category": "Math"},
-        {"title": "Duolingo", "url": "https://www.duolingo.com/", "category": "Languages"},
-        {"title": "Codecademy", "url": "https://www.codecademy.com/", "category": "Programming"},
-    ]
-
+    st.session_state.study_goals = GoalStore()
+elif isinstance(st.session_state.study_goals, list):
+    # Sessions started before goals were indexed
+    st.session_state.study_goals = GoalStore(st.session_state.study_goals)
 # ------------------ HELPER FUNCTIONS ------------------
+TARGET_CGPA = 3.8  # CGPA target shown on the profile
+
+def active_scale():
+    """The grading scale chosen in Settings (institution default from OPTIGRADE_GRADING_SCALE)"""
+    return get_scale(st.session_state.grading_scale)
+
 def grade_to_letter(grade):
     """Convert numerical grade to letter grade"""
-    if grade >= 70: return "A"
-    elif grade >= 60: return "B"
-    elif grade >= 50: return "C"
-    elif grade >= 45: return "D"
-    elif grade >= 40: return "E"
-    else: return "F"
-
-def grade_to_color(grade):
-    """Get color based on letter grade"""
-    if grade == "A": return "#4CAF50"  # Green
-    elif grade == "B": return "#8BC34A"  # Light Green
-    elif grade == "C": return "#FFEB3B"  # Yellow
-    elif grade == "D": return "#FF9800"  # Orange
-    elif grade == "E": return "#F44336"  # Red
-    else: return "#B71C1C"  # Dark Red (F)
-
-def create_dotted_forecast_chart(previous_cgpa, predicted_cgpa):
-    """Create sleek dotted-line CGPA forecast chart"""
+    return str(letter_grades([grade], active_scale())[0])
+
+def create_dotted_forecast_chart(trajectory):
+    """Create sleek dotted-line CGPA trajectory chart with the forecast's confidence band"""
     fig, ax = plt.subplots(figsize=(8, 4))
     
-    x = ['Previous CGPA', 'Predicted CGPA']
-    y = [previous_cgpa, predicted_cgpa]
+    x = ['Now'] + [f'Sem +{i}' for i in range(1, len(trajectory['path']))]
     
-    # Create dotted line with markers
-    ax.plot(x, y, marker='o', linestyle=':', color='#00FFD1', linewidth=2.5)
+    # Band across the model's trees, then the projected path as a dotted line with markers
+    ax.fill_between(x, trajectory['lower'], trajectory['upper'], color='#00FFD1', alpha=0.15,
+                    linewidth=0, label='Likely range')
+    ax.plot(x, trajectory['path'], marker='o', linestyle=':', color='#00FFD1', linewidth=2.5,
+            label='Projected CGPA')
     
     # Set chart limits and labels
     ax.set_ylim(0, 5)
-    ax.set_title('🎯 CGPA Forecast', fontsize=14)
+    ax.set_title('🎯 CGPA Trajectory to Graduation', fontsize=14)
     ax.set_ylabel('CGPA')
+    ax.legend(loc='lower right', frameon=False)
     
     # Add grid with subtle styling
     ax.grid(True, linestyle='--', alpha=0.3)
@@ -159,24 +223,22 @@ def create_dotted_forecast_chart(previous_cgpa, predicted_cgpa):
     
     return fig
 
-def format_student_data():
+def render_cached_chart(draw, *key_parts):
+    """Show a matplotlib chart, reusing the PNG any worker already rendered for the same inputs"""
+    def render():
+        fig = draw()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=150)
+        plt.close(fig)
+        return buffer.getvalue()
+    st.image(get_cache().get_or_set(make_key('chart', *key_parts), render), use_container_width=True)
+
+def format_student_data(predicted_cgpa=None):
     """
-    Convert current student data into a nicely formatted summary string.
+    Compact, identifier-free summary of the student's data for the recommendation prompt.
     """
-    name = st.session_state.user_name
-    user_id = st.session_state.user_id
-    current_cgpa = st.session_state.current_cgpa
-    courses = st.session_state.curr_data
-
-    # Fix: Use 'course_id' instead of 'name'
-    course_list = "\n".join([f"{c['course_id']} ({c['course_units']} units)" for c in courses]) if courses else "No current courses."
-
-    return f"""Student Name: {name}
-Student ID: {user_id}
-Current CGPA: {current_cgpa}
-Current Courses:
-{course_list}
-"""
+    return compact_profile(st.session_state.current_cgpa, st.session_state.curr_data,
+                           st.session_state.prev_data, predicted_cgpa)
 
 # ------------------ DISPLAY STUDENT PROFILE ------------------
 def display_student_profile():
@@ -198,10 +260,10 @@ def display_student_profile():
             st.markdown("**CGPA**")
             st.markdown(f"<div style='font-size: 32px; font-weight: bold; color: #00FFD1;'>{cgpa:.2f}</div>", 
                        unsafe_allow_html=True)
-            st.caption("Target: 3.8")
+            st.caption(f"Target: {TARGET_CGPA}")
             
             # Progress bar without help parameter
-            progress = min(cgpa/3.8*100, 100)
+            progress = min(cgpa/TARGET_CGPA*100, 100)
             st.markdown(f"<div style='color: #AAAAAA; font-size: 12px; display: flex; justify-content: space-between;'>"
                        f"<span>Progress</span><span>{progress:.0f}%</span></div>", 
                        unsafe_allow_html=True)
@@ -242,6 +304,38 @@ def display_student_profile():
             st.progress(int(progress))
             st.markdown("</div>", unsafe_allow_html=True)
     
+    # Path to target: smallest habit change the model says reaches the CGPA target
+    if ml_model is not None:
+        st.markdown(f"#### 🎯 Path to Your {TARGET_CGPA} Target")
+        try:
+            path = cached_solve_target(
+                ml_model,
+                st.session_state.model_version,
+                map_features_to_model(build_raw_input()),
+                TARGET_CGPA,
+                st.session_state.expected_features
+            )
+            if path['effort'] == 0:
+                st.success(f"Your current habits already forecast {path['current_prediction']:.2f} — keep them up!")
+            elif path['reachable']:
+                changes = {
+                    'study_hours': ("Study hours/week", "h"),
+                    'attendance': ("Attendance", "%"),
+                    'engagement': ("Lecture engagement", "%")
+                }
+                target_cols = st.columns(len(changes))
+                for col, (feature, (label, unit)) in zip(target_cols, changes.items()):
+                    if f'{feature}_required' in path:
+                        col.metric(label, f"{path[f'{feature}_required']:.0f}{unit}",
+                                   delta=f"{path[f'{feature}_change']:+.1f}{unit}")
+                st.caption(f"Forecast with these changes: {path['predicted_cgpa']:.2f} "
+                           f"(currently {path['current_prediction']:.2f})")
+            else:
+                st.info("The model does not reach this target through study habits alone — "
+                        "talk to your advisor about course load and exam preparation.")
+        except Exception as e:
+            st.warning(f"Could not compute a path to your target: {str(e)}")
+    
     st.divider()
     
     # Additional Info Section
@@ -298,23 +392,7 @@ def display_student_profile():
             st.markdown("<div style='text-align: center;'>Academic Excellence</div>", unsafe_allow_html=True)
     
     # Add subtle animations
-    st.markdown("""
-    <style>
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(20px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        div[data-testid="stHorizontalBlock"] {
-            animation: fadeIn 0.5s ease-out;
-        }
-        
-        div[data-testid="stHorizontalBlock"]:nth-child(1) { animation-delay: 0.1s; }
-        div[data-testid="stHorizontalBlock"]:nth-child(2) { animation-delay: 0.2s; }
-        div[data-testid="stHorizontalBlock"]:nth-child(3) { animation-delay: 0.3s; }
-        div[data-testid="stHorizontalBlock"]:nth-child(4) { animation-delay: 0.4s; }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(PROFILE_CSS, unsafe_allow_html=True)
     
 # ------------------ PROFILE PAGE ------------------    
     # Create tabs for different profile sections with meaningful content
@@ -331,69 +409,15 @@ def display_student_profile():
             with col1:
                 st.markdown("#### 📖 Previous Courses")
                 if st.session_state.prev_data:
-                    prev_df = pd.DataFrame(st.session_state.prev_data)
-                    # Create letter grades and colors
-                    prev_df['Letter Grade'] = prev_df['grade'].apply(grade_to_letter)
-                    prev_df['Grade Color'] = prev_df['Letter Grade'].apply(grade_to_color)
-                    
-                    # Display as styled table - MATCHING CURRENT COURSES DESIGN
-                    for _, row in prev_df.iterrows():
-                        st.markdown(f"""
-                            <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;
-                                    border-left: 4px solid {row['Grade Color']};">
-                                <div style="display: flex; justify-content: space-between; align-items: center;">
-                                    <div>
-                                        <strong>{row['course_id']}</strong>
-                                        <div style="font-size: 13px; color: #AAAAAA; margin-top: 5px;">
-                                            Previous Course • {row['course_units']} units
-                                        </div>
-                                    </div>
-                                    <div style="font-size: 24px; font-weight: bold; color: {row['Grade Color']}">
-                                        {row['grade']}
-                                    </div>
-                                </div>
-                                <div style="margin-top: 10px;">
-                                    <div style="display: flex; justify-content: space-between; font-size: 12px; color: #AAAAAA;">
-                                        <span>Grade</span>
-                                        <span>{row['Letter Grade']}</span>
-                                    </div>
-                                    <div style="height: 6px; background: #2D3746; border-radius: 3px; margin-top: 5px;">
-                                        <div style="height: 100%; width: 100%; background: {row['Grade Color']}; border-radius: 3px;"></div>
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
+                    # All cards rendered from one cached HTML string - MATCHING CURRENT COURSES DESIGN
+                    st.markdown(render_previous_courses(st.session_state.prev_data, active_scale()), unsafe_allow_html=True)
                 else:
                     st.info("No previous courses recorded")
             
             with col2:
                 st.markdown("#### 📝 Current Courses")
                 if st.session_state.curr_data:
-                    curr_df = pd.DataFrame(st.session_state.curr_data)
-                    for _, row in curr_df.iterrows():
-                        progress = random.randint(30, 80)  # Simulated progress
-                        st.markdown(f"""
-                            <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;
-                                    border-left: 4px solid #00FFD1;">
-                                <div style="display: flex; justify-content: space-between; align-items: center;">
-                                    <div>
-                                        <strong>{row['course_id']}</strong>
-                                        <div style="font-size: 13px; color: #AAAAAA; margin-top: 5px;">
-                                            Current Course • {row['course_units']} units
-                                        </div>
-                                    </div>
-                                </div>
-                                <div style="margin-top: 10px;">
-                                    <div style="display: flex; justify-content: space-between; font-size: 12px; color: #AAAAAA;">
-                                        <span>Progress</span>
-                                        <span>{progress}%</span>
-                                    </div>
-                                    <div style="height: 6px; background: #2D3746; border-radius: 3px; margin-top: 5px;">
-                                        <div style="height: 100%; width: {progress}%; background: #00FFD1; border-radius: 3px;"></div>
-                                    </div>
-                                </div>
-                            </div>
-                        """, unsafe_allow_html=True)
+                    st.markdown(render_current_courses(st.session_state.curr_data), unsafe_allow_html=True)
                 else:
                     st.info("No current courses registered")
         else:
@@ -405,11 +429,10 @@ def display_student_profile():
         if st.session_state.prev_data:
             # Create a performance chart
             perf_df = pd.DataFrame(st.session_state.prev_data)
-            perf_df['Letter Grade'] = perf_df['grade'].apply(grade_to_letter)
+            perf_df['Letter Grade'] = grades_to_letters(perf_df['grade'], active_scale())
             
-            # Calculate GPA per course (simple conversion)
-            grade_points = {'A': 5, 'B': 4, 'C': 3, 'D': 2, 'E': 1, 'F': 0}
-            perf_df['Grade Points'] = perf_df['Letter Grade'].map(grade_points)
+            # Grade points per course on the active scale
+            perf_df['Grade Points'] = grade_points(perf_df['grade'], active_scale())
             
             # Performance metrics
             col1, col2, col3 = st.columns(3)
@@ -417,24 +440,30 @@ def display_student_profile():
             col2.metric("Average Grade", f"{perf_df['grade'].mean():.1f}%")
             col3.metric("Lowest Grade", f"{perf_df['grade'].min()}%")
             
-            # Create bar chart of grades
-            fig, ax = plt.subplots(figsize=(10, 4))
-            colors = [grade_to_color(grade) for grade in perf_df['Letter Grade']]
-            bars = ax.bar(perf_df['course_id'], perf_df['grade'], color=colors)
-            
-            ax.set_ylim(0, 100)
-            ax.set_title('Course Performance', fontsize=14)
-            ax.set_ylabel('Grade (%)')
-            ax.grid(axis='y', linestyle='--', alpha=0.3)
-            
-            # Add letter grades on bars
-            for bar, letter in zip(bars, perf_df['Letter Grade']):
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height-5, 
-                        f"{letter}", ha='center', va='top', color='white', 
-                        fontweight='bold', fontsize=10)
+            # Create bar chart of grades (PNG shared through the cache)
+            def draw_performance():
+                fig, ax = plt.subplots(figsize=(10, 4))
+                colors = letters_to_colors(perf_df['Letter Grade'])
+                bars = ax.bar(perf_df['course_id'], perf_df['grade'], color=colors)
+
+                ax.set_ylim(0, 100)
+                ax.set_title('Course Performance', fontsize=14)
+                ax.set_ylabel('Grade (%)')
+                ax.grid(axis='y', linestyle='--', alpha=0.3)
+
+                # Add letter grades on bars
+                for bar, letter in zip(bars, perf_df['Letter Grade']):
+                    height = bar.get_height()
+                    ax.text(bar.get_x() + bar.get_width()/2., height-5, 
+                            f"{letter}", ha='center', va='top', color='white', 
+                            fontweight='bold', fontsize=10)
+
+                return fig
             
-            st.pyplot(fig)
+            # Bar letters follow the grading scale, so it is part of the key
+            render_cached_chart(draw_performance, 'performance',
+                                perf_df[['course_id', 'grade']].to_records(index=False).tolist(),
+                                active_scale()['bands'])
             
             # Attendance and study hours analysis
             st.markdown("#### 📊 Study Habits Analysis")
@@ -532,17 +561,13 @@ def format_time(seconds):
     seconds %= 60
     return f"{minutes:02d}:{seconds:02d}"
 
-def start_study_timer(duration):
-    """Start the study timer"""
-    st.session_state.study_timer_active = True
-    st.session_state.study_timer_start = time.time()
-    st.session_state.study_timer_duration = duration
-    st.session_state.study_timer_remaining = duration
+def study_timer_remaining():
+    """Seconds left in the active session"""
+    return timer_remaining(st.session_state)
 
-def stop_study_timer():
-    """Stop the study timer"""
-    st.session_state.study_timer_active = False
-    st.session_state.pomodoro_count += 1
+def handle_focus_timer_event(event):
+    """Apply a start/stop/complete event from the browser timer once; returns the event name"""
+    return apply_timer_event(st.session_state, event)
 
 def get_achievement_badge(count):
     """Get achievement badge based on pomodoro count"""
@@ -558,46 +583,12 @@ def get_achievement_badge(count):
         return "🏆 Grand Master"
 
 # Feedback functions
-def generate_feedback(predicted_cgpa, input_features):
-    """Generate brief, specific, actionable personalized feedback and study tips based on prediction"""
-    # Basic feedback based on predicted CGPA
-    if predicted_cgpa >= 3.7:
-        feedback = "🌟 Excellent progress! You're on track for top honours."
-    elif predicted_cgpa >= 3.0:
-        feedback = "👍 Solid performance—keep up the consistency!"
-    elif predicted_cgpa >= 2.5:
-        feedback = "🛠️ Moderate zone—consider boosting study hours and engagement."
-    else:
-        feedback = "🚧 At-risk range. Let's build a stronger study plan."
-    
-    # Specific tips based on weaknesses
-    tips = []
-    
-    # Attendance-related tips
-    if input_features.get("Attendance %", 0) < 70:
-        tips.append("📅 **Attendance Boost**: Try to attend at least 85% of classes. Regular attendance correlates with better grades.")
-    
-    # Study hours tips
-    if input_features.get("Study Hours per Week", 0) < 15:
-        tips.append("⏱️ **Study Time**: Aim for 15-20 hours/week of focused study. Quality matters more than quantity!")
-    
-    # Assignment completion tips
-    if input_features.get("Assignments Completed", 0) < 80:
-        tips.append("📝 **Assignments**: Complete all assignments on time. They're crucial for reinforcing concepts.")
-    
-    # Midterm performance tips
-    if input_features.get("Midterm Score", 0) < 60:
-        tips.append("📚 **Midterm Prep**: Review midterm mistakes. Focus on weak areas before finals.")
-    
-    # Engagement tips
-    if input_features.get("Lecture Engagement", 0) < 70:
-        tips.append("💬 **Engagement**: Actively participate in lectures. Ask questions and join discussions.")
-    
-    # General tips if no specific weaknesses
-    if not tips:
-        tips.append("🎯 **Maintain Momentum**: Your current habits are working well. Keep refining your approach!")
-    
-    return feedback, tips
+def offline_recommendations(predicted_cgpa, input_features):
+    """Rule-based tips shown in place of AI recommendations when Gemini is unavailable"""
+    feedback, tips = generate_feedback(predicted_cgpa, input_features)
+    return ("⚡ *Personalised AI recommendations are temporarily unavailable - "
+            "here are quick tips based on your forecast.*\n\n"
+            f"{feedback}\n\n" + "\n".join(f"- {tip}" for tip in tips))
 
 # Animation functions
 def fade_in():
@@ -662,36 +653,97 @@ def map_features_to_model(input_features):
     
     return mapped_features
 
-# ------------------ MODEL LOADING ------------------
-try:
-    # Try loading the model as a dictionary first
-    model_data = joblib.load("models/model.pkl")
+def build_raw_input():
+    """Build the raw prediction inputs from the student's session data"""
+    raw_input = {
+        "Current GPA": float(st.session_state.current_cgpa),
+        "Assignments Completed": 85.0,
+        "Midterm Score": 75.0,
+        "Lecture Engagement": 80.0
+    }
     
-    if isinstance(model_data, dict) and 'model' in model_data:
-        # New format: dictionary with model and feature names
-        ml_model = model_data['model']
-        expected_features = model_data['feature_names']
+    # Handle attendance and study hours safely
+    if st.session_state.prev_data:
+        try:
+            raw_input["Attendance %"] = float(np.mean([c.get('attendance', 0) for c in st.session_state.prev_data]))
+        except:
+            raw_input["Attendance %"] = 0.0
+        
+        try:
+            raw_input["Study Hours per Week"] = float(np.mean([c.get('study_hours', 0) for c in st.session_state.prev_data]))
+        except:
+            raw_input["Study Hours per Week"] = 0.0
     else:
-        # Old format: just the model object
-        ml_model = model_data
-        # Define expected features based on your training
-        expected_features = [
-            'GPA_last_semester',
-            'credit_load',
-            'current_CGPA',
-            'study_hours',
-            'attendance',
-            'engagement',
-            'midterm_score'
-        ]
+        raw_input["Attendance %"] = 0.0
+        raw_input["Study Hours per Week"] = 0.0
     
-    st.session_state.ml_model = ml_model
-    st.session_state.expected_features = expected_features
+    return raw_input
+
+# ------------------ MODEL LOADING ------------------
+@st.cache_resource
+def get_model_pool():
+    """Per-institution models shared by every session; the busiest ones are loaded at startup"""
+    pool = ModelPool.from_env()
+    pool.prewarm(int(os.getenv("OPTIGRADE_PREWARM", 3)))
+    return pool
+
+# Models are looked up in the pool on every rerun and never stored in session_state:
+# a session holding a model would keep an evicted copy alive next to its reload.
+try:
+    # Institution from the link (?institution=...) or the deployment's default
+    tenant = st.query_params.get("institution") or os.getenv("OPTIGRADE_TENANT", DEFAULT_TENANT)
+    # Usage (for pre-warming) counts a session once per institution, not every rerun
+    new_request = st.session_state.get('pool_counted') != tenant
+    st.session_state.pool_counted = tenant
+    try:
+        model_entry = get_model_pool().get(tenant, request=new_request)
+    except UnknownTenant:
+        st.warning(f"No model registered for institution '{tenant}' - using the default model")
+        model_entry = get_model_pool().get(DEFAULT_TENANT, request=new_request)
+
+    ml_model = model_entry['model']
+    st.session_state.expected_features = model_entry['feature_names']
+    st.session_state.model_version = model_entry['version']
+    # What-if curves use the lookup-table surrogate when one has been built for this model
+    whatif_model = model_entry.get('surrogate') or model_entry['model']
+    whatif_version = model_entry['version'] + ('-surrogate' if model_entry.get('surrogate') else '')
+    if st.session_state.get('tenant') != model_entry['tenant']:
+        st.session_state.tenant = model_entry['tenant']
+        if model_entry['config'].get('grading_scale') in SCALES:
+            st.session_state.grading_scale = model_entry['config']['grading_scale']
+    del model_entry
     
 except Exception as e:
     st.error(f"❌ Could not load ML model: {e}")
-    st.session_state.ml_model = None
+    ml_model = None
     st.session_state.expected_features = []
+    st.session_state.model_version = None
+    whatif_model = None
+    whatif_version = None
+    st.session_state.tenant = DEFAULT_TENANT
+
+@st.cache_resource
+def get_drift_monitor(tenant=DEFAULT_TENANT):
+    """Drift monitor for a tenant's model, shared by every session (None without a training baseline)"""
+    if tenant == DEFAULT_TENANT:
+        path = os.getenv("OPTIGRADE_DRIFT_BASELINE", "models/drift_baseline.json")
+    else:
+        path = os.path.join(get_model_pool().root, tenant, "drift_baseline.json")
+    baseline = load_baseline(path)
+    return DriftMonitor(baseline) if baseline else None
+
+@st.cache_resource
+def get_audit_log():
+    """Background prediction audit writer shared by every session (None when disabled)"""
+    return AuditLog.from_env()
+
+def observe_prediction(features, prediction):
+    """Feed a prediction to the drift monitor once per distinct input (reruns are not new traffic)"""
+    monitor = get_drift_monitor(st.session_state.tenant)
+    key = (tuple(features.items()), prediction)
+    if monitor and st.session_state.get('drift_observed') != key:
+        monitor.observe(features, prediction)
+        st.session_state.drift_observed = key
 
 # ------------------ UI COMPONENTS ------------------
 # ---------- Logo ------------------
@@ -711,6 +763,28 @@ def render_logo():
             </svg>
         </div>
     """, height=240)
+# ---------- Resources ------------------
+RESOURCE_PAGE_SIZE = 50  # resource cards shown at once
+
+@st.cache_resource
+def get_resource_catalog():
+    """Resource catalog shared by every session, built once per process"""
+    return load_catalog(os.getenv("RESOURCE_CATALOG_PATH"))
+
+@st.cache_resource
+def get_course_catalog():
+    """Course catalog and prerequisite graph shared by every session, built once per process"""
+    return load_course_catalog(os.getenv("OPTIGRADE_COURSE_CATALOG"))
+
+# ---------- Images ------------------
+def render_image(name, alt="", sizes="100vw"):
+    """Render a responsive, cache-friendly image from assets/ (falls back to the original file)"""
+    picture = picture_html(asset_manifest, name, alt=alt, sizes=sizes)
+    if picture:
+        st.markdown(picture, unsafe_allow_html=True)
+    else:
+        st.image(os.path.join("assets", name), use_container_width=True)
+
 # ------------------ MAIN APP LAYOUT ------------------
 render_logo()
 
@@ -798,7 +872,8 @@ if st.session_state.onboarded:
         </div>
         """, unsafe_allow_html=True)
 
-    # Create tabs at the top level
+    # Create tabs at the top level (model monitoring only for admins)
+    admin_view = os.getenv("OPTIGRADE_ADMIN") == "1"
     tabs = st.tabs([
         "ℹ️ About", 
         "🚀 Features", 
@@ -807,7 +882,7 @@ if st.session_state.onboarded:
         "📂 Course Manager",
         "📚 Resources",
         "👤 User Profile"
-    ])
+    ] + (["🛡️ Model Monitor"] if admin_view else []))
 
     #--------------------------ABOUT TAB ---------------------------
     with tabs[0]:  # ℹ️ About Tab
@@ -893,8 +968,7 @@ if st.session_state.onboarded:
         
         # How It Works Diagram
         st.markdown("### 🔄 The OptiGrade Feedback Loop")
-        st.image("assets/feedback_loop.png", 
-                use_container_width=True)
+        render_image("feedback_loop.png", alt="The OptiGrade feedback loop", sizes="(max-width: 800px) 100vw, 800px")
         
         # Core Technology Section
         st.markdown("### ⚙️ Technical Foundation")
@@ -1047,8 +1121,7 @@ if st.session_state.onboarded:
             """)
             
             # Use a placeholder if you don't have the image
-            st.image("assets/cgpa_predictor.jpeg", 
-                    use_container_width=True)
+            render_image("cgpa_predictor.jpeg", alt="CGPA predictor preview", sizes="(max-width: 754px) 100vw, 754px")
         
         with feature_tabs[1]:  # Personalization
             st.markdown("""
@@ -1215,25 +1288,42 @@ if st.session_state.onboarded:
                     else:
                         df = pd.read_excel(uploaded_file)
                     
-                    # Simple validation
-                    if len(df) >= 3 and all(col in df.columns for col in ['Course', 'Grade', 'Units']):
-                        st.session_state.transcript_data = df.head(3).to_dict('records')
+                    report = validate(df, TRANSCRIPT)
+                    valid = report.valid_rows()
+                    if not valid.empty:
+                        # Last semester = rows of the final Semester listed (the whole file without one);
+                        # the course rows and the semester GPA are both taken from it
+                        semesters = valid['Semester'].dropna() if 'Semester' in valid else pd.Series(dtype=object)
+                        last = valid[valid['Semester'] == semesters.iloc[-1]] if len(semesters) else valid
+                        st.session_state.transcript_data = last.head(3).to_dict('records')
+                        st.session_state.transcript_gpa = {
+                            'semester_gpa': gpa(last['Grade'], last['Units'], active_scale()),
+                            'cgpa': gpa(valid['Grade'], valid['Units'], active_scale())
+                        }
                         st.success("Transcript processed successfully! Fields will be pre-filled.")
                     else:
                         st.warning("Transcript format not recognized. Please ensure it contains Course, Grade, and Units columns.")
+                    if not report.ok:
+                        st.caption(f"{len(report.invalid_rows)} transcript row(s) were skipped:")
+                        st.dataframe(report.errors[['row', 'column', 'value', 'message']], hide_index=True)
                 except Exception as e:
                     st.error(f"Error processing file: {str(e)}")
 
+            prefill = st.session_state.get('transcript_data', [])
+            transcript_gpa = st.session_state.get('transcript_gpa', {})
+            scale = active_scale()
             with st.form("prev_form"):
                 prev_courses = []
                 for i in range(3):  # Reduced to 3 courses for better UX
                     st.subheader(f"📚 Course {i+1}")
+                    row = prefill[i] if i < len(prefill) else {}
 
                     cols = st.columns([2, 1, 1])
                     course_id = cols[0].text_input(f"Course Code", key=f"prev_course_id_{i}", 
-                                                placeholder="e.g., MATH101", value="")
+                                                placeholder="e.g., MATH101", value=row.get('Course', ""))
                     grade = cols[1].number_input(f"Grade", min_value=0, max_value=100, 
-                                                step=1, key=f"prev_grade_{i}", value=None,
+                                                step=1, key=f"prev_grade_{i}",
+                                                value=int(row['Grade']) if row else None,
                                                 format="%d")
                     if grade is not None:
                         letter_grade = grade_to_letter(grade)
@@ -1254,12 +1344,12 @@ if st.session_state.onboarded:
 
                     course_units = st.selectbox(f"Course Units", 
                                             options=[1, 2, 3, 4],
-                                            index=2, key=f"prev_units_{i}")
+                                            index=int(row['Units']) - 1 if row else 2, key=f"prev_units_{i}")
 
                     prev_courses.append({
                         'user_id': st.session_state.user_id, 
                         'semester': 'Previous', 
-                        'course_id': course_id,
+                        'course_id': normalize_code(course_id),
                         'grade': grade, 
                         'study_hours': study_hours, 
                         'attendance': attendance,
@@ -1269,31 +1359,35 @@ if st.session_state.onboarded:
 
                 st.divider()
                 cols3 = st.columns(2)
-                semester_gpa = cols3[0].number_input("Last Semester GPA (0-5)", min_value=0.0, 
-                                                    max_value=5.0, step=0.01, value=None)
-                current_cgpa = cols3[1].number_input("Overall CGPA (0-5)", min_value=0.0, 
-                                                    max_value=5.0, step=0.01, value=None)
+                semester_gpa = cols3[0].number_input(f"Last Semester GPA (0-{scale['max']:g})", min_value=0.0, 
+                                                    max_value=scale['max'], step=0.01,
+                                                    value=round(transcript_gpa['semester_gpa'], 2) if transcript_gpa else None,
+                                                    help="Leave blank to compute it from the courses above")
+                current_cgpa = cols3[1].number_input(f"Overall CGPA (0-{scale['max']:g})", min_value=0.0, 
+                                                    max_value=scale['max'], step=0.01,
+                                                    value=round(transcript_gpa['cgpa'], 2) if transcript_gpa else None)
 
                 submitted = st.form_submit_button("👉 Next: Current Semester")
                 if submitted:
+                    if semester_gpa is None:
+                        computed = gpa([c['grade'] for c in prev_courses], [c['course_units'] for c in prev_courses], scale)
+                        semester_gpa = None if np.isnan(computed) else round(float(computed), 2)
 
                     # ✅ Enhanced validation
-                    all_filled = True
-                    for course in prev_courses:
-                        if not course['course_id'] or not course['course_id'].strip():
-                            st.error("Course code cannot be empty")
-                            all_filled = False
-                        if course['grade'] is None or course['study_hours'] is None or \
-                        course['attendance'] is None or course['course_units'] is None:
-                            all_filled = False
-
-                    if semester_gpa is None or current_cgpa is None:
-                        all_filled = False
+                    report = validate(pd.DataFrame([{**course, 'semester_gpa': semester_gpa} for course in prev_courses]),
+                                      PREVIOUS_COURSES_FORM)
+                    for error in report.errors.drop_duplicates(['row', 'rule']).itertuples():
+                        if error.rule != 'required':
+                            st.error(f"Course {int(error.row) + 1}: {error.message}")
+                    if ((report.errors['column'] == 'course_id') & (report.errors['rule'] == 'required')).any():
+                        st.error("Course code cannot be empty")
+                    all_filled = report.ok and current_cgpa is not None
 
                     if all_filled:
                         for course in prev_courses:
                             course['semester_gpa'] = semester_gpa
                         st.session_state.current_cgpa = current_cgpa
+                        st.session_state.last_semester_gpa = semester_gpa
                         st.session_state.prev_data = prev_courses
                         st.session_state.page = 'Screen 2'
                         st.rerun()
@@ -1323,7 +1417,7 @@ if st.session_state.onboarded:
                     curr_courses.append({
                         'user_id': st.session_state.user_id, 
                         'semester': 'Current', 
-                        'course_id': course_id,
+                        'course_id': normalize_code(course_id),
                         'course_units': course_units,
                         'learning_style': learning_style
                     })
@@ -1355,27 +1449,7 @@ if st.session_state.onboarded:
             # Create sample input for prediction
             try:
                 # Create raw_input dictionary safely
-                raw_input = {
-                    "Current GPA": float(st.session_state.current_cgpa),
-                    "Assignments Completed": 85.0,
-                    "Midterm Score": 75.0,
-                    "Lecture Engagement": 80.0
-                }
-                
-                # Handle attendance and study hours safely
-                if st.session_state.prev_data:
-                    try:
-                        raw_input["Attendance %"] = float(np.mean([c.get('attendance', 0) for c in st.session_state.prev_data]))
-                    except:
-                        raw_input["Attendance %"] = 0.0
-                    
-                    try:
-                        raw_input["Study Hours per Week"] = float(np.mean([c.get('study_hours', 0) for c in st.session_state.prev_data]))
-                    except:
-                        raw_input["Study Hours per Week"] = 0.0
-                else:
-                    raw_input["Attendance %"] = 0.0
-                    raw_input["Study Hours per Week"] = 0.0
+                raw_input = build_raw_input()
                 
                 # Map features to what model expects
                 sample_input = map_features_to_model(raw_input)
@@ -1432,9 +1506,33 @@ if st.session_state.onboarded:
                         extra_features = [f for f in sample_input if f not in st.session_state.expected_features]
                         if extra_features:
                             st.warning(f"Extra features: {extra_features}")
+                        
+                        # --- Feature Attributions ---
+                        if ml_model:
+                            st.write("**Why this prediction? (TreeSHAP attributions)**")
+                            try:
+                                base_value, attributions = cached_explain(
+                                    ml_model,
+                                    st.session_state.model_version,
+                                    feature_vector(sample_input, st.session_state.expected_features),
+                                    st.session_state.expected_features
+                                )
+                                order = np.argsort(np.abs(attributions[0]))
+                                fig, ax = plt.subplots(figsize=(8, 4))
+                                ax.barh(np.array(st.session_state.expected_features)[order], attributions[0][order],
+                                        color=['#4CAF50' if v >= 0 else '#F44336' for v in attributions[0][order]])
+                                ax.axvline(0, color='#AAAAAA', linewidth=1)
+                                ax.set_xlabel('Effect on predicted CGPA')
+                                ax.set_title(f'Contributions relative to the average forecast ({base_value:.2f})', fontsize=12)
+                                ax.grid(axis='x', linestyle='--', alpha=0.3)
+                                ax.spines['top'].set_visible(False)
+                                ax.spines['right'].set_visible(False)
+                                st.pyplot(fig)
+                            except Exception as e:
+                                st.warning(f"Could not explain this prediction: {str(e)}")
 
                     # === PREDICTION RESULTS SECTION ===
-                    if st.session_state.ml_model:
+                    if ml_model:
                         try:
                             previous_cgpa = float(st.session_state.current_cgpa)
                             # Create dataframe with correct feature order
@@ -1449,19 +1547,40 @@ if st.session_state.onboarded:
                             input_df = pd.DataFrame([input_values], 
                                                 columns=st.session_state.expected_features)
                             
-                            prediction = float(st.session_state.ml_model.predict(input_df)[0])
+                            predict_started = time.perf_counter()
+                            prediction = float(ml_model.predict(input_df)[0])
+                            latency_ms = (time.perf_counter() - predict_started) * 1000
+                            scored_features = dict(zip(input_df.columns, input_values))
+                            observe_prediction(scored_features, prediction)
+                            audit_log = get_audit_log()
+                            if audit_log:
+                                audit_log.log_prediction(st.session_state.model_version, scored_features, prediction,
+                                                         latency_ms, session=st.session_state.audit_session)
                             
+                            # Project the rest of the degree by applying the model semester by semester
+                            tcol1, tcol2 = st.columns(2)
+                            semesters_completed = tcol1.number_input("Semesters completed", min_value=1, max_value=12,
+                                                                     value=2, key="semesters_completed")
+                            semesters_remaining = tcol2.number_input("Semesters to graduation", min_value=1, max_value=12,
+                                                                     value=4, key="semesters_remaining")
+                            trajectory = cached_trajectory(ml_model, st.session_state.model_version,
+                                                           scored_features, semesters_completed, semesters_remaining,
+                                                           st.session_state.expected_features)
+
                             # Display prediction metrics
                             col1, col2 = st.columns([1, 2])
                             with col1:
                                 st.metric("Previous CGPA", f"{previous_cgpa:.2f}")
-                                st.metric("Predicted Final CGPA", f"{prediction:.2f}", 
+                                st.metric("Predicted CGPA (next semester)", f"{prediction:.2f}", 
                                         delta=f"{prediction - previous_cgpa:.2f}")
                                 
                                 # Progress bar without help parameter
                                 progress_value = min(prediction / 5.0, 1.0)
                                 st.progress(progress_value)
                                 
+                                st.metric("Projected Graduation CGPA", f"{trajectory['path'][-1]:.2f}")
+                                st.caption(f"Likely range {trajectory['lower'][-1]:.2f} – {trajectory['upper'][-1]:.2f}")
+                                
                                 # Grade interpretation
                                 if prediction >= 4.0:
                                     st.success("First Class Performance! 🎉")
@@ -1472,15 +1591,51 @@ if st.session_state.onboarded:
                             
                             with col2:
                                 # Create and display forecast chart
-                                fig = create_dotted_forecast_chart(previous_cgpa, prediction)
-                                st.pyplot(fig)
+                                render_cached_chart(lambda: create_dotted_forecast_chart(trajectory),
+                                                    'trajectory', trajectory)
+
+                            # --- What-If Section ---
+                            st.divider()
+                            st.subheader("🔮 What-If Explorer")
+                            st.markdown("Move the sliders to see how your forecast changes, and how each factor shapes it.")
+
+                            whatif_col1, whatif_col2 = st.columns(2)
+                            whatif_hours = whatif_col1.slider("Study Hours per Week", min_value=1, max_value=50,
+                                                              value=int(min(max(round(raw_input["Study Hours per Week"]), 1), 50)),
+                                                              key="whatif_study_hours")
+                            whatif_attendance = whatif_col2.slider("Attendance %", min_value=0, max_value=100, step=10,
+                                                                   value=int(round(raw_input["Attendance %"], -1)),
+                                                                   key="whatif_attendance")
+
+                            whatif_input = dict(raw_input)
+                            whatif_input["Study Hours per Week"] = float(whatif_hours)
+                            whatif_input["Attendance %"] = float(whatif_attendance)
+
+                            whatif_start = time.perf_counter()
+                            whatif_prediction, curves = cached_partial_dependence(
+                                whatif_model,
+                                whatif_version,
+                                map_features_to_model(whatif_input),
+                                st.session_state.expected_features
+                            )
+
+                            # Compare like with like: the surrogate's own value at the unchanged inputs
+                            whatif_base = (prediction if whatif_model is ml_model
+                                           else float(whatif_model.predict(input_df)[0]))
+                            st.metric("What-If Predicted CGPA", f"{whatif_prediction:.2f}",
+                                      delta=f"{whatif_prediction - whatif_base:.2f}")
+
+                            st.vega_lite_chart(curves, curves_chart_spec())
+                            st.caption(f"Sensitivity curves computed in {(time.perf_counter() - whatif_start) * 1000:.0f} ms")
 
                             # --- Feedback and Recommendations Section ---
                             st.divider()
                             st.subheader("📝 Performance Feedback & Recommendations")
 
-                            # Generate feedback
-                            feedback, tips = generate_feedback(prediction, raw_input)
+                            # Generate feedback (tips and resource links come from one rule table)
+                            feedback_row = cohort_feedback(
+                                pd.DataFrame([{**raw_input, 'predicted_cgpa': prediction}])).iloc[0]
+                            feedback, tips = feedback_row["feedback"], feedback_row["tips"]
 
                             # Display feedback
                             st.info(feedback)
@@ -1493,47 +1648,23 @@ if st.session_state.onboarded:
                             # Enhanced Resource recommendations
                             st.markdown("### 📚 Recommended Resources:")
                             
-                            # Study Resources
-                            if raw_input["Study Hours per Week"] < 15:
-                                st.markdown("""
-                                **Study Habits & Techniques:**
-                                - [Study Smarter, Not Harder](https://learningcenter.unc.edu/tips-and-tools/studying-101-study-smarter-not-harder/)
-                                - [Active Learning Strategies](https://www.cultofpedagogy.com/active-learning-strategies/)
-                                - [Pomodoro Technique Guide](https://todoist.com/productivity-methods/pomodoro-technique)
-                                """)
-                            
-                            # Attendance Resources
-                            if raw_input["Attendance %"] < 70:
-                                st.markdown("""
-                                **Attendance Improvement:**
-                                - [Why Attendance Matters](https://www.edutopia.org/article/why-attendance-matters)
-                                - [Building Attendance Habits](https://www.understood.org/articles/en/how-to-help-your-child-with-attendance-issues)
-                                """)
-                            
-                            # Engagement Resources
-                            if raw_input["Lecture Engagement"] < 70:
-                                st.markdown("""
-                                **Lecture Engagement:**
-                                - [Active Learning Strategies](https://www.celt.iastate.edu/teaching/effective-teaching-practices/active-learning)
-                                - [Note-taking Systems](https://www.student.unsw.edu.au/note-taking-skills)
-                                """)
-                            
-                            # General Resources
-                            st.markdown("""
-                            **General Academic Improvement:**
-                            - [Khan Academy](https://www.khanacademy.org/) - Free courses on all subjects
-                            - [Coursera](https://www.coursera.org/) - Online courses from top universities
-                            - [Quizlet](https://quizlet.com/) - Study tools and flashcards
-                            """)
+                            for block in resource_markdown(feedback_row["resource_groups"]):
+                                st.markdown(block)
                             
                             # Display student profile
                             display_student_profile()
 
-                            # Generate AI recommendations
-                            student_data_str = format_student_data()
-                            gemini_recommendations = get_academic_recommendations(student_data_str)
-                            
+                            # Generate AI recommendations (fast tier unless the student asks for more depth)
                             st.subheader("🧠 Recommended Pathways to Achieve Your Goals")
+                            in_depth = st.toggle("🔬 In-depth recommendations (slower)", key="recommendations_in_depth")
+                            student_data_str = format_student_data(prediction)
+                            with st.spinner("Generating recommendations..."):
+                                gemini_recommendations = get_academic_recommendations(
+                                    student_data_str, escalate=in_depth,
+                                    fallback=lambda: offline_recommendations(prediction, raw_input),
+                                    bucket=bucket_for(st.session_state.current_cgpa, raw_input["Attendance %"],
+                                                      raw_input["Study Hours per Week"], active_scale()['max']),
+                                    student_id=st.session_state.user_id)
                             st.markdown(gemini_recommendations)
                             
                         except Exception as e:
@@ -1564,7 +1695,7 @@ if st.session_state.onboarded:
                     st.error(f"Error processing data: {str(e)}")
                     st.error(traceback.format_exc())
                     
-            if sample_input is None or st.session_state.ml_model is None:
+            if sample_input is None or ml_model is None:
                 st.error("Prediction not possible due to missing data or model")
                 if st.button("🔙 Back to Input Form"):
                     st.session_state.page = 'Screen 1'
@@ -1643,6 +1774,66 @@ if st.session_state.onboarded:
             ax.grid(axis='y', linestyle='--', alpha=0.3)
             
             st.pyplot(fig)
+            
+            # Optimized plan section
+            st.divider()
+            st.subheader("🧮 Optimize My Week")
+            st.markdown("Let the CGPA model suggest how to split your weekly goal across your courses.")
+            
+            if ml_model is None:
+                st.info("The prediction model is not available, so plans cannot be optimized right now.")
+            elif not st.session_state.curr_data:
+                st.info("Add your current courses in the CGPA Predictor to get a per-course plan.")
+            else:
+                if st.button("✨ Optimize Study Plan", use_container_width=True):
+                    try:
+                        plan = optimize_study_plan(
+                            ml_model,
+                            map_features_to_model(build_raw_input()),
+                            st.session_state.curr_data,
+                            weekly_goal,
+                            feature_names=st.session_state.expected_features,
+                            max_daily_hours=8.0,
+                            days=days
+                        )
+                        
+                        col1, col2, col3 = st.columns(3)
+                        col1.metric("Planned Hours", f"{plan['planned_hours']:.1f}h",
+                                    delta=f"{plan['planned_hours'] - weekly_goal:+.1f}h vs goal",
+                                    delta_color="off")
+                        col2.metric("Predicted CGPA", f"{plan['predicted_cgpa']:.2f}",
+                                    delta=f"{plan['gain']:+.2f} vs {plan['baseline']}")
+                        col3.metric("Model Rows Scored", f"{plan['rows_scored']}")
+                        if plan['mode'] == 'mean':
+                            st.caption("The model scores study time as average hours per course, so every weekly "
+                                       "total up to your goal was scored and the smallest one with the best "
+                                       "prediction is split by course units, with at least 1h for every course.")
+                            st.line_chart(plan['hours_curve'], x='weekly_hours', y='predicted_cgpa')
+                        
+                        allocation = plan['allocation'].rename(columns={
+                            'course_id': 'Course',
+                            'course_units': 'Units',
+                            'hours': 'Hours/Week',
+                            'predicted_cgpa': 'Predicted CGPA',
+                            'marginal_gain': 'Gain from +0.5h'
+                        })
+                        st.dataframe(allocation, hide_index=True, use_container_width=True)
+                        
+                        # Stacked daily plan
+                        daily_plan = plan['daily_plan']
+                        fig, ax = plt.subplots(figsize=(10, 4))
+                        bottom = np.zeros(len(daily_plan))
+                        for course_id in daily_plan.columns:
+                            ax.bar([d[:3] for d in daily_plan.index], daily_plan[course_id], bottom=bottom, label=course_id)
+                            bottom += daily_plan[course_id].to_numpy()
+                        ax.axhline(y=daily_goal, color='#2196F3', linestyle='--', label='Daily Goal')
+                        ax.set_title('Optimized Weekly Plan', fontsize=16)
+                        ax.set_ylabel('Hours')
+                        ax.legend()
+                        ax.grid(axis='y', linestyle='--', alpha=0.3)
+                        st.pyplot(fig)
+                    except Exception as e:
+                        st.error(f"Could not optimize study plan: {str(e)}")
         
         # Focus Timer subtab
         with study_tabs[1]:
@@ -1651,42 +1842,26 @@ if st.session_state.onboarded:
             
             col1, col2 = st.columns([3, 1])
             with col1:
-                # Timer controls
+                # Timer runs in the browser; the app only reruns on start, stop and completion
                 st.markdown("### 🍅 Pomodoro Timer")
-                timer_col1, timer_col2, timer_col3 = st.columns(3)
-                
-                if timer_col1.button("Start 25 min", use_container_width=True):
-                    start_study_timer(25 * 60)
-                if timer_col2.button("Start 50 min", use_container_width=True):
-                    start_study_timer(50 * 60)
-                if timer_col3.button("Stop Timer", disabled=not st.session_state.study_timer_active, use_container_width=True):
-                    stop_study_timer()
-                
-                # Timer display
-                st.divider()
-                if st.session_state.study_timer_active:
-                    current_time = time.time()
-                    elapsed = current_time - st.session_state.study_timer_start
-                    remaining = max(0, st.session_state.study_timer_duration - elapsed)
-                    st.session_state.study_timer_remaining = remaining
-                    
-                    if remaining <= 0:
-                        stop_study_timer()
-                        st.balloons()
-                        st.success("Time's up! Take a break.")
-                
-                minutes, seconds = divmod(st.session_state.study_timer_remaining, 60)
-                timer_display = f"{int(minutes):02d}:{int(seconds):02d}"
-                
-                st.markdown(f"<div style='text-align: center; margin: 30px 0;'>", unsafe_allow_html=True)
-                st.markdown(f"<h1 style='text-align: center; font-size: 72px;'>{timer_display}</h1>", unsafe_allow_html=True)
-                st.markdown(f"<p style='text-align: center; font-size: 18px;'>Mode: {'Focus Time' if st.session_state.study_timer_active else 'Ready'}</p>", unsafe_allow_html=True)
-                st.markdown(f"</div>", unsafe_allow_html=True)
+                timer_event = handle_focus_timer_event(focus_timer(
+                    session_id=str(st.session_state.study_timer_start) if st.session_state.study_timer_active else None,
+                    remaining=study_timer_remaining(),
+                    duration=st.session_state.study_timer_duration,
+                    idle_seconds=st.session_state.study_timer_remaining,
+                    key="focus_timer"
+                ))
+                if timer_event == 'complete':
+                    st.balloons()
+                    st.success("Time's up! Take a break.")
                 
                 # Session history
                 st.divider()
                 st.markdown("### 📝 Session History")
                 st.write(f"Completed Pomodoro sessions: {st.session_state.pomodoro_count}")
+                if st.session_state.focus_sessions:
+                    st.dataframe(pd.DataFrame(st.session_state.focus_sessions[::-1]),
+                                 hide_index=True, use_container_width=True)
                 
             with col2:
                 # Achievements
@@ -1729,72 +1904,83 @@ if st.session_state.onboarded:
                     
                     if st.form_submit_button("Add Goal"):
                         if goal_title:
-                            st.session_state.study_goals.append({
-                                "title": goal_title,
-                                "description": goal_description,
-                                "due": goal_due.strftime("%Y-%m-%d"),
-                                "priority": goal_priority,
-                                "completed": False
-                            })
+                            st.session_state.study_goals.add(goal_title, goal_description,
+                                                             goal_due, goal_priority)
                             st.success("Goal added successfully!")
                 
                 st.divider()
                 
-                # Active goals
+                # Active goals, most urgent first
+                goals = st.session_state.study_goals
                 st.subheader("📋 Active Goals")
-                if not st.session_state.study_goals:
+                if not goals.status_counts["active"]:
                     st.info("No active goals. Create your first goal above!")
                 else:
-                    for i, goal in enumerate(st.session_state.study_goals):
-                        if not goal["completed"]:
-                            with st.expander(f"{goal['title']} - {goal['priority']} Priority", expanded=True):
-                                st.write(goal["description"])
-                                
-                                if goal["due"]:
-                                    due_date = goal["due"]
-                                    today = pd.Timestamp.today().strftime("%Y-%m-%d")
-                                    days_left = (pd.Timestamp(goal["due"]) - pd.Timestamp.today()).days
+                    for goal in goals.active():
+                        with st.expander(f"{goal['title']} - {goal['priority']} Priority", expanded=True):
+                            st.write(goal["description"])
+                            
+                            days_left = goals.days_left(goal)
+                            if days_left is not None:
+                                if days_left < 0:
+                                    date_info = f"⚠️ Overdue by {-days_left} days"
+                                    color = "#FF4B4B"
+                                elif days_left < 7:
+                                    date_info = f"🔜 Due in {days_left} days"
+                                    color = "#FFA500"
+                                else:
+                                    date_info = f"📅 Due in {days_left} days"
+                                    color = "#00FFD1"
                                     
-                                    if days_left < 0:
-                                        date_info = f"⚠️ Overdue by {-days_left} days"
-                                        color = "#FF4B4B"
-                                    elif days_left < 7:
-                                        date_info = f"🔜 Due in {days_left} days"
-                                        color = "#FFA500"
-                                    else:
-                                        date_info = f"📅 Due in {days_left} days"
-                                        color = "#00FFD1"
-                                        
-                                    st.markdown(f"<div style='color: {color};'>{date_info}</div>", unsafe_allow_html=True)
-                                
-                                cols = st.columns([1, 1, 2])
-                                if cols[0].button("Complete", key=f"complete_{i}"):
-                                    st.session_state.study_goals[i]["completed"] = True
-                                    st.rerun()
-                                if cols[1].button("Delete", key=f"delete_{i}"):
-                                    st.session_state.study_goals.pop(i)
-                                    st.rerun()
+                                st.markdown(f"<div style='color: {color};'>{date_info}</div>", unsafe_allow_html=True)
+                            
+                            cols = st.columns([1, 1, 2])
+                            if cols[0].button("Complete", key=f"complete_{goal['id']}"):
+                                goals.complete(goal["id"])
+                                st.rerun()
+                            if cols[1].button("Delete", key=f"delete_{goal['id']}"):
+                                goals.remove(goal["id"])
+                                st.rerun()
+                
+                # Bulk import / export
+                st.divider()
+                with st.expander("📦 Import / Export Goals"):
+                    st.download_button("⬇️ Export Goals (JSON)", goals.to_json(),
+                                       file_name="optigrade_goals.json", mime="application/json",
+                                       disabled=not len(goals))
+                    goals_file = st.file_uploader("Import goals", type=["json", "csv"], key="goals_import")
+                    if goals_file is not None and st.button("Import", key="goals_import_btn"):
+                        try:
+                            if goals_file.name.endswith(".csv"):
+                                records = pd.read_csv(goals_file, dtype=str, keep_default_na=False).to_dict("records")
+                            else:
+                                records = json.load(goals_file)
+                            added = goals.import_records(records)
+                            st.success(f"Imported {len(added)} goals")
+                            st.rerun()
+                        except (KeyError, ValueError, TypeError) as e:
+                            st.error(f"Could not import goals: {e}")
             
             with col2:
                 # Progress visualization
                 st.subheader("📊 Goal Progress")
                 
-                # Calculate goal stats
-                total_goals = len(st.session_state.study_goals)
-                completed_goals = sum(1 for goal in st.session_state.study_goals if goal["completed"])
+                # Goal stats come straight from the store's counters
+                total_goals = goals.total
+                completed_goals = goals.completed_count
                 progress = completed_goals / total_goals if total_goals > 0 else 0
                 
                 st.metric("Goals Completed", f"{completed_goals}/{total_goals}", f"{progress*100:.1f}%")
                 st.progress(progress)
                 
                 # Priority distribution
-                if total_goals > 0:
-                    priorities = [goal["priority"] for goal in st.session_state.study_goals if not goal["completed"]]
-                    priority_counts = {p: priorities.count(p) for p in set(priorities)}
-                    
+                priority_counts = {p: goals.priority_counts[p] for p in ["Low", "Medium", "High"]
+                                   if goals.priority_counts[p]}
+                if priority_counts:
+                    priority_colors = {"Low": '#4CAF50', "Medium": '#FFC107', "High": '#F44336'}
                     fig, ax = plt.subplots()
                     ax.pie(priority_counts.values(), labels=priority_counts.keys(), autopct='%1.1f%%',
-                        colors=['#4CAF50', '#FFC107', '#F44336'])
+                        colors=[priority_colors[p] for p in priority_counts])
                     ax.set_title('Priority Distribution')
                     st.pyplot(fig)
                 
@@ -1804,9 +1990,7 @@ if st.session_state.onboarded:
                 if completed_goals == 0:
                     st.info("No completed goals yet")
                 else:
-                    for goal in st.session_state.study_goals:
-                        if goal["completed"]:
-                            st.markdown(f"- ~~{goal['title']}~~")
+                    st.markdown("\n".join(f"- ~~{goal['title']}~~" for goal in goals.completed()))
         
         # Progress & Analytics subtab
         with study_tabs[3]:
@@ -1880,98 +2064,176 @@ if st.session_state.onboarded:
     #--------------------------COURSE MANAGER TAB ---------------------------
     with tabs[4]:  # 📂 Course Manager
         st.subheader("📂 Course Manager")
-        
+        course_catalog = get_course_catalog()
+        # Codes typed or imported before normalisation still match the catalog's
+        passed = [normalize_code(c['course_id']) for c in st.session_state.prev_data
+                  if c.get('grade') is not None and grade_points([c['grade']], active_scale())[0] > 0]
+        registered = [normalize_code(c['course_id']) for c in st.session_state.curr_data]
+
         col1, col2 = st.columns([1, 2])
         with col1:
-            st.info("""
-            **Our Course Manager will launch in v2.0!**
-            
-            Prepare for these powerful features:
-            - 🗓️ Semester course planning with drag & drop
-            - ⏰ Assignment deadline tracker with notifications
-            - 📊 Grade calculator with scenario planning
-            - ⭐ Course difficulty ratings and reviews
-            - 🔄 Credit transfer management
-            """)
-            
+            st.markdown("#### 🔍 Find a Course")
+            course_query = st.text_input("Course code or title", placeholder="e.g., MAT1 or general chemistry",
+                                         key="course_query")
+            matches = course_catalog.search(course_query)
+            if matches:
+                st.dataframe(pd.DataFrame([{'Code': c['code'], 'Title': c['title'], 'Units': c['units'],
+                                            'Difficulty': round(c['difficulty'], 1) if c['difficulty'] else None,
+                                            'Prerequisites': ", ".join(c['prerequisites']) or "None"}
+                                           for c in matches]),
+                             hide_index=True, use_container_width=True)
+            elif course_query.strip():
+                st.caption("No course matches that code or title")
+
+            # Targets come from the current matches so the widget never holds the whole catalog
+            targets = st.session_state.get('course_targets', [])
+            targets = st.multiselect("🎯 Courses to work towards",
+                                     list(dict.fromkeys(targets + [c['code'] for c in matches])),
+                                     default=targets)
+            st.session_state.course_targets = targets
+
         with col2:
-            # Interactive course planner concept
             st.markdown("#### 🎯 Your Academic Plan")
-            st.markdown("""
-            Craft your learning journey with a personalized semester roadmap. 
-            View registered courses, track planned ones, and reflect on completed subjects.
-            """)
-            
-            planned_courses = [
-                {"Course": "CHM101", "Title": "General Chemistry I", "Units": 4, "Status": "Planned", "Difficulty": "⭐️⭐️⭐️"},
-                {"Course": "GST113", "Title": "Nigerian People and Culture", "Units": 2, "Status": "Registered", "Difficulty": "⭐️⭐️"},
-                {"Course": "MAT103", "Title": "Introductory Calculus", "Units": 3, "Status": "Registered", "Difficulty": "⭐️⭐️⭐️⭐️"},
-                {"Course": "PHY101", "Title": "General Physics I", "Units": 3, "Status": "Completed", "Difficulty": "⭐️⭐️⭐️⭐️"},
-                {"Course": "PHY107", "Title": "General Physics Laboratory I", "Units": 1, "Status": "Completed", "Difficulty": "⭐️⭐️"},
-            ]
-            
-            # Display course cards
-            for course in planned_courses:
-                status_color = {
-                    "Planned": "#4e79a7",
-                    "Registered": "#59a14f",
-                    "Completed": "#b07aa1"
-                }.get(course["Status"], "#000000")
-                
-                st.markdown(f"""
-                    <div style="background: #1e1e2e; border-radius: 8px; padding: 12px; margin-bottom: 10px;">
-                        <div style="display: flex; justify-content: space-between;">
-                            <span style="font-weight: bold; font-size: 18px;">{course['Course']}: {course['Title']}</span>
-                            <span style="background: {status_color}; color: white; padding: 2px 10px; border-radius: 12px; font-size: 12px;">
-                                {course['Status']}
-                            </span>
-                        </div>
-                        <div style="color: #a0a0a0; margin-top: 8px;">
-                            Units: {course['Units']} • Difficulty: {course['Difficulty']}
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+            st.caption(f"{len(course_catalog):,} courses in the catalog. "
+                       "Completed courses are the ones you passed; prerequisites are checked against them.")
+
+            known_registered = [c for c in registered if c in course_catalog]
+            blocked = {c: course_catalog.missing_prerequisites(c, passed) for c in known_registered}
+            st.markdown(render_course_cards([course_catalog.get(c) for c in known_registered if not blocked[c]],
+                                            "Registered"), unsafe_allow_html=True)
+            blocked = {c: missing for c, missing in blocked.items() if missing}
+            st.markdown(render_course_cards([course_catalog.get(c) for c in blocked], "Blocked",
+                                            [f"needs {', '.join(m)}" for m in blocked.values()]),
+                        unsafe_allow_html=True)
+            st.markdown(render_course_cards([course_catalog.get(c) for c in passed if c in course_catalog],
+                                            "Completed"), unsafe_allow_html=True)
+            unknown = [c for c in passed + registered if c not in course_catalog]
+            if unknown:
+                st.caption(f"Not in the catalog: {', '.join(unknown)}")
+
+            if targets:
+                st.markdown("#### 🗺️ Path to Your Targets")
+                path = course_catalog.study_order(targets, passed + registered)
+                if path:
+                    st.dataframe(pd.DataFrame([{'Semester': f"+{c['term']}", 'Code': c['code'], 'Title': c['title'],
+                                                'Units': c['units']} for c in path]),
+                                 hide_index=True, use_container_width=True)
+                else:
+                    st.success("You have already taken or registered every target course")
+            else:
+                with st.expander("📚 Courses you can take next"):
+                    st.markdown(render_course_cards(course_catalog.eligible(passed + registered, limit=10),
+                                                    "Eligible"), unsafe_allow_html=True)
+
+        # Course-load optimizer: which eligible courses to register, scored with the student's own profile
+        st.divider()
+        st.markdown("#### ⚖️ Plan Next Semester's Load")
+        if ml_model is None:
+            st.info("The prediction model is not available, so loads cannot be planned right now.")
+        elif st.session_state.get('current_cgpa') is None:
+            st.info("Complete the CGPA Predictor first - loads are scored with your own profile")
+        else:
+            # Options are the courses the student is looking at (registered, targets, search matches)
+            # plus the next few eligible ones, never the whole catalog
+            def is_eligible(code):
+                return code in course_catalog and code not in passed and not course_catalog.missing_prerequisites(code, passed)
+
+            suggested = [c for c in registered if is_eligible(c)] + \
+                        [c['code'] for c in course_catalog.eligible(passed, limit=12)]
+            chosen = st.session_state.get('load_candidates', suggested)
+            options = [c for c in dict.fromkeys(chosen + registered + targets + [c['code'] for c in matches] + suggested)
+                       if is_eligible(c)]
+            load_col1, load_col2 = st.columns([2, 1])
+            candidate_codes = load_col1.multiselect("Candidate courses", options,
+                                                    default=[c for c in dict.fromkeys(chosen) if c in options],
+                                                    help="Search the catalog on the left to add more courses")
+            st.session_state.load_candidates = candidate_codes
+            required_codes = load_col1.multiselect("Must take", candidate_codes,
+                                                   default=[c for c in registered if c in candidate_codes])
+            min_units, max_units = load_col2.slider("Units", min_value=6, max_value=30, value=UNIT_CAPS)
+            objective = load_col2.radio("Optimize for", ["Highest predicted CGPA", "Lowest risk"],
+                                        help="Lowest risk maximizes the pessimistic (10th percentile) prediction")
+
+            load = optimize_load(ml_model, map_features_to_model(build_raw_input()),
+                                 [course_catalog.get(c) for c in candidate_codes], min_units, max_units,
+                                 required=required_codes, objective="cgpa" if objective.startswith("Highest") else "risk",
+                                 feature_names=st.session_state.expected_features)
+            if load is None:
+                st.warning(f"No combination of these courses adds up to {min_units}-{max_units} units")
+            else:
+                m1, m2, m3 = st.columns(3)
+                m1.metric("Units", load['units'], help=f"{len(load['courses'])} courses")
+                m2.metric("Predicted CGPA", f"{load['predicted']:.2f}")
+                m3.metric("Pessimistic CGPA", f"{load['lower']:.2f}")
+                st.markdown(render_course_cards([course_catalog.get(c) for c in load['courses']], "Planned"),
+                            unsafe_allow_html=True)
+                st.line_chart(load['table'].rename(columns={'predicted': 'Predicted', 'lower': 'Pessimistic'}))
+                st.caption(f"Predicted CGPA by total units. Best of the {len(candidate_codes)} candidates found "
+                           f"after {load['nodes']} search steps.")
 
     #--------------------------RESOURCES TAB ---------------------------
     with tabs[5]:  # 📚 Resources
         st.subheader("📚 Academic Resources")
         st.markdown("Curated resources to enhance your learning experience")
         
-        # Resource categories
-        categories = ["All"] + list(set(resource["category"] for resource in st.session_state.resources))
-        selected_category = st.selectbox("Filter by Category", categories)
+        catalog = get_resource_catalog()
+        
+        # Search and category facets
+        search_col, filter_col = st.columns([2, 1])
+        query = search_col.text_input("🔍 Search Resources", placeholder="e.g., calculus videos",
+                                      key="resource_query")
+        matches = catalog.search(query) if query.strip() else None
+        facet_counts = catalog.facets(matches)
+        categories = ["All"] + sorted(facet_counts)
+        selected_category = filter_col.selectbox(
+            "Filter by Category", categories,
+            format_func=lambda c: f"{c} ({sum(facet_counts.values()) if c == 'All' else facet_counts[c]})")
+        
+        category = None if selected_category == "All" else selected_category
+        results = catalog.search(query, category=category, limit=RESOURCE_PAGE_SIZE + 1)
+        if len(results) > RESOURCE_PAGE_SIZE:
+            st.caption(f"Showing the top {RESOURCE_PAGE_SIZE} matches - refine your search to see more")
+            results = results[:RESOURCE_PAGE_SIZE]
+        elif not results:
+            st.info("No resources match your search")
         
         # Display resources
         col1, col2 = st.columns(2)
-        resource_counter = 0
-        
-        for resource in st.session_state.resources:
-            if selected_category == "All" or resource["category"] == selected_category:
-                with (col1 if resource_counter % 2 == 0 else col2):
-                    st.markdown(f"""
-                        <div style="border: 1px solid #2D3746; border-radius: 10px; padding: 15px; margin-bottom: 20px;">
-                            <h4>{resource['title']}</h4>
-                            <p style="color: #888; font-size: 14px;">Category: {resource['category']}</p>
-                            <a href="{resource['url']}" target="_blank" style="color: #00FFD1; text-decoration: none;">
-                                Visit Resource →
-                            </a>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    resource_counter += 1
+        col1.markdown(render_resource_cards(results[0::2]), unsafe_allow_html=True)
+        col2.markdown(render_resource_cards(results[1::2]), unsafe_allow_html=True)
         
         # Resource suggestion form
         with st.expander("➕ Suggest a Resource"):
             new_title = st.text_input("Resource Title")
             new_url = st.text_input("Resource URL")
             new_category = st.text_input("Category")
+            new_tags = st.text_input("Tags (comma separated)", placeholder="e.g., calculus, videos")
             
             if st.button("Submit Suggestion"):
-                st.session_state.resources.append({
-                    "title": new_title,
-                    "url": new_url,
-                    "category": new_category
-                })
-                st.success("Thank you for your suggestion!")
+                try:
+                    catalog.suggest({
+                        "title": new_title,
+                        "url": new_url,
+                        "category": new_category,
+                        "tags": new_tags
+                    })
+                    st.success("Thank you for your suggestion! It will appear once a moderator approves it.")
+                except ValueError as e:
+                    st.error(str(e))
+        
+        # Moderation queue: suggestions are shared by every session only once approved
+        pending = catalog.pending_suggestions() if admin_view else []
+        if pending:
+            with st.expander(f"🗂️ Pending Suggestions ({len(pending)})"):
+                for suggestion_id, resource in pending:
+                    info_col, approve_col, reject_col = st.columns([4, 1, 1])
+                    info_col.markdown(f"**{resource['title']}** ({resource['category']}) - `{resource['url']}`")
+                    if approve_col.button("Approve", key=f"approve_resource_{suggestion_id}"):
+                        catalog.approve(suggestion_id)
+                        st.rerun()
+                    if reject_col.button("Reject", key=f"reject_resource_{suggestion_id}"):
+                        catalog.reject(suggestion_id)
+                        st.rerun()
 
     #--------------------------USER PROFILE TAB ---------------------------
     with tabs[6]:  # 👤 User Profile
@@ -2058,6 +2320,9 @@ if st.session_state.onboarded:
                                       value=st.session_state.current_cgpa, step=0.01)
             if new_cgpa != st.session_state.current_cgpa:
                 st.session_state.current_cgpa = new_cgpa
+            st.session_state.grading_scale = st.selectbox(
+                "Grading Scale", list(SCALES), index=list(SCALES).index(st.session_state.grading_scale),
+                help="Used for letter grades and computed GPAs")
         with col4:
             st.selectbox("Primary Learning Style", ["Visual", "Auditory", "Kinesthetic"])
         
@@ -2067,6 +2332,46 @@ if st.session_state.onboarded:
         st.checkbox("Push notifications", value=True)
         st.checkbox("Weekly performance reports", value=True)
 
+    #--------------------------MODEL MONITOR TAB ---------------------------
+    if admin_view:
+        with tabs[7]:  # 🛡️ Model Monitor
+            st.subheader("🛡️ Input & Prediction Drift")
+            monitor = get_drift_monitor(st.session_state.tenant)
+            if monitor is None:
+                st.info("No drift baseline found - run models/train_model.py (or python -m optigrade.drift) to create one.")
+            else:
+                report = monitor.report()
+                st.caption(f"Baseline from {report['baseline_created']} • monitoring this process since {report['monitoring_since']}")
+                drift_df = monitor.report_frame()
+                alerts = drift_df[drift_df['status'] == 'alert'].index.tolist()
+                if alerts:
+                    st.error(f"Significant drift in: {', '.join(alerts)}")
+                out_of_range = [name for name in drift_df[drift_df['outside_training_range']].index if name not in alerts]
+                if out_of_range:
+                    st.warning(f"Live values outside the training range: {', '.join(out_of_range)}")
+                st.dataframe(drift_df, use_container_width=True)
+                col1, col2 = st.columns(2)
+                col1.download_button("⬇️ Drift report (JSON)", monitor.to_json(),
+                                     file_name="drift_report.json", mime="application/json")
+                if col2.button("Reset monitor"):
+                    monitor.reset()
+                    st.rerun()
+                with st.expander("Raw JSON"):
+                    st.json(report)
+
+            st.subheader("📦 Model Pool")
+            pool = get_model_pool()
+            pcol1, pcol2, pcol3 = st.columns(3)
+            pcol1.metric("Loaded models", f"{len(pool.loaded())} / {len(pool.tenants())}")
+            pcol2.metric("Memory budget used", f"{pool.bytes_used / 2**20:.1f} / {pool.budget_bytes / 2**20:.0f} MB")
+            pcol3.metric("Hits / misses / evictions",
+                         f"{pool.stats['hits']} / {pool.stats['misses']} / {pool.stats['evictions']}")
+            st.caption(f"Loaded (least recently used first): {', '.join(pool.loaded()) or 'none'}")
+            surrogate = whatif_model
+            if isinstance(surrogate, Surrogate) and surrogate.report:
+                st.caption(f"What-if surrogate: {surrogate.table.size:,} cells, max error "
+                           f"{surrogate.report['max_abs_error']:.3f} over {surrogate.report['samples']:,} points")
+
 # ------------------ FOOTER ------------------
 st.divider()
 st.markdown("""
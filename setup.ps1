@@ -34,5 +34,8 @@ if (Test-Path $trainScript) {
     Write-Host "🧠 Model trained and saved to models/model.pkl"
 }
 
+# Step 7: Build optimized image variants
+python -m optigrade.assets
+
 Write-Host "`n🎉 Setup complete! You can now run:"
 Write-Host "streamlit run optigrade_app.py" -ForegroundColor Green
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from optigrade.assets import asset_file, build_assets, ensure_assets, pick_variant, picture_html
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "assets"
+    source.mkdir()
+    Image.new("RGBA", (1000, 500), (0, 255, 209, 255)).save(source / "banner.png")
+    Image.new("RGB", (300, 300), (97, 30, 232)).save(source / "photo.jpeg")
+    (source / "logo.svg").write_text("<svg/>")
+    return source
+
+
+def test_build_generates_hashed_variants_without_upscaling(source_dir, tmp_path):
+    out = tmp_path / "static"
+    manifest = build_assets(str(source_dir), str(out), widths={"banner.png": [200, 640, 2000]})
+
+    assert set(manifest) == {"banner.png", "photo.jpeg"}
+    banner = manifest["banner.png"]["variants"]
+    assert sorted({v["width"] for v in banner}) == [200, 640, 1000]
+    assert {v["format"] for v in banner} == {"webp", "png"}
+    assert {v["format"] for v in manifest["photo.jpeg"]["variants"]} == {"webp", "jpg"}
+    assert all(v["digest"] in v["file"] and (out / v["file"]).exists() for v in banner)
+
+
+def test_variant_selection_and_fallbacks(source_dir, tmp_path):
+    out = tmp_path / "static"
+    manifest = ensure_assets(str(source_dir), str(out))
+
+    assert pick_variant(manifest, "banner.png", 300, "webp")["width"] == 320
+    assert pick_variant(manifest, "banner.png", 5000)["width"] == 1000
+    assert asset_file(manifest, "banner.png", 64, str(out)).endswith(".png")
+    assert asset_file({}, "banner.png", 64, str(out), str(source_dir)) == os.path.join(str(source_dir), "banner.png")
+
+    picture = picture_html(manifest, "banner.png", alt="Banner")
+    assert picture.startswith("<picture>") and 'type="image/webp"' in picture and "?v=" in picture
+    assert picture_html(manifest, "missing.png") == ""
@@ -0,0 +1,85 @@
+import gzip
+import os
+import threading
+
+import pandas as pd
+
+from optigrade.audit import CLOSED_SUFFIX, OPEN_SUFFIX, AuditLog, read_log, segments
+
+
+def test_records_round_trip_through_rotated_segments(tmp_path):
+    log = AuditLog(tmp_path, max_segment_bytes=2000, batch_size=50, flush_interval=0.05)
+    for i in range(600):
+        log.log_prediction("abc123", {"study_hours": float(i), "attendance": 80.0}, 3.0 + i / 1000, 1.5, session="s1")
+    assert log.flush()
+    log.close()
+
+    closed = segments(tmp_path)
+    assert len(closed) > 1 and all(path.endswith(CLOSED_SUFFIX) for path in closed)
+    records = read_log(tmp_path)
+    assert len(records) == 600 and log.written == 600
+    assert sorted(records["feature.study_hours"]) == [float(i) for i in range(600)]
+    assert set(records["model_version"]) == {"abc123"} and (records["latency_ms"] == 1.5).all()
+
+
+def test_log_never_blocks_when_the_queue_is_full(tmp_path):
+    log = AuditLog(tmp_path, queue_size=10, flush_interval=0.05)
+    release = threading.Event()
+    log._write = lambda batch: release.wait(10)  # a stalled disk
+    accepted = []
+    producer = threading.Thread(target=lambda: accepted.extend(log.log({"n": i}) for i in range(1000)))
+    producer.start()
+    # Every call returns while the writer is still stuck
+    producer.join(5)
+    assert not producer.is_alive() and not release.is_set()
+    release.set()
+    assert sum(accepted) < 1000 and log.dropped == 1000 - sum(accepted)
+
+
+def test_segments_left_open_by_a_dead_process_are_recovered(tmp_path):
+    log = AuditLog(tmp_path, flush_interval=0.05)
+    log.log({"prediction": 3.1})
+    assert log.flush()
+    open_segment = log._segment
+    assert open_segment.endswith(OPEN_SUFFIX) and not segments(tmp_path)
+    # Pretend the worker died: rename the open segment to an unused pid
+    orphan = open_segment.replace(f"-{os.getpid()}-", "-999999999-")
+    os.replace(open_segment, orphan)
+    log._segment = None
+
+    AuditLog(tmp_path, flush_interval=0.05).close()
+    assert len(read_log(tmp_path)) == 1
+
+
+def test_segments_from_a_previous_run_with_the_same_pid_are_closed(tmp_path):
+    # In a container the app is PID 1 after every restart, so a live PID proves nothing
+    log = AuditLog(tmp_path, flush_interval=0.05)
+    log.log({"prediction": 3.1})
+    assert log.flush()
+    log._stop.set()  # the old run "crashes" without closing its segment
+    log._thread.join()
+    assert f"-{os.getpid()}-" in log._segment and not segments(tmp_path)
+
+    AuditLog(tmp_path, flush_interval=0.05).close()
+    assert len(read_log(tmp_path)) == 1
+
+
+def test_a_torn_last_member_keeps_the_batches_before_it(tmp_path):
+    log = AuditLog(tmp_path, batch_size=10, flush_interval=0.05)
+    for i in range(100):
+        log.log({"n": i})
+    log.close()
+    path = segments(tmp_path)[0]
+    with open(path, "ab") as f:
+        torn = gzip.compress("".join(f'{{"n": {i}}}\n' for i in range(100, 1000)).encode())
+        f.write(torn[:len(torn) // 2])  # crash mid-write
+    assert read_log(tmp_path)["n"].tolist() == list(range(100))
+
+
+def test_export_reads_into_one_frame(tmp_path):
+    log = AuditLog(tmp_path, flush_interval=0.05)
+    log.log_prediction("v1", {"x": 1.0}, 3.2, 0.4)
+    log.close()
+    frame = read_log(tmp_path)
+    frame.to_parquet(tmp_path / "out.parquet")
+    assert pd.read_parquet(tmp_path / "out.parquet")["prediction"].tolist() == [3.2]
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from optigrade.batch_recommendations import GeminiHTTP, load_checkpoint, load_cohort, run_job
+from optigrade.cache import MemoryCache, make_key, set_cache
+from optigrade.llm_client import ResilientClient
+from optigrade.prompts import load_tiers, plan_request
+
+
+class StubGemini(BaseHTTPRequestHandler):
+    """Answers generateContent like Gemini; fails for prompts mentioning a blocked student"""
+    requests = []
+    blocked = set()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["contents"][0]["parts"][0]["text"]
+        StubGemini.requests.append((self.path, body["generationConfig"], prompt))
+        if any(f"CGPA: {cgpa}" in prompt for cgpa in StubGemini.blocked):
+            self.send_response(503)
+            self.end_headers()
+            return
+        ids = [line.split()[-1] for line in prompt.splitlines() if line.startswith("### Student ")]
+        text = "\n".join(f"### Student {i}\nStudy more, {i}." for i in ids) if ids else "Study more."
+        payload = json.dumps({"candidates": [{"content": {"parts": [{"text": text}]}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubGemini.requests, StubGemini.blocked = [], set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGemini)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def cohort(tmp_path):
+    path = tmp_path / "cohort.csv"
+    rows = ["student_id,current_cgpa,predicted_cgpa,courses,avg_grade,study_hours,attendance"]
+    rows += [f"S{i:03d},{2 + i / 100:.2f},3.1,MTH101:3;PHY102:2,65,10,80" for i in range(40)]
+    path.write_text("\n".join(rows))
+    return load_cohort(str(path))
+
+
+def run(students, url, store, checkpoint, **kwargs):
+    client = ResilientClient(max_concurrency=8, rate=1000, burst=1000, max_retries=1, base_delay=0)
+    llm = GeminiHTTP("gemini-2.5-flash", api_key="test", base_url=url)
+    return asyncio.run(run_job(students, llm, store, str(checkpoint), client=client, **kwargs))
+
+
+def test_job_stores_results_under_the_app_key(stub_url, cohort, tmp_path):
+    store = MemoryCache()
+    summary = run(cohort, stub_url, store, tmp_path / "ck.jsonl", concurrency=8)
+
+    assert summary == {"done": 40, "skipped": 0, "failed": []}
+    path, config, _ = StubGemini.requests[0]
+    assert path == "/v1beta/models/gemini-2.5-flash:generateContent" and "maxOutputTokens" in config
+    request = plan_request(cohort[0]["profile"], load_tiers(), "fast")
+    assert store.get(make_key("recommendations", request["model"], request["prompt"])) == "Study more."
+
+
+def test_packing_cuts_requests(stub_url, cohort, tmp_path):
+    store = MemoryCache()
+    summary = run(cohort, stub_url, store, tmp_path / "ck.jsonl", pack_size=5)
+    assert summary["done"] == 40 and len(StubGemini.requests) == 8
+    request = plan_request(cohort[7]["profile"], load_tiers(), "fast")
+    assert store.get(make_key("recommendations", request["model"], request["prompt"])) == "Study more, S007."
+
+
+def test_resumes_from_checkpoint_after_failures(stub_url, cohort, tmp_path):
+    checkpoint = tmp_path / "ck.jsonl"
+    StubGemini.blocked = {"2.05", "2.30"}
+    first = run(cohort, stub_url, MemoryCache(), checkpoint)
+    assert first["done"] == 38 and sorted(sid for sid, _ in first["failed"]) == ["S005", "S030"]
+
+    StubGemini.blocked = set()
+    StubGemini.requests.clear()
+    second = run(cohort, stub_url, MemoryCache(), checkpoint)
+    assert second == {"done": 2, "skipped": 38, "failed": []}
+    assert len(StubGemini.requests) == 2
+    assert len(load_checkpoint(str(checkpoint))) == 40
+
+
+def test_over_budget_student_fails_alone_in_a_pack(stub_url, cohort, tmp_path):
+    students = cohort[:5] + [{"student_id": "HUGE", "profile": "Current courses: " + "MTH101, " * 20000}]
+    summary = run(students, stub_url, MemoryCache(), tmp_path / "ck.jsonl", pack_size=3)
+    assert summary["done"] == 5 and [sid for sid, _ in summary["failed"]] == ["HUGE"]
+
+
+def test_results_page_finds_the_precomputed_advice_by_student_id(stub_url, cohort, tmp_path, monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    store = MemoryCache()
+    run(cohort, stub_url, store, tmp_path / "ck.jsonl", pack_size=5)
+
+    # The student types their own details, which never reproduce the cohort row's prompt
+    monkeypatch.setenv("OPTIGRADE_AUDIT_DIR", "")
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    previous = set_cache(store)
+    try:
+        at = AppTest.from_file("../optigrade_app.py", default_timeout=120)
+        at.session_state.onboarded = True
+        at.session_state.page = "Results"
+        at.session_state.user_id = "S007"
+        at.session_state.prev_data = [{"course_id": "MTH101", "grade": 65, "study_hours": 10, "attendance": 80,
+                                       "course_units": 3, "semester_gpa": 3.5, "course_difficulty": 3,
+                                       "learning_style": "Visual"}]
+        at.session_state.curr_data = [{"course_id": "PHY102", "course_units": 2, "learning_style": "Visual"}]
+        at.run()
+    finally:
+        set_cache(previous)
+    assert any("Study more, S007." in m.value for m in at.markdown)
@@ -0,0 +1,91 @@
+import multiprocessing
+import time
+
+import numpy as np
+import pytest
+
+from optigrade.cache import DiskCache, MemoryCache, create_cache, get_cache, make_key, set_cache
+from optigrade.whatif import cached_partial_dependence
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path):
+    return MemoryCache(max_items=3) if request.param == "memory" else DiskCache(str(tmp_path / "c.sqlite"))
+
+
+def test_backend_round_trip(cache):
+    cache.set("a", {"phi": np.arange(3.0)})
+    assert np.array_equal(cache.get("a")["phi"], np.arange(3.0))
+    assert cache.get("missing", "default") == "default"
+
+    cache.set_many({"b": 1, "c": None})
+    assert cache.get_many(["a", "b", "c", "zz"]).keys() == {"a", "b", "c"}
+
+    calls = []
+    assert cache.get_or_set("d", lambda: calls.append(1) or 42) == 42
+    assert cache.get_or_set("d", lambda: calls.append(1) or 43) == 42
+    assert calls == [1]
+
+    cache.delete("d")
+    assert cache.get("d") is None
+    cache.clear()
+    assert cache.get_many(["a", "b", "c"]) == {}
+
+
+def test_ttl_expiry(cache):
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2, ttl=60)
+    time.sleep(0.1)
+    assert cache.get("short") is None and cache.get("long") == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1
+
+
+def _write_from_other_process(path):
+    DiskCache(path).set(make_key("curves", "v1", (1.0, 2.0)), "from another worker")
+
+
+def test_disk_cache_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    worker = multiprocessing.get_context("spawn").Process(target=_write_from_other_process, args=(path,))
+    worker.start()
+    worker.join(30)
+    assert DiskCache(path).get(make_key("curves", "v1", (1.0, 2.0))) == "from another worker"
+
+
+def test_cached_results_go_through_the_configured_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPTIGRADE_CACHE_BACKEND", "disk")
+    monkeypatch.setenv("OPTIGRADE_CACHE_PATH", str(tmp_path / "app.sqlite"))
+    previous = set_cache(create_cache())
+    try:
+        assert isinstance(get_cache(), DiskCache)
+
+        class Model:
+            calls = 0
+
+            def predict(self, X):
+                Model.calls += 1
+                return X.sum(axis=1).to_numpy()
+
+        first = cached_partial_dependence(Model(), "v-disk", {"study_hours": 10})
+        again = cached_partial_dependence(Model(), "v-disk", {"study_hours": 10})
+        assert Model.calls == 1
+        assert first[0] == again[0] and first[1].equals(again[1])
+    finally:
+        set_cache(previous)
+
+
+def test_keys_depend_on_values_not_object_identity():
+    a, b = "".join(["mo", "del"]), "".join(["mod", "el"])
+    assert a == b and a is not b
+    assert make_key("k", (a, a)) == make_key("k", (a, b))
+    assert make_key("k", {"x": 1, "y": 2}) == make_key("k", {"y": 2, "x": 1})
+    assert make_key("k", np.array([1.5, 2.0]), np.float64(3.0)) == make_key("k", [1.5, 2.0], 3.0)
+    assert make_key("k", [1.5, 2.0]) != make_key("k", [1.5, 2.5])
@@ -0,0 +1,77 @@
+import pytest
+
+from optigrade.catalog import CourseCatalog, load_course_catalog, normalize_code, render_course_cards
+
+COURSES = [
+    {"code": "MAT101", "title": "Elementary Mathematics I", "units": 3, "difficulty": 4},
+    {"code": "MAT102", "title": "Elementary Mathematics II", "units": 3, "prerequisites": "MAT101"},
+    {"code": "PHY101", "title": "General Physics I", "units": 3},
+    {"code": "PHY106", "title": "General Physics II", "units": 3, "prerequisites": "PHY101;MAT101"},
+    {"code": "PHY201", "title": "Classical Mechanics", "units": 3, "prerequisites": "PHY106;MAT102"},
+    {"code": "CHM101", "title": "General Chemistry I", "units": 4},
+]
+
+
+def test_lookup_and_typeahead():
+    catalog = CourseCatalog(COURSES)
+    assert normalize_code(" mat-101 ") == "MAT101"
+    assert catalog.get("mat 101")["difficulty"] == 4 and "phy106" in catalog and catalog.get("XYZ999") is None
+
+    assert [c["code"] for c in catalog.search("PHY1")] == ["PHY101", "PHY106"]
+    assert [c["code"] for c in catalog.search("gen phy")] == ["PHY101", "PHY106"]
+    assert [c["code"] for c in catalog.search("mech")] == ["PHY201"]
+    assert len(catalog.search("general", limit=2)) == 2 and catalog.search("  ") == []
+
+
+def test_eligibility_and_study_order():
+    catalog = CourseCatalog(COURSES)
+    assert [c["code"] for c in catalog.eligible([])] == ["CHM101", "MAT101", "PHY101"]
+    assert [c["code"] for c in catalog.eligible(["MAT101", "PHY101"])] == ["CHM101", "MAT102", "PHY106"]
+    assert catalog.missing_prerequisites("PHY106", ["PHY101"]) == ["MAT101"]
+
+    plan = catalog.study_order(["PHY201"], completed=["MAT101"])
+    assert [(c["code"], c["term"]) for c in plan] == [("PHY101", 1), ("MAT102", 1), ("PHY106", 2), ("PHY201", 3)]
+    assert catalog.study_order(["PHY101"], completed=["PHY101"]) == []
+    with pytest.raises(KeyError):
+        catalog.study_order(["XYZ999"])
+
+
+def test_bad_graphs_are_rejected():
+    with pytest.raises(ValueError, match="not in the catalog"):
+        CourseCatalog([{"code": "A101", "title": "A", "units": 1, "prerequisites": "B101"}])
+    with pytest.raises(ValueError, match="cycle among A101, B101"):
+        CourseCatalog([{"code": "A101", "title": "A", "units": 1, "prerequisites": "B101"},
+                       {"code": "B101", "title": "B", "units": 1, "prerequisites": "A101"},
+                       {"code": "C101", "title": "C", "units": 1}])
+
+
+def test_shipped_catalog_uses_historical_difficulty(tmp_path):
+    catalog = load_course_catalog()
+    assert catalog.get("CHM101")["students"] == 7 and catalog.get("CHM101")["difficulty"] != 3
+    assert catalog.get("MAT201")["students"] == 0 and catalog.get("MAT201")["difficulty"] == 5
+
+    bad = tmp_path / "catalog.csv"
+    bad.write_text("code,title,units\nMAT101,Maths,9\n")
+    with pytest.raises(ValueError, match="row 2: units must be between 1 and 6"):
+        load_course_catalog(str(bad))
+
+
+def test_university_sized_catalog_is_indexed(counting_list):
+    # 40 departments x 1000 courses, each course requiring up to two earlier ones in its department
+    courses = [{"code": f"DP{d:02d}{i:03d}", "title": f"Topic {i} of department {d}", "units": 3,
+                "prerequisites": [f"DP{d:02d}{j:03d}" for j in (i - 1, i // 2) if 0 <= j < i]}
+               for d in range(40) for i in range(1000)]
+    catalog = CourseCatalog(courses)
+    assert len(catalog) == 40000 and max(catalog.level.values()) == 999
+
+    # Lookups are dict hits and a code search bisects the sorted codes, then reads one page
+    catalog.codes = counting_list(catalog.codes)
+    for i in range(1000):
+        assert catalog.get(f"dp{i % 40:02d}{i:03d}")["code"] == f"DP{i % 40:02d}{i:03d}"
+        assert len(catalog.search(f"DP{i % 40:02d}{i % 10}")) == 10
+    assert catalog.codes.reads <= 1000 * (len(catalog.codes).bit_length() + 1)
+    assert len(catalog.study_order(["DP07999"])) == 1000
+
+    cards = render_course_cards([{"code": "X101", "title": "<i>x</i>", "units": 2, "difficulty": None}], "Blocked",
+                                ["needs Y101"])
+    assert "&lt;i&gt;" in cards and "not rated" in cards and "needs Y101" in cards
@@ -0,0 +1,69 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from optigrade.course_load import DIFFICULTY_PENALTY, NEUTRAL_DIFFICULTY, optimize_load, score_loads
+from optigrade.prediction import DEFAULT_FEATURES
+
+PROFILE = {'GPA_last_semester': 3.4, 'current_CGPA': 3.4, 'study_hours': 15, 'attendance': 80,
+           'engagement': 80, 'midterm_score': 75}
+
+
+def peaks_at_18(X):
+    """Predicted CGPA is highest at an 18-unit load"""
+    return 3.5 - 0.02 * (X['credit_load'].to_numpy() - 18) ** 2
+
+
+def candidates(n, rng):
+    return [{'code': f'C{i:03d}', 'units': int(rng.integers(1, 5)),
+             'difficulty': None if i % 7 == 0 else float(rng.uniform(1, 5))} for i in range(n)]
+
+
+def brute_force(model, courses, min_units, max_units, required=(), objective='cgpa'):
+    table = score_loads(model, PROFILE, range(min_units, max_units + 1))
+    column = 'predicted' if objective == 'cgpa' else 'lower'
+    best = -np.inf
+    optional = [c for c in courses if c['code'] not in required]
+    for r in range(len(optional) + 1):
+        for subset in itertools.combinations(optional, r):
+            chosen = [c for c in courses if c['code'] in required] + list(subset)
+            total = sum(c['units'] for c in chosen)
+            if chosen and min_units <= total <= max_units:
+                weighted = sum(c['units'] * (NEUTRAL_DIFFICULTY if c['difficulty'] is None else c['difficulty'])
+                               for c in chosen)
+                best = max(best, table.at[total, column] - DIFFICULTY_PENALTY * (weighted / total - NEUTRAL_DIFFICULTY))
+    return best
+
+
+def test_matches_exhaustive_search(counting_model):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.uniform(0, 1, (200, 7)) * [5, 30, 5, 40, 100, 100, 100], columns=DEFAULT_FEATURES)
+    forest = RandomForestRegressor(n_estimators=20, random_state=0).fit(X, X['current_CGPA'] - (X['credit_load'] - 18) ** 2 / 100)
+    for seed, model, objective in [(1, counting_model(peaks_at_18), 'cgpa'), (2, forest, 'cgpa'), (3, forest, 'risk')]:
+        courses = candidates(12, np.random.default_rng(seed))
+        result = optimize_load(model, PROFILE, courses, 10, 20, required=['C001'], objective=objective)
+        assert 'C001' in result['courses'] and 10 <= result['units'] <= 20
+        assert np.isclose(result['score'], brute_force(model, courses, 10, 20, ['C001'], objective))
+
+
+def test_prefers_the_best_load_and_easier_courses(counting_model):
+    model = counting_model(peaks_at_18)
+    courses = [{'code': 'HARD', 'units': 3, 'difficulty': 5}, {'code': 'EASY', 'units': 3, 'difficulty': 1}] + \
+              [{'code': f'MID{i}', 'units': 3, 'difficulty': 3} for i in range(5)]
+    result = optimize_load(model, PROFILE, courses, 15, 24)
+    assert result['units'] == 18 and 'EASY' in result['courses'] and 'HARD' not in result['courses']
+    assert model.calls == 1 and list(result['table'].index) == list(range(15, 25))
+
+    assert optimize_load(model, PROFILE, courses, 30, 40) is None
+    assert optimize_load(model, PROFILE, courses, 15, 24, required=[c['code'] for c in courses[:3]] * 3)['units'] == 18
+
+
+def test_large_candidate_list_is_interactive(counting_model):
+    model = counting_model(peaks_at_18)
+    started = time.perf_counter()
+    result = optimize_load(model, PROFILE, candidates(60, np.random.default_rng(4)), 15, 24)
+    assert time.perf_counter() - started < 2
+    assert model.calls == 1 and result['units'] == 18
@@ -0,0 +1,98 @@
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+
+from optigrade.drift import PREDICTION, DriftMonitor, build_baseline, ks, load_baseline, psi, save_baseline
+
+
+def make_monitor(rng):
+    training = pd.DataFrame({"study_hours": rng.normal(15, 4, 5000), "attendance": rng.uniform(50, 100, 5000)})
+    return DriftMonitor(build_baseline(training, ["study_hours", "attendance"], rng.normal(3.4, 0.4, 5000)))
+
+
+def test_same_distribution_is_stable_and_shift_alerts():
+    rng = np.random.default_rng(0)
+    monitor = make_monitor(rng)
+    for hours, attendance, cgpa in zip(rng.normal(15, 4, 2000), rng.uniform(50, 100, 2000), rng.normal(3.4, 0.4, 2000)):
+        monitor.observe({"study_hours": hours, "attendance": attendance}, cgpa)
+    report = monitor.report()["features"]
+    assert all(f["status"] == "ok" and f["n"] == 2000 for f in report.values())
+
+    monitor.reset()
+    monitor.observe_many(pd.DataFrame({"study_hours": rng.normal(25, 4, 2000), "attendance": rng.uniform(50, 100, 2000)}),
+                         rng.normal(3.4, 0.4, 2000))
+    report = monitor.report()["features"]
+    assert report["study_hours"]["status"] == "alert" and report["study_hours"]["outside_training_range"]
+    assert report["study_hours"]["ks"] > 0.5
+    assert report["attendance"]["status"] == "ok"
+    assert monitor.report_frame().index[0] == "study_hours"
+
+
+def test_streaming_and_batch_updates_agree():
+    rng = np.random.default_rng(1)
+    one, batch = make_monitor(rng), make_monitor(np.random.default_rng(1))
+    rows = pd.DataFrame({"study_hours": rng.normal(18, 5, 500), "attendance": [np.nan] * 10 + list(rng.uniform(40, 100, 490))})
+    predictions = rng.normal(3.2, 0.5, 500)
+    for row, prediction in zip(rows.to_dict("records"), predictions):
+        one.observe(row, prediction)
+    batch.observe_many(rows, predictions)
+    a, b = one.report()["features"], batch.report()["features"]
+    for name in a:
+        assert a[name]["psi"] == b[name]["psi"] and a[name]["missing"] == b[name]["missing"]
+        assert np.isclose(a[name]["mean"], b[name]["mean"])
+    assert a["attendance"]["missing"] == 10
+
+
+def test_memory_is_fixed_and_observe_is_a_bisect_per_feature(counting_list):
+    monitor = make_monitor(np.random.default_rng(2))
+    sizes = {name: len(h.counts) for name, h in monitor._histograms.items()}
+    for histogram in monitor._histograms.values():
+        histogram.cuts = counting_list(histogram.cuts)
+    row = {"study_hours": 14.0, "attendance": 80.0}
+    for _ in range(20000):
+        monitor.observe(row, 3.5)
+    assert {name: len(h.counts) for name, h in monitor._histograms.items()} == sizes
+    assert sizes[PREDICTION] <= 10
+    # No raw values are kept, and each observation reads O(log bins) cut points
+    for histogram in monitor._histograms.values():
+        assert histogram.n == 20000
+        assert histogram.cuts.reads <= 20000 * (len(histogram.cuts).bit_length() + 1)
+
+
+def test_concurrent_observers_lose_nothing():
+    monitor = make_monitor(np.random.default_rng(3))
+
+    def worker():
+        for _ in range(2000):
+            monitor.observe({"study_hours": 15.0, "attendance": 75.0}, 3.4)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert monitor.report()["features"]["study_hours"]["n"] == 8000
+
+
+def test_baseline_round_trip_and_statistics(tmp_path):
+    baseline = build_baseline(pd.DataFrame({"x": [1.0, 2.0, 3.0, 4.0]}), ["x"], bins=2)
+    path = tmp_path / "baseline.json"
+    save_baseline(baseline, path)
+    assert load_baseline(path) == json.loads(path.read_text())
+    assert load_baseline(tmp_path / "missing.json") is None
+    assert psi([0.5, 0.5], [0.5, 0.5]) == 0
+    assert ks([0.5, 0.5], [1.0, 0.0]) == 0.5
+
+
+def test_constant_baseline_alerts_on_values_outside_it():
+    # As in the shipped training data, where attendance/engagement/midterm_score are all 0
+    training = pd.DataFrame({"attendance": np.zeros(10)})
+    monitor = DriftMonitor(build_baseline(training, ["attendance"]))
+    monitor.observe_many(pd.DataFrame({"attendance": np.zeros(40)}))
+    assert monitor.report()["features"]["attendance"]["status"] == "ok"
+
+    monitor.observe_many(pd.DataFrame({"attendance": np.full(40, 80.0)}))
+    report = monitor.report()["features"]["attendance"]
+    assert report["psi"] == 0 and report["single_bin_baseline"] and report["status"] == "alert"
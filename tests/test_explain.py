@@ -0,0 +1,75 @@
+import itertools
+import math
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from optigrade.explain import cached_explain, explain
+
+FEATURES = ['a', 'b', 'c', 'd']
+
+
+def _expected_value(tree, x, subset, node=0):
+    """Conditional expectation E[f(x) | x_S] by cover-weighted tree traversal"""
+    if tree.children_left[node] == -1:
+        return tree.value[node].ravel()[0]
+    left, right = tree.children_left[node], tree.children_right[node]
+    if tree.feature[node] in subset:
+        child = left if np.float32(x[tree.feature[node]]) <= tree.threshold[node] else right
+        return _expected_value(tree, x, subset, child)
+    cover = tree.weighted_n_node_samples
+    return (cover[left] * _expected_value(tree, x, subset, left)
+            + cover[right] * _expected_value(tree, x, subset, right)) / cover[node]
+
+
+def _brute_force_shap(model, x):
+    n = len(x)
+    phi = np.zeros(n)
+    for tree in (est.tree_ for est in model.estimators_):
+        for i in range(n):
+            others = [j for j in range(n) if j != i]
+            for size in range(n):
+                for subset in itertools.combinations(others, size):
+                    weight = math.factorial(size) * math.factorial(n - size - 1) / math.factorial(n)
+                    gain = _expected_value(tree, x, set(subset) | {i}) - _expected_value(tree, x, set(subset))
+                    phi[i] += weight * gain / len(model.estimators_)
+    return phi
+
+
+@pytest.fixture(scope="module")
+def forest():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    y = X[:, 0] * 2 + np.where(X[:, 1] > 0, X[:, 2], -X[:, 2]) + rng.normal(scale=0.1, size=200)
+    return RandomForestRegressor(n_estimators=5, max_depth=5, random_state=0).fit(X, y), X
+
+
+def test_matches_brute_force_shapley_values(forest):
+    model, X = forest
+    _, phi = explain(model, X[:3], FEATURES)
+    for row, row_phi in zip(X[:3], phi):
+        assert np.allclose(row_phi, _brute_force_shap(model, row), atol=1e-8)
+
+
+def test_batch_is_additive(forest):
+    model, X = forest
+    expected, phi = explain(model, X, FEATURES)
+    assert np.allclose(expected + phi.sum(axis=1), model.predict(X), atol=1e-6)
+
+
+def test_cache_reuses_rows(forest):
+    model, X = forest
+    expected, phi = cached_explain(model, 'test-forest', X[:10], FEATURES)
+    again_expected, again = cached_explain(model, 'test-forest', X[5:15], FEATURES)
+    assert again_expected == expected
+    assert np.array_equal(again[:5], phi[5:])
+
+
+def test_xgboost_uses_native_tree_shap():
+    xgb = pytest.importorskip("xgboost")
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(100, 4))
+    model = xgb.XGBRegressor(n_estimators=10, max_depth=3).fit(X, X[:, 0] - X[:, 3])
+    expected, phi = explain(model, X, FEATURES)
+    assert np.allclose(expected + phi.sum(axis=1), model.predict(X), atol=1e-4)
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from optigrade.feedback import DEFAULT_TIP, cohort_feedback, generate_feedback, resource_markdown
+
+
+def reference_feedback(predicted_cgpa, features):
+    """The original per-student if-chain"""
+    if predicted_cgpa >= 3.7:
+        feedback = "🌟"
+    elif predicted_cgpa >= 3.0:
+        feedback = "👍"
+    elif predicted_cgpa >= 2.5:
+        feedback = "🛠️"
+    else:
+        feedback = "🚧"
+    checks = [("Attendance %", 70, "📅"), ("Study Hours per Week", 15, "⏱️"), ("Assignments Completed", 80, "📝"),
+              ("Midterm Score", 60, "📚"), ("Lecture Engagement", 70, "💬")]
+    tips = [icon for column, limit, icon in checks if features.get(column, 0) < limit] or ["🎯"]
+    return feedback, tips
+
+
+def test_cohort_matches_the_per_student_rules():
+    rng = np.random.default_rng(0)
+    cohort = pd.DataFrame({
+        "predicted_cgpa": rng.uniform(1.5, 5.0, 2000),
+        "Attendance %": rng.uniform(40, 100, 2000),
+        "Study Hours per Week": rng.uniform(0, 30, 2000),
+        "Assignments Completed": rng.uniform(50, 100, 2000),
+        "Midterm Score": rng.uniform(30, 100, 2000),
+        "Lecture Engagement": rng.uniform(40, 100, 2000)
+    })
+    result = cohort_feedback(cohort)
+
+    for i in rng.choice(2000, 100, replace=False):
+        row = cohort.iloc[i].to_dict()
+        feedback, tips = reference_feedback(row.pop("predicted_cgpa"), row)
+        assert result["feedback"].iloc[i].startswith(feedback)
+        assert [tip.split()[0] for tip in result["tips"].iloc[i]] == tips
+
+
+def test_single_student_wrapper_and_resources():
+    feedback, tips = generate_feedback(3.9, {"Attendance %": 95, "Study Hours per Week": 20,
+                                             "Assignments Completed": 90, "Midterm Score": 80,
+                                             "Lecture Engagement": 85})
+    assert feedback.startswith("🌟") and tips == [DEFAULT_TIP]
+
+    # Missing inputs count as 0, like the old dict.get(..., 0)
+    _, tips = generate_feedback(2.0, {})
+    assert len(tips) == 5
+
+    groups = cohort_feedback(pd.DataFrame([{"predicted_cgpa": 3.0, "Study Hours per Week": 5,
+                                            "Attendance %": 90, "Lecture Engagement": 50}]))["resource_groups"][0]
+    assert groups == ["Study Habits & Techniques", "Lecture Engagement", "General Academic Improvement"]
+    blocks = resource_markdown(groups)
+    assert blocks[0].startswith("**Study Habits & Techniques:**") and "Khan Academy" in blocks[-1]
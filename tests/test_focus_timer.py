@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from optigrade.focus_timer import apply_timer_event, timer_remaining
+
+
+def session():
+    """The focus-timer keys the app initialises in st.session_state"""
+    return SimpleNamespace(study_timer_active=False, study_timer_start=None, study_timer_duration=1500,
+                           study_timer_remaining=1500, pomodoro_count=0, focus_sessions=[], focus_timer_nonce=None)
+
+
+def test_start_then_stop_records_the_focused_time():
+    state = session()
+    assert apply_timer_event(state, {"event": "start", "duration": 1500, "nonce": "a"}, now=1000.0) == "start"
+    assert state.study_timer_active and state.study_timer_duration == 1500
+    assert timer_remaining(state, now=1600.0) == 900
+
+    assert apply_timer_event(state, {"event": "stop", "nonce": "b"}, now=1600.0) == "stop"
+    assert not state.study_timer_active and state.study_timer_remaining == 900 and state.pomodoro_count == 1
+    (row,) = state.focus_sessions
+    assert row["Planned (min)"] == 25 and row["Focused (min)"] == 10.0 and row["Completed"] is False
+
+
+def test_complete_counts_the_full_session():
+    state = session()
+    apply_timer_event(state, {"event": "start", "duration": 3000, "nonce": "a"}, now=0.0)
+    apply_timer_event(state, {"event": "complete", "nonce": "b"}, now=2990.0)
+    assert state.study_timer_remaining == 0 and state.pomodoro_count == 1
+    assert state.focus_sessions[0]["Focused (min)"] == 50.0 and state.focus_sessions[0]["Completed"] is True
+
+
+def test_a_replayed_event_is_applied_once():
+    # The component returns its last event on every rerun
+    state = session()
+    start, stop = {"event": "start", "duration": 1500, "nonce": "a"}, {"event": "stop", "nonce": "b"}
+    apply_timer_event(state, start, now=0.0)
+    apply_timer_event(state, stop, now=60.0)
+    assert apply_timer_event(state, stop, now=120.0) is None
+    assert state.pomodoro_count == 1 and len(state.focus_sessions) == 1
+    assert apply_timer_event(state, None) is None
+
+
+def test_stop_without_an_active_session_records_nothing():
+    state = session()
+    assert apply_timer_event(state, {"event": "stop", "nonce": "a"}, now=0.0) == "stop"
+    assert state.pomodoro_count == 0 and not state.focus_sessions
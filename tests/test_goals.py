@@ -0,0 +1,65 @@
+from datetime import date
+
+from optigrade.goals import GoalStore
+
+
+def test_active_goals_come_out_in_due_date_order():
+    store = GoalStore()
+    late = store.add("Essay", due="2025-09-01", priority="Low")
+    soon = store.add("Quiz", due="2025-08-01", priority="Low")
+    urgent = store.add("Lab report", due="2025-08-01", priority="High")
+    store.add("Read ahead")  # no due date sorts last
+
+    assert [g["id"] for g in store.active()][:3] == [urgent, soon, late]
+    assert store.active()[-1]["due"] is None
+    assert store.next_due()["id"] == urgent
+    assert GoalStore.days_left(store.goals[soon], today=date(2025, 7, 25)) == 7
+    assert GoalStore.days_left(store.goals[soon], today=date(2025, 8, 3)) == -2
+
+
+def test_counters_follow_complete_and_remove():
+    store = GoalStore()
+    ids = [store.add(f"Goal {i}", due=f"2025-08-{i + 1:02d}", priority=p)
+           for i, p in enumerate(["High", "High", "Medium", "Low"])]
+    store.complete(ids[0])
+    store.complete(ids[0])  # idempotent
+    store.remove(ids[2])
+
+    assert store.total == 3 and store.completed_count == 1
+    assert store.priority_counts == {"High": 1, "Medium": 0, "Low": 1}
+    assert [g["id"] for g in store.active()] == [ids[1], ids[3]]
+    assert [g["id"] for g in store.active(limit=1)] == [ids[1]]
+    assert store.next_due()["id"] == ids[1]
+    assert [g["title"] for g in store.completed()] == ["Goal 0"]
+
+
+def test_bulk_import_export_round_trip():
+    records = [{"title": f"Task {i}", "description": "", "due": f"2025-{1 + i % 12:02d}-15",
+                "priority": ["Low", "Medium", "High"][i % 3], "completed": i % 4 == 0}
+               for i in range(300)]
+    store = GoalStore(records)
+
+    assert store.export_records() == records
+    assert store.completed_count == 75 and store.status_counts["active"] == 225
+    assert GoalStore.from_json(store.to_json()).export_records() == records
+    dues = [g["due_ordinal"] for g in store.active()]
+    assert dues == sorted(dues)
+
+
+def test_failed_import_leaves_the_store_unchanged():
+    store = GoalStore([{"title": "Existing", "due": "2025-08-01"}])
+    for bad in ([{"title": "Ok"}, {"description": "no title"}], [{"title": "Ok"}, {"title": "Bad", "due": "soon"}],
+                [{"title": "Ok"}, "not a goal"]):
+        try:
+            store.import_records(bad)
+        except (KeyError, ValueError, TypeError):
+            pass
+        else:
+            raise AssertionError("import should fail")
+    assert len(store) == 1 and store.status_counts["active"] == 1
+    assert [g["title"] for g in store.active()] == ["Existing"]
+
+    # CSV cells arrive as strings
+    store.import_records([{"title": "Read", "due": "", "priority": "", "completed": "False"},
+                          {"title": "Quiz", "due": "2025-08-02", "priority": "High", "completed": "True"}])
+    assert [g["title"] for g in store.active()] == ["Existing", "Read"] and store.completed_count == 1
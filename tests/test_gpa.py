@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from optigrade.gpa import SCALES, combine_cgpa, cumulative_cgpa, get_scale, gpa, grade_points, letter_grades, semester_gpas
+
+
+def test_scales_map_scores_to_letters_and_points():
+    scores = [100, 70, 69, 60, 50, 45, 44, 40, 39]
+    assert list(letter_grades(scores, SCALES["5-point"])) == ["A", "A", "B", "B", "C", "D", "E", "E", "F"]
+    assert list(grade_points(scores, SCALES["5-point"])) == [5, 5, 4, 4, 3, 2, 1, 1, 0]
+    assert list(grade_points(scores, SCALES["4-point"])) == [4, 4, 3, 3, 2, 1, 0, 0, 0]
+    assert list(letter_grades([95, 91, 88, 55], SCALES["4-point-us"])) == ["A", "A-", "B+", "F"]
+    assert np.isnan(grade_points([np.nan])[0])
+
+
+def test_scale_comes_from_the_environment():
+    assert get_scale(env={"OPTIGRADE_GRADING_SCALE": "4-point"}) is SCALES["4-point"]
+    assert get_scale(env={}) is SCALES["5-point"]
+    with pytest.raises(ValueError):
+        get_scale("7-point")
+
+
+def test_gpa_is_unit_weighted_and_skips_ungraded_courses():
+    # A (5) x 3 units, C (3) x 1 unit, ungraded 4-unit course ignored
+    assert gpa([75, 52, None], [3, 1, 4]) == pytest.approx(4.5)
+    assert np.isnan(gpa([None], [3]))
+    assert combine_cgpa(4.0, 30, 5.0, 10) == pytest.approx(4.25)
+
+
+def test_cohort_semester_and_cumulative():
+    records = pd.DataFrame({
+        "user_id": ["u1", "u1", "u1", "u2", "u2"],
+        "semester": ["previous", "previous", "current", "previous", "current"],
+        "grade": [75, 52, 64, 30, np.nan],
+        "course_units": [3, 1, 2, 2, 3]
+    })
+    semesters = semester_gpas(records).set_index(["user_id", "semester"])["gpa"]
+    assert semesters[("u1", "previous")] == pytest.approx(4.5)
+    assert semesters[("u1", "current")] == pytest.approx(4.0)
+    assert np.isnan(semesters[("u2", "current")])
+
+    cgpa = cumulative_cgpa(records).set_index("user_id")
+    assert cgpa.loc["u1", "cgpa"] == pytest.approx((15 + 3 + 8) / 6)
+    assert cgpa.loc["u2", "cgpa"] == 0
+
+    prior = pd.DataFrame({"cgpa": [4.0], "units": [20]}, index=["u2"])
+    assert cumulative_cgpa(records, prior=prior).set_index("user_id").loc["u2", "cgpa"] == pytest.approx(80 / 22)
+
+
+def test_registrar_scale_recomputation_is_fast():
+    rng = np.random.default_rng(0)
+    n = 1_000_000
+    records = pd.DataFrame({"user_id": rng.integers(0, 100_000, n), "semester": rng.integers(0, 8, n),
+                            "grade": rng.integers(0, 101, n), "course_units": rng.integers(1, 5, n)})
+    started = time.perf_counter()
+    cgpa = cumulative_cgpa(records)
+    semester_gpas(records)
+    assert time.perf_counter() - started < 10
+    assert len(cgpa) == records["user_id"].nunique() and cgpa["cgpa"].between(0, 5).all()
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from optigrade.llm_client import CircuitBreaker, LLMUnavailable, ResilientClient, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class ServiceUnavailable(Exception):
+    pass
+
+
+def test_token_bucket_limits_rate_after_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert all(bucket.try_acquire() == 0 for _ in range(3))
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    assert bucket.acquire(timeout=0.1, sleep=clock.sleep) is False
+    assert bucket.acquire(timeout=1.0, sleep=clock.sleep) is True
+    assert clock.now == pytest.approx(0.5)
+
+
+def test_retries_with_backoff_then_succeeds():
+    sleeps = []
+    client = ResilientClient(max_retries=3, base_delay=0.1, sleep=sleeps.append)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ServiceUnavailable("503")
+        return "advice"
+
+    assert client.call(flaky) == "advice"
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 0.1 and 0 <= sleeps[1] <= 0.2
+    assert client.breaker.state == "closed"
+
+
+def test_breaker_opens_falls_back_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30, clock=clock)
+    client = ResilientClient(max_retries=1, base_delay=0, breaker=breaker, sleep=lambda s: None)
+    calls = []
+
+    def down():
+        calls.append(1)
+        raise ServiceUnavailable("quota exceeded")
+
+    for _ in range(2):
+        assert client.call_with_fallback(lambda: "tips", down) == ("tips", True)
+    assert breaker.state == "open" and len(calls) == 4
+
+    # Open circuit: no API call at all
+    assert client.call_with_fallback(lambda: "tips", down) == ("tips", True)
+    assert len(calls) == 4
+
+    clock.now += 30
+    assert breaker.state == "half-open"
+    assert client.call(lambda: "back") == "back"
+    assert breaker.state == "closed"
+
+
+def test_non_retryable_errors_fail_fast():
+    class InvalidArgument(Exception):
+        pass
+
+    attempts = []
+
+    def bad_request():
+        attempts.append(1)
+        raise InvalidArgument("bad prompt")
+
+    with pytest.raises(LLMUnavailable):
+        ResilientClient(max_retries=3, sleep=lambda s: None).call(bad_request)
+    assert len(attempts) == 1
+
+
+def test_timeout_and_bounded_concurrency():
+    release = threading.Event()
+    client = ResilientClient(max_concurrency=1, timeout=0.05, max_retries=0, queue_timeout=0.05)
+
+    with pytest.raises(LLMUnavailable, match="timed out"):
+        client.call(release.wait)
+    # The hung call still holds the only slot, so the next request is turned away quickly
+    started = time.monotonic()
+    with pytest.raises(LLMUnavailable, match="in flight"):
+        client.call(lambda: "never runs")
+    assert time.monotonic() - started < 1.0
+    assert client.breaker.failures == 1  # local rejections do not count as API failures
+
+    release.set()
+    time.sleep(0.05)
+    assert client.call(lambda: "ok") == "ok"
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from optigrade.model_comparison import available_candidates, compare, cross_validate, load_spec, measure_costs
+
+
+def test_specs_load_validated_rows_on_a_common_feature_set():
+    X, y, groups = load_spec("app")
+    assert groups is None and list(X.columns)[:4] == ['GPA_last_semester', 'credit_load', 'current_CGPA', 'study_hours']
+    assert len(X) == len(y) == 10 and not X.isna().any().any()
+
+    X, y, groups = load_spec("course_records")
+    assert 'course_difficulty' in X and len(X) == len(y) == len(groups) and y.between(0, 5).all()
+
+
+def test_cross_validation_ranks_a_real_signal_above_the_mean():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({'a': rng.uniform(0, 1, 80), 'b': rng.uniform(0, 1, 80)})
+    y = pd.Series(3 * X['a'] + rng.normal(0, 0.05, 80))
+    scores = cross_validate(['linear', 'mean_baseline'], X, y, folds=4, n_jobs=2)
+    assert scores.loc['linear', 'rmse'] < 0.1 < scores.loc['mean_baseline', 'rmse']
+    assert scores.loc['linear', 'r2'] > 0.95
+
+
+def test_grouped_folds_keep_each_students_rows_together():
+    # The target is a per-student value: any model that sees a student's other rows "predicts" it
+    rng = np.random.default_rng(1)
+    groups = pd.Series(np.repeat(np.arange(20), 5))
+    student = rng.uniform(0, 5, 20)
+    X = pd.DataFrame({'student_feature': student[groups], 'noise': rng.uniform(0, 1, 100)})
+    y = pd.Series(rng.uniform(0, 5, 20)[groups])
+    leaky = cross_validate(['random_forest'], X, y, folds=5, n_jobs=1)
+    grouped = cross_validate(['random_forest'], X, y, folds=5, n_jobs=1, groups=groups)
+    assert leaky.loc['random_forest', 'r2'] > 0.5 > 0 > grouped.loc['random_forest', 'r2']
+
+
+def test_costs_and_table():
+    X, y, _ = load_spec("app")
+    costs = measure_costs(['ridge', 'mean_baseline'], X, y, batch_rows=2000, repeats=5, isolate=False)
+    assert set(costs.columns) >= {'train_s', 'artifact_kb', 'fit_peak_mb', 'single_row_ms', 'batch_ms_per_1k'}
+    assert (costs['artifact_kb'] > 0).all() and (costs['single_row_ms'] > 0).all()
+
+    table = compare("app", ['ridge', 'mean_baseline'], folds=3, n_jobs=1, batch_rows=1000, repeats=3, isolate=False)
+    assert table.index[0] == 'ridge' and table['rmse_vs_best'].iloc[0] == 1.0
+    assert 'random_forest' in available_candidates()
@@ -0,0 +1,83 @@
+import json
+import threading
+import time
+
+import joblib
+import pytest
+from sklearn.dummy import DummyRegressor
+
+from optigrade.model_pool import DEFAULT_TENANT, ModelPool, UnknownTenant
+
+
+def make_registry(tmp_path, tenants, padding=0):
+    """A default model plus one per tenant; padding inflates each file to a known size"""
+    root = tmp_path / "tenants"
+    for tenant in [DEFAULT_TENANT] + tenants:
+        path = tmp_path / "model.pkl" if tenant == DEFAULT_TENANT else root / tenant / "model.pkl"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        model = DummyRegressor(constant=float(len(tenant)), strategy="constant").fit([[0]], [0])
+        joblib.dump({"model": model, "feature_names": ["x"], "padding": b"0" * padding}, path)
+    return root
+
+
+def test_lazy_load_and_lru_eviction_under_budget(tmp_path):
+    root = make_registry(tmp_path, ["unilag", "oau", "ui"], padding=100_000)
+    pool = ModelPool(root=str(root), default_path=str(tmp_path / "model.pkl"), budget_bytes=250_000)
+    assert pool.loaded() == []
+
+    assert pool.get("unilag")["model"].predict([[0]])[0] == 6
+    pool.get("oau")
+    pool.get("unilag")  # now most recently used
+    pool.get("ui")      # needs room: evicts oau, not unilag
+    assert pool.loaded() == ["unilag", "ui"]
+    assert pool.bytes_used <= pool.budget_bytes
+    assert pool.stats["evictions"] == 1 and pool.stats["hits"] == 1 and pool.stats["misses"] == 3
+
+
+def test_unknown_and_malformed_tenants(tmp_path):
+    root = make_registry(tmp_path, ["unilag"])
+    pool = ModelPool(root=str(root), default_path=str(tmp_path / "model.pkl"))
+    with pytest.raises(UnknownTenant):
+        pool.get("nowhere")
+    with pytest.raises(UnknownTenant):
+        pool.get("../model")
+    assert pool.get(DEFAULT_TENANT)["feature_names"] == ["x"]
+    assert pool.tenants() == [DEFAULT_TENANT, "unilag"]
+
+
+def test_concurrent_first_requests_load_once(tmp_path):
+    root = make_registry(tmp_path, ["unilag"])
+    loads = []
+
+    def slow_loader(path):
+        loads.append(path)
+        time.sleep(0.1)
+        return joblib.load(path)
+
+    pool = ModelPool(root=str(root), default_path=str(tmp_path / "model.pkl"), loader=slow_loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.get("unilag"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+
+
+def test_usage_is_saved_and_prewarms_the_busiest(tmp_path):
+    root = make_registry(tmp_path, ["unilag", "oau", "ui"])
+    (root / "oau" / "tenant.json").write_text(json.dumps({"grading_scale": "4-point"}))
+    usage = tmp_path / "usage.json"
+    pool = ModelPool(root=str(root), default_path=str(tmp_path / "model.pkl"), usage_path=str(usage))
+    for tenant, count in [("oau", 5), ("unilag", 3), ("ui", 1)]:
+        for _ in range(count):
+            pool.get(tenant, request=True)
+            pool.get(tenant)  # reruns look the model up again without counting a request
+    assert pool.usage == {"oau": 5, "unilag": 3, "ui": 1} and pool.stats["requests"] == 9
+    pool.save_usage()
+
+    fresh = ModelPool(root=str(root), default_path=str(tmp_path / "model.pkl"), usage_path=str(usage))
+    assert fresh.prewarm(limit=2) == ["oau", "unilag"]
+    assert fresh.loaded() == ["unilag", "oau"]  # busiest is most recently used
+    assert fresh.get("oau")["config"] == {"grading_scale": "4-point"}
+    assert fresh.stats["misses"] == 0
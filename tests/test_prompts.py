@@ -0,0 +1,30 @@
+from optigrade.prompts import (PROMPT_TOKEN_BUDGET, compact_profile, estimate_tokens, load_tiers,
+                               plan_request, select_tier)
+
+PREVIOUS = [{'course_id': f'MTH10{i}', 'grade': 60 + i, 'study_hours': 10, 'attendance': 80,
+             'learning_style': 'Visual', 'course_units': 3} for i in range(3)]
+
+
+def test_profile_is_compact_and_capped():
+    current = [{'course_id': f'PHY{100 + i}', 'course_units': 3} for i in range(200)]
+    profile = compact_profile(3.4, current, PREVIOUS, predicted_cgpa=3.55, token_budget=120)
+
+    assert 'CGPA: 3.40' in profile and 'Predicted next CGPA: 3.55' in profile
+    assert 'avg grade 61%' in profile and 'Learning style: Visual' in profile
+    assert 'PHY100(3u)' in profile and 'more' in profile
+    assert estimate_tokens(profile) <= 120
+    assert compact_profile(3.4, []).endswith('Current courses: none')
+
+
+def test_fast_tier_by_default_and_escalation_is_configurable():
+    tiers = load_tiers({})
+    assert select_tier(tiers, env={}) == 'fast'
+    assert select_tier(tiers, escalate=True, env={}) == 'pro'
+    assert select_tier(tiers, escalate=True, env={'OPTIGRADE_ALLOW_ESCALATION': 'false'}) == 'fast'
+
+    tiers = load_tiers({'OPTIGRADE_FAST_MODEL': 'gemini-2.5-flash-lite', 'OPTIGRADE_FAST_MAX_OUTPUT_TOKENS': '800'})
+    request = plan_request(compact_profile(3.4, [], PREVIOUS), tiers, 'fast')
+    assert request['model'] == 'gemini-2.5-flash-lite'
+    assert request['generation_config']['max_output_tokens'] == 800
+    assert request['prompt_tokens'] <= PROMPT_TOKEN_BUDGET
+    assert 'at most 250 words' in request['prompt']
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+from optigrade.batch_recommendations import run_job
+from optigrade.cache import MemoryCache
+from optigrade.llm_client import ResilientClient
+from optigrade.prompts import load_tiers, plan_request
+from optigrade.recommendation_buckets import (BackgroundPersonalizer, all_buckets, bucket_for, bucket_key,
+                                              nearest_recommendation, warm_students)
+
+
+class EchoLLM:
+    """Answers packed prompts section by section, counting requests"""
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, config):
+        self.calls += 1
+        ids = [line.split()[-1] for line in prompt.splitlines() if line.startswith("### Student ")]
+        return "\n".join(f"### Student {i}\nAdvice for {i}." for i in ids) if ids else "Advice."
+
+
+def test_bands_and_scales():
+    assert bucket_for(3.5, 85, 20) == (3, 3, 3)
+    assert bucket_for(3.49, 84.9, 19.9) == (2, 2, 2)
+    assert bucket_for(None, None, None) == (0, 0, 0)
+    # A 4-point CGPA is rescaled onto the 5-point degree classes
+    assert bucket_for(3.6, 90, 12, max_cgpa=4.0) == bucket_for(4.5, 90, 12)
+    assert len(all_buckets()) == 80
+
+
+def test_every_bucket_prompt_fits_each_tier():
+    tiers = load_tiers()
+    for tier in tiers:
+        keys = {bucket_key(b, tiers, tier) for b in all_buckets()}
+        assert len(keys) == 80
+        for student in warm_students():
+            plan_request(student["profile"], tiers, tier)
+
+
+def test_warmed_buckets_serve_the_nearest_profile(tmp_path):
+    tiers, store, llm = load_tiers(), MemoryCache(), EchoLLM()
+    students = warm_students()
+    result = asyncio.run(run_job(students, llm, store, str(tmp_path / "warm.jsonl"), tiers=tiers, pack_size=4,
+                                 client=ResilientClient(rate=1000, burst=100, max_retries=0)))
+    assert result["done"] == 80 and not result["failed"] and llm.calls == 20
+
+    text, bucket = nearest_recommendation(store, tiers, "fast", (2, 1, 3))
+    assert bucket == (2, 1, 3) and text == "Advice for cgpa2-attendance1-study_hours3."
+
+    # With the student's own bucket cold, a neighbour one band away is served instead
+    store.delete(bucket_key((2, 1, 3), tiers, "fast"))
+    text, bucket = nearest_recommendation(store, tiers, "fast", (2, 1, 3))
+    assert sum(abs(a - b) for a, b in zip(bucket, (2, 1, 3))) == 1
+    assert nearest_recommendation(MemoryCache(), tiers, "fast", (2, 1, 3)) == (None, None)
+
+
+def test_background_personalizer_runs_each_key_once():
+    store, release, calls = MemoryCache(), threading.Event(), []
+
+    def generate():
+        calls.append(1)
+        release.wait(5)
+        return "Personal advice."
+
+    personalizer = BackgroundPersonalizer(store)
+    first = personalizer.submit("k", generate, ttl=60)
+    assert personalizer.submit("k", generate) is None
+    release.set()
+    first.result(5)
+    assert store.get("k") == "Personal advice." and len(calls) == 1
+
+    # Failures are swallowed and the key can be retried
+    personalizer.submit("bad", lambda: 1 / 0).result(5)
+    assert store.get("bad") is None and personalizer.submit("bad", lambda: "ok").result(5) is None
+    assert store.get("bad") == "ok"
@@ -0,0 +1,28 @@
+from optigrade.rendering import (grades_to_letters, letters_to_colors, render_current_courses,
+                                 render_previous_courses)
+
+
+def test_vectorized_letters_use_the_app_cutoffs():
+    grades = [100, 70, 69, 60, 59, 50, 49, 45, 44, 40, 39, 0]
+    assert list(grades_to_letters(grades)) == ['A', 'A', 'B', 'B', 'C', 'C', 'D', 'D', 'E', 'E', 'F', 'F']
+    assert list(letters_to_colors(['A', 'F'])) == ['#4CAF50', '#B71C1C']
+
+
+def test_card_grid_is_one_escaped_string_cached_per_course_list():
+    courses = [{'course_id': f'MAT{100 + i}', 'course_units': 3, 'grade': 40 + i} for i in range(45)]
+    courses.append({'course_id': '<script>', 'course_units': 2, 'grade': 75})
+
+    grid = render_previous_courses(courses)
+    assert grid.count('Previous Course •') == len(courses)
+    assert '<script>' not in grid and '&lt;script&gt;' in grid
+    assert render_previous_courses([dict(c) for c in courses]) is grid
+
+    changed = courses[:-1] + [{'course_id': 'PHY101', 'course_units': 2, 'grade': 75}]
+    assert render_previous_courses(changed) is not grid
+
+
+def test_current_course_progress_is_stable_between_reruns():
+    courses = [{'course_id': 'PHY101', 'course_units': 3}, {'course_id': 'CHM101', 'course_units': 4}]
+    assert render_current_courses(courses) == render_current_courses(list(courses))
+    assert render_current_courses(courses).count('Current Course •') == 2
+    assert render_current_courses([]) == ""
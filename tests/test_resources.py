@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from optigrade.resources import DEFAULT_RESOURCES, ResourceCatalog, render_resource_cards
+
+
+def test_ranked_prefix_and_fuzzy_search():
+    catalog = ResourceCatalog(DEFAULT_RESOURCES)
+
+    assert catalog.search("wolfram")[0]["title"] == "Wolfram Alpha"
+    assert catalog.search("calc")[0]["title"] == "Wolfram Alpha"        # prefix of a tag
+    assert catalog.search("calcolus")[0]["title"] == "Wolfram Alpha"    # typo
+    assert [r["title"] for r in catalog.search("videos history")] == ["Crash Course"]
+    assert catalog.search("videos", category="Math") == []
+    assert catalog.search("zzzz") == []
+    # Title matches outrank description matches
+    assert catalog.search("courses")[0]["title"] == "Coursera"
+
+
+def test_incremental_add_and_facets():
+    catalog = ResourceCatalog(DEFAULT_RESOURCES)
+    catalog.add({"title": "Paul's Online Math Notes", "url": "https://tutorial.math.lamar.edu/",
+                 "category": "Math", "tags": "calculus, notes"})
+
+    assert catalog.vocabulary == sorted(catalog.postings)
+    assert {r["title"] for r in catalog.search("calculus")} == {"Wolfram Alpha", "Paul's Online Math Notes"}
+    assert catalog.facets()["Math"] == 2
+    assert catalog.facets(catalog.search("notes")) == {"Math": 1, "STEM": 1}
+    assert len(catalog.search("", category="Math")) == 2
+
+    with pytest.raises(ValueError):
+        catalog.add({"title": "Bad", "url": "javascript:alert(1)"})
+
+
+def test_large_catalog_and_escaped_cards():
+    resources = [{"title": f"Lecture {i} on topic{i % 500}", "url": f"https://example.edu/{i}",
+                  "category": ["STEM", "Math", "Humanities"][i % 3], "description": "recorded lecture"}
+                 for i in range(20000)]
+    catalog = ResourceCatalog(resources)
+
+    hits = catalog.search("topic42", limit=10)
+    assert len(hits) == 10 and all(r["title"].endswith("topic42") for r in hits)
+    assert catalog.facets()["Math"] == 6667
+
+    cards = render_resource_cards([{"title": "<b>x</b>", "url": "https://a.b/", "category": "Math"}])
+    assert "&lt;b&gt;" in cards and "Visit Resource" in cards
+
+
+def test_suggestions_wait_for_approval():
+    catalog = ResourceCatalog(DEFAULT_RESOURCES)
+    first = catalog.suggest({"title": "Paul's Online Math Notes", "url": "https://tutorial.math.lamar.edu/",
+                             "category": "Math", "tags": "calculus, notes"})
+    second = catalog.suggest({"title": "Spam", "url": "https://spam.example/"})
+    assert len(catalog) == len(DEFAULT_RESOURCES) and catalog.search("lamar") == []
+    with pytest.raises(ValueError):
+        catalog.suggest({"title": "Bad", "url": "javascript:alert(1)"})
+
+    assert [i for i, _ in catalog.pending_suggestions()] == [first, second]
+    catalog.approve(first)
+    catalog.reject(second)
+    assert catalog.approve(first) is None and catalog.pending_suggestions() == []
+    assert catalog.search("calculus notes")[0]["title"] == "Paul's Online Math Notes"
+    assert catalog.search("spam") == []
+
+
+def test_searches_while_another_session_adds():
+    catalog = ResourceCatalog(DEFAULT_RESOURCES)
+    errors = []
+
+    def search():
+        try:
+            for _ in range(300):
+                catalog.search("topic lec")
+                catalog.facets()
+        except Exception as e:  # e.g. "dictionary changed size during iteration"
+            errors.append(e)
+
+    readers = [threading.Thread(target=search) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for i in range(2000):
+        catalog.add({"title": f"Lecture {i} topic{i}", "url": f"https://example.edu/{i}", "category": f"C{i % 50}"})
+    for reader in readers:
+        reader.join()
+    assert not errors and catalog.vocabulary == sorted(catalog.postings)
@@ -0,0 +1,68 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from optigrade.study_planner import optimize_study_plan
+
+
+def concave(X):
+    """Concave response to study hours that depends on credit_load"""
+    return 2.0 + np.log1p(X['study_hours'].to_numpy()) * X['credit_load'].to_numpy() / 20
+
+
+def step_at(hours):
+    """Jumps once mean study hours reach `hours`, like a forest split"""
+    return lambda X: np.where(X['study_hours'].to_numpy() >= hours, 3.8, 3.0)
+
+
+def test_plan_matches_brute_force_with_one_predict_call(counting_model):
+    model = counting_model(concave)
+    courses = [
+        {'course_id': 'MAT101', 'course_units': 3, 'features': {'credit_load': 10}},
+        {'course_id': 'PHY101', 'course_units': 2, 'features': {'credit_load': 20}},
+        {'course_id': 'GST113', 'course_units': 1, 'features': {'credit_load': 5}},
+    ]
+    plan = optimize_study_plan(model, {'current_CGPA': 3.0}, courses, weekly_budget=6, step=1.0)
+    assert plan['mode'] == 'per_course' and (plan['allocation']['hours'] >= 1).all()
+
+    assert model.calls == 1
+    assert plan['planned_hours'] <= 6
+
+    weights = np.array([3, 2, 1]) / 6
+    loads = np.array([10, 20, 5])
+    best = max(
+        np.dot(weights, 2.0 + np.log1p(np.array(h)) * loads / 20)
+        for h in itertools.product(range(1, 7), repeat=3) if sum(h) <= 6
+    )
+    assert np.isclose(plan['predicted_cgpa'], best)
+    assert plan['predicted_cgpa'] >= plan['baseline_cgpa']
+
+
+def test_daily_plan_respects_daily_cap(counting_model):
+    model = counting_model(concave)
+    courses = [{'course_id': 'MAT101', 'course_units': 3}, {'course_id': 'PHY101', 'course_units': 3}]
+    plan = optimize_study_plan(model, {'credit_load': 15}, courses, weekly_budget=20, max_daily_hours=3.0)
+
+    daily = plan['daily_plan']
+    assert (daily.sum(axis=1) <= 3.0).all()
+    assert np.isclose(daily.to_numpy().sum(), plan['planned_hours'])
+
+
+def test_shared_profile_searches_the_weekly_total_in_one_batch(counting_model):
+    courses = [{'course_id': f'C{i}', 'course_units': u} for i, u in enumerate([3, 3, 2, 1])]
+    model = counting_model(step_at(4))
+    plan = optimize_study_plan(model, {'study_hours': 2}, courses, weekly_budget=20, min_course_hours=2.0)
+    hours = plan['allocation']['hours']
+    assert plan['mode'] == 'mean' and model.calls == 1 and plan['rows_scored'] == len(plan['hours_curve']) + 1
+    # The smallest total reaching the jump (4h per course on average), not the whole goal
+    assert plan['planned_hours'] == 16 and (hours >= 2).all() and hours.is_monotonic_decreasing
+    assert plan['predicted_cgpa'] == 3.8 and plan['baseline'] == 'current hours' and np.isclose(plan['gain'], 0.8)
+    assert 'marginal_gain' not in plan['allocation']
+
+    # Nothing in reach beats the floor, so only the floor is planned
+    plan = optimize_study_plan(counting_model(step_at(10)), {}, courses, weekly_budget=20, min_course_hours=2.0)
+    assert plan['planned_hours'] == 8 and plan['gain'] == 0
+
+    with pytest.raises(ValueError):
+        optimize_study_plan(counting_model(step_at(10)), {}, courses, weekly_budget=3)
@@ -0,0 +1,72 @@
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from optigrade.model_pool import ModelPool
+from optigrade.prediction import DEFAULT_FEATURES, model_fingerprint
+from optigrade.surrogate import Surrogate, surrogate_path
+
+SMALL_GRIDS = {'GPA_last_semester': np.arange(0, 5.01, 1.0), 'credit_load': np.arange(0, 101, 25.0),
+               'current_CGPA': np.arange(0, 5.01, 1.0), 'study_hours': np.arange(1, 51, 7.0),
+               'attendance': np.arange(0, 101, 25.0), 'engagement': np.arange(0, 101, 50.0),
+               'midterm_score': np.arange(0, 101, 50.0)}
+
+
+def random_rows(n, rng):
+    return pd.DataFrame(rng.uniform(0, 1, (n, 7)) * [5, 100, 5, 49, 100, 100, 100] + [0, 0, 0, 1, 0, 0, 0],
+                        columns=DEFAULT_FEATURES)
+
+
+def test_interpolation_is_exact_for_a_linear_model_and_clamps_outside():
+    rng = np.random.default_rng(0)
+    X = random_rows(200, rng)
+    model = LinearRegression().fit(X, X['current_CGPA'] * 0.8 + X['study_hours'] / 100 + 0.3)
+    surrogate = Surrogate.build(model, grids=SMALL_GRIDS)
+    assert surrogate.table.shape == (6, 5, 6, 8, 5, 3, 3)
+
+    rows = random_rows(1000, rng)
+    assert np.abs(surrogate.predict(rows) - model.predict(rows)).max() < 0.01
+    # Array input in feature order, and points past the grid take the edge value
+    edge = rows.iloc[:1].assign(current_CGPA=5.0)
+    assert np.isclose(surrogate.predict(rows.iloc[:1].assign(current_CGPA=9.0).to_numpy())[0],
+                      surrogate.predict(edge)[0])
+
+
+def test_forest_surrogate_drops_unused_inputs_and_reports_error():
+    rng = np.random.default_rng(1)
+    X = random_rows(300, rng)
+    X[['attendance', 'engagement', 'midterm_score']] = 0.0  # as in the shipped training data
+    forest = RandomForestRegressor(n_estimators=20, random_state=0).fit(X, X['current_CGPA'] + X['study_hours'] / 50)
+
+    surrogate = Surrogate.build(forest)
+    assert surrogate.table.shape == (21, 21, 21, 50, 1, 1, 1)
+    on_grid = pd.DataFrame([[3.0, 15.0, 3.25, 12.0, 90.0, 80.0, 75.0]], columns=DEFAULT_FEATURES)
+    assert abs(surrogate.predict(on_grid)[0] - forest.predict(on_grid)[0]) < 0.005
+
+    report = surrogate.evaluate(forest, samples=2000)
+    assert report['samples'] == 2000 and 0 < report['mean_abs_error'] <= report['p99_abs_error'] <= report['max_abs_error']
+
+    coarse = Surrogate.build(forest, max_cells=50000)
+    assert coarse.table.size <= 50000 and coarse.knots[3][[0, -1]].tolist() == [1.0, 50.0]
+
+
+def test_saved_surrogate_is_served_by_the_pool_only_for_its_model(tmp_path):
+    rng = np.random.default_rng(2)
+    X = random_rows(100, rng)
+    model_path = tmp_path / 'model.pkl'
+    joblib.dump({'model': LinearRegression().fit(X, X['current_CGPA']), 'feature_names': DEFAULT_FEATURES}, model_path)
+    surrogate = Surrogate.build(joblib.load(model_path)['model'], grids=SMALL_GRIDS,
+                                model_version=model_fingerprint(model_path))
+    surrogate.evaluate(joblib.load(model_path)['model'], samples=100)
+    surrogate.save(surrogate_path(str(model_path)))
+
+    loaded = Surrogate.load(surrogate_path(str(model_path)))
+    assert loaded.report == surrogate.report and np.array_equal(loaded.table, surrogate.table)
+    entry = ModelPool(root=str(tmp_path / 'tenants'), default_path=str(model_path)).get()
+    assert entry['surrogate'] is not None and entry['bytes'] > surrogate.nbytes
+
+    # Retraining changes the model version, so the old surrogate is ignored
+    joblib.dump({'model': LinearRegression().fit(X, X['study_hours']), 'feature_names': DEFAULT_FEATURES}, model_path)
+    assert ModelPool(root=str(tmp_path / 'tenants'), default_path=str(model_path)).get()['surrogate'] is None
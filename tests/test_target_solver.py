@@ -0,0 +1,68 @@
+import numpy as np
+
+from optigrade.prediction import DEFAULT_FEATURES
+from optigrade.target_solver import cached_solve_target, solve_target, solve_target_for_profile
+
+
+def linear_habits(X):
+    """CGPA rises 0.02 per study hour and 0.01 per attendance point; engagement is ignored"""
+    return 2.0 + 0.02 * X['study_hours'].to_numpy() + 0.01 * X['attendance'].to_numpy()
+
+
+def test_single_student_picks_cheapest_lever(counting_model):
+    model = counting_model(linear_habits)
+    result = solve_target_for_profile(model, {'study_hours': 10, 'attendance': 50}, target=3.0)
+
+    assert result['reachable']
+    assert result['predicted_cgpa'] >= 3.0
+    # +30 attendance points is cheaper than +15 study hours on the normalized scale
+    assert np.isclose(result['attendance_required'], 80, atol=0.5)
+    assert result['study_hours_change'] == 0
+    assert result['engagement_change'] == 0
+
+
+def test_cohort_is_solved_in_a_few_batched_calls(counting_model):
+    rng = np.random.default_rng(0)
+    n = 200
+    X = np.zeros((n, len(DEFAULT_FEATURES)))
+    X[:, DEFAULT_FEATURES.index('study_hours')] = rng.integers(1, 50, n)
+    X[:, DEFAULT_FEATURES.index('attendance')] = rng.integers(0, 100, n)
+
+    model = counting_model(linear_habits)
+    results = solve_target(model, X, target=3.5, refine_steps=8)
+    assert model.calls <= 1 + 8
+
+    current = 2.0 + 0.02 * X[:, 3] + 0.01 * X[:, 4]
+    best_possible = 2.0 + 0.02 * 50 + 0.01 * 100
+    assert (results['reachable'] == (best_possible >= 3.5)).all()
+    assert (results.loc[current >= 3.5, 'effort'] == 0).all()
+    assert (results.loc[results['reachable'], 'predicted_cgpa'] >= 3.5).all()
+
+
+def test_unreachable_target_is_reported(counting_model):
+    model = counting_model(linear_habits)
+    result = solve_target_for_profile(model, {'study_hours': 10, 'attendance': 50}, target=4.5)
+    assert not result['reachable']
+    assert np.isnan(result['effort'])
+
+
+def test_path_starts_from_the_actual_habits(counting_model):
+    model = counting_model(linear_habits)
+    result = solve_target_for_profile(model, {'study_hours': 0, 'attendance': 100}, target=3.2)
+    # Zero study hours are reported as zero, not the bottom of the search range
+    assert result['study_hours_current'] == 0 and np.isclose(result['current_prediction'], 3.0)
+    assert np.isclose(result['study_hours_required'], 10, atol=0.5) and result['attendance_change'] == 0
+
+
+def test_cache_is_keyed_by_model_version_and_profile(counting_model):
+    model = counting_model(linear_habits)
+    profile = {'study_hours': 12, 'attendance': 61}
+    first = cached_solve_target(model, 'v-test-target', profile, 3.5)
+    calls = model.calls
+    assert cached_solve_target(model, 'v-test-target', dict(profile), 3.5) == first and model.calls == calls
+    assert first == solve_target_for_profile(counting_model(linear_habits), profile, 3.5)
+
+    for version, changed in [('v-other', profile), ('v-test-target', {**profile, 'attendance': 62})]:
+        cached_solve_target(model, version, changed, 3.5)
+        assert model.calls > calls
+        calls = model.calls
@@ -0,0 +1,65 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+from optigrade.prediction import DEFAULT_FEATURES
+from optigrade.trajectory import cached_trajectory, final_cgpa, forecast_trajectories
+
+
+def drift_up(X):
+    """Next CGPA is the current CGPA plus 0.1"""
+    return X['current_CGPA'].to_numpy() + 0.1
+
+
+def profiles(n, rng):
+    return pd.DataFrame({'GPA_last_semester': rng.uniform(2, 5, n), 'credit_load': 85.0,
+                         'current_CGPA': rng.uniform(2, 4.5, n), 'study_hours': rng.uniform(5, 30, n),
+                         'attendance': 80.0, 'engagement': 80.0, 'midterm_score': 75.0})[DEFAULT_FEATURES]
+
+
+def test_recursion_feeds_each_prediction_back_in(counting_model):
+    model = counting_model(drift_up)
+    frame = pd.DataFrame([[3.0, 85, 3.0, 10, 80, 80, 75], [4.9, 85, 4.9, 10, 80, 80, 75]], columns=DEFAULT_FEATURES)
+    result = forecast_trajectories(model, frame, semesters_completed=2, semesters_remaining=[3, 1])
+
+    assert np.allclose(result['path'][0], [3.0, 3.1, 3.2, 3.3])
+    # Capped at 5.0, and nothing past the second student's horizon
+    assert np.allclose(result['path'][1, :2], [4.9, 5.0]) and np.isnan(result['path'][1, 2:]).all()
+    # One call per semester for the path and one for the (single-member) band
+    assert model.calls == 2 * 3
+    assert np.allclose(final_cgpa(result, [3, 1])['path'], [3.3, 5.0])
+
+
+def test_forest_band_brackets_the_path_and_first_step_matches_the_model():
+    rng = np.random.default_rng(0)
+    X = profiles(300, rng)
+    y = np.clip(X['current_CGPA'] + (X['study_hours'] - 15) / 50 + rng.normal(0, 0.2, 300), 0, 5)
+    forest = RandomForestRegressor(n_estimators=30, random_state=0).fit(X, y)
+
+    students = profiles(50, rng)
+    result = forecast_trajectories(forest, students, 2, 6)
+    assert np.allclose(result['path'][:, 1], forest.predict(students))
+    assert (result['lower'] <= result['path'] + 1e-9).all() and (result['upper'] >= result['path'] - 1e-9).all()
+    assert (result['upper'][:, -1] - result['lower'][:, -1] > 0).any()
+
+
+def test_cohort_of_thousands_is_quick():
+    rng = np.random.default_rng(1)
+    X = profiles(500, rng)
+    forest = RandomForestRegressor(n_estimators=100, random_state=0).fit(X, X['current_CGPA'])
+    students = profiles(5000, rng)
+    started = time.perf_counter()
+    result = forecast_trajectories(forest, students, rng.integers(1, 4, 5000), rng.integers(1, 9, 5000))
+    assert time.perf_counter() - started < 10
+    assert result['path'].shape == (5000, 9)
+
+
+def test_single_student_trajectory_is_cached(counting_model):
+    model = counting_model(drift_up)
+    profile = {'current_CGPA': 3.0, 'GPA_last_semester': 3.0}
+    first = cached_trajectory(model, 'v-test-trajectory', profile, 2, 4)
+    calls = model.calls
+    assert cached_trajectory(model, 'v-test-trajectory', profile, 2, 4) == first
+    assert model.calls == calls and len(first['path']) == 5
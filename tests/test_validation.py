@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from optigrade.validation import PREVIOUS_COURSES_FORM, STUDENT_RECORDS, TRAINING_DATA, TRANSCRIPT, validate
+
+
+def test_shipped_student_records_flag_only_real_problems():
+    report = validate(pd.read_csv("data/student_data.csv"), STUDENT_RECORDS)
+    found = set(zip(report.errors["row"], report.errors["rule"]))
+    assert found == {(4, "pattern"), (64, "range"), (67, "range")}
+    assert len(report.valid_rows()) == len(report.data) - 3
+
+
+def test_types_ranges_and_choices_are_row_level():
+    frame = pd.DataFrame({
+        "user_id": ["u1", "u1", "u1", " u2 "],
+        "semester": ["previous", "Current", "later", "current"],
+        "course_id": ["MTH101", "PHY102", "CHM103", "MTH101"],
+        "grade": ["78", "abc", "101", ""],
+        "course_units": [3, 2.5, 3, 4],
+        "learning_style": ["visual", "Visual", None, "Reading"]
+    })
+    report = validate(frame, STUDENT_RECORDS)
+    errors = {(row, column, rule) for row, column, rule in report.errors[["row", "column", "rule"]].itertuples(index=False)}
+    assert errors == {(1, "grade", "type"), (1, "course_units", "type"), (2, "semester", "choice"),
+                      (2, "grade", "range"), (3, "learning_style", "choice")}
+    # Text is stripped and choices are canonicalised
+    assert report.data.loc[3, "user_id"] == "u2"
+    assert list(report.data["semester"][:2]) == ["previous", "current"]
+    assert report.data.loc[0, "learning_style"] == "Visual"
+    assert report.data.loc[0, "grade"] == 78.0
+
+
+def test_duplicates_and_inconsistent_gpa():
+    frame = pd.DataFrame({
+        "user_id": ["u1", "u1", "u1"], "semester": ["current"] * 3,
+        "course_id": ["MTH101", "MTH101", "PHY102"], "course_units": [3, 3, 2],
+        "semester_gpa": [3.5, 3.5, 3.1]
+    })
+    report = validate(frame, STUDENT_RECORDS)
+    assert report.errors.query("rule == 'duplicate'")["row"].tolist() == [1]
+    assert report.errors.query("rule == 'consistency'")["row"].tolist() == [0, 1, 2]
+
+
+def test_transcript_retakes_are_not_duplicates():
+    frame = pd.DataFrame({"Course": ["MTH101", "PHY101", "MTH101", "MTH101"], "Grade": [38, 60, 72, 72],
+                          "Units": [3, 3, 3, 3], "Semester": ["2023/1", "2023/1", "2024/1", "2024/1"]})
+    report = validate(frame, TRANSCRIPT)
+    assert report.errors.query("rule == 'duplicate'")["row"].tolist() == [3]
+
+    # Without a Semester column the course code alone is the key
+    report = validate(frame.drop(columns="Semester"), TRANSCRIPT)
+    assert report.errors.query("rule == 'duplicate'")["row"].tolist() == [2, 3]
+
+
+def test_missing_required_column_invalidates_everything():
+    report = validate(pd.DataFrame({"Course": ["MTH101"], "Grade": [80]}), TRANSCRIPT)
+    assert report.errors["rule"].tolist() == ["missing_column"]
+    assert report.valid_rows().empty
+
+
+def test_aliases_and_spreadsheet_filler_columns():
+    frame = pd.DataFrame({
+        "credit_load": [18.0], "study_hours": [12.0], "GPA_last_semester": [3.2],
+        "current_CGPA": [3.1], "target_CGPA": [3.4], "Attendance": [85], "Midterm_Score": [70],
+        "Column 9": [np.nan], "Unnamed: 10": [np.nan], "notes": ["x"]
+    })
+    report = validate(frame, TRAINING_DATA)
+    assert report.ok
+    assert report.warnings == ["Ignored unknown columns: notes"]
+    assert {"attendance", "midterm_score"} <= set(report.data.columns)
+
+
+def test_form_rows_missing_values():
+    rows = [{"course_id": "MTH101", "grade": 80, "study_hours": 10, "attendance": 80, "course_units": 3, "semester_gpa": 3.5},
+            {"course_id": "  ", "grade": None, "study_hours": 10, "attendance": 80, "course_units": 3, "semester_gpa": 3.5}]
+    report = validate(pd.DataFrame(rows), PREVIOUS_COURSES_FORM)
+    assert set(report.errors["column"]) == {"course_id", "grade"}
+    assert report.invalid_rows.tolist() == [1]
+
+
+def test_large_frame_is_checked_column_wise():
+    base = pd.read_csv("data/student_data.csv")
+    big = pd.concat([base] * 500, ignore_index=True)
+    big["user_id"] = big["user_id"] + "_" + (np.arange(len(big)) // len(base)).astype(str)
+    report = validate(big, STUDENT_RECORDS)
+    assert len(report.errors) == 3 * 500
+    assert report.summary()["count"].sum() == len(report.errors)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from optigrade.prediction import DEFAULT_FEATURES
+from optigrade.whatif import cached_partial_dependence, partial_dependence
+
+
+COEF = np.arange(1, len(DEFAULT_FEATURES) + 1) / 100
+
+
+def linear(X):
+    """Prediction is a fixed linear function of the inputs"""
+    return X.to_numpy() @ COEF
+
+
+def test_curves_come_from_one_predict_call(counting_model):
+    model = counting_model(linear)
+    profile = {'current_CGPA': 3.0, 'study_hours': 10, 'attendance': 80}
+    prediction, curves = partial_dependence(model, profile)
+
+    assert model.calls == 1
+    assert set(curves['feature']) == set(DEFAULT_FEATURES)
+
+    base = np.array([profile.get(f, 0.0) for f in DEFAULT_FEATURES])
+    assert np.isclose(prediction, base @ COEF)
+
+    # Along each curve only the swept feature moves
+    hours = curves[curves['feature'] == 'study_hours']
+    slope = np.diff(hours['predicted_cgpa']) / np.diff(hours['value'])
+    assert np.allclose(slope, COEF[DEFAULT_FEATURES.index('study_hours')])
+
+
+def test_cache_is_keyed_by_model_version_and_profile(counting_model):
+    model = counting_model(linear)
+    profile = {'current_CGPA': 2.5, 'study_hours': 12}
+    first = cached_partial_dependence(model, 'v-test', profile)
+    second = cached_partial_dependence(model, 'v-test', dict(profile))
+    assert second is first
+    assert model.calls == 1
+
+    cached_partial_dependence(model, 'v-other', profile)
+    cached_partial_dependence(model, 'v-test', {**profile, 'study_hours': 13})
+    assert model.calls == 3